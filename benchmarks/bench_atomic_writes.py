@@ -0,0 +1,72 @@
+"""
+Compare durable per-file writes with journaled write_atomic batches on Disk.
+
+The per-file baseline writes each page to a temporary file, fsyncs it and
+renames it into place, which is what durable, tear-free writes cost without
+a journal. write_atomic fsyncs its journal once and flushes the filesystem
+once per batch instead. Each method is timed over several rounds, and the
+best round is reported.
+
+Usage:
+
+    python benchmarks/bench_atomic_writes.py [pages per batch]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from prism import Disk, PrismPath  # noqa: E402
+
+ROUNDS = 5
+
+TEXT = "# Title\n\n" + "Some page content.\n" * 50
+
+
+def write_durably(path: Path, data: bytes) -> None:
+    staged = path.with_name(f".{path.name}.tmp")
+    with open(staged, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(staged, path)
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    items = [(PrismPath(f"folder{i // 50}/page{i}.md"), TEXT) for i in range(count)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = Disk(tmp)
+        await disk.create_directory(PrismPath(".prism"))  # Journal batches.
+        await disk.write_many(items)  # Create the directories up front.
+
+        per_file = batched = float("inf")
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            for path, content in items:
+                write_durably(Path(tmp) / path, content.encode("utf-8"))
+            per_file = min(per_file, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await disk.write_atomic(items)
+            batched = min(batched, time.perf_counter() - start)
+        disk.close()
+
+    print(f"{count} pages")
+    print(
+        f"  per-file fsync  {per_file * 1e3:>9.1f} ms  {count / per_file:>9.0f} pages/s"
+    )
+    print(
+        f"  write_atomic    {batched * 1e3:>9.1f} ms  {count / batched:>9.0f} pages/s"
+    )
+    print(f"  write_atomic is {per_file / batched:.1f}x as fast as per-file fsync")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+Count the filesystem calls made per Disk operation.
+
+The OS-level entry points (stat, open, mkdir, scandir, ...) are wrapped with
+counters *before* prism and its dependencies are imported, so calls made through
+modules that captured a reference at import time (aiopath, aiofiles) are
+counted as well. Calls made internally by C code, such as the fstat inside
+``open()`` or the read/write calls on an open file, are not counted.
+
+Usage:
+
+    python benchmarks/bench_disk_io.py
+"""
+
+import asyncio
+import builtins
+import io
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+calls: Counter = Counter()
+recording = False
+
+
+def _counted(name, func):
+    def wrapper(*args, **kwargs):
+        if recording:
+            calls[name] += 1
+        return func(*args, **kwargs)
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+for _name in (
+    "stat",
+    "lstat",
+    "fstat",
+    "open",
+    "mkdir",
+    "scandir",
+    "listdir",
+    "utime",
+    "rename",
+    "replace",
+    "unlink",
+    "rmdir",
+    "fsync",
+):
+    setattr(os, _name, _counted(_name, getattr(os, _name)))
+builtins.open = io.open = _counted("open", io.open)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from prism import Disk, PrismPath  # noqa: E402
+
+
+async def measure(label: str, op, repeat: int = 200) -> None:
+    global recording
+    calls.clear()
+    start = time.perf_counter()
+    recording = True
+    for i in range(repeat):
+        await op(i)
+    recording = False
+    elapsed = time.perf_counter() - start
+    detail = ", ".join(f"{k}={v / repeat:g}" for k, v in sorted(calls.items()))
+    print(
+        f"{label:<18} {sum(calls.values()) / repeat:>5.1f} calls/op "
+        f"{elapsed / repeat * 1e6:>8.1f} us/op   ({detail})"
+    )
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = Disk(tmp)
+        text = "# Title\n\n" + "Some page content.\n" * 200
+        binary = bytes(range(256)) * 16
+
+        await disk.write(PrismPath("warm/page.md"), text)
+        await disk.write_binary(PrismPath("warm/image.bin"), binary)
+
+        await measure(
+            "write (new dir)",
+            lambda i: disk.write(PrismPath(f"new{i}/page.md"), text),
+        )
+        await measure(
+            "write (same dir)",
+            lambda i: disk.write(PrismPath(f"warm/page{i}.md"), text),
+        )
+        await measure(
+            "write_binary",
+            lambda i: disk.write_binary(PrismPath(f"warm/blob{i}.bin"), binary),
+        )
+        await measure("read", lambda i: disk.read(PrismPath("warm/page.md")))
+        await measure(
+            "read_binary", lambda i: disk.read_binary(PrismPath("warm/image.bin"))
+        )
+        await measure("list_entries", lambda i: disk.list_entries(PrismPath("warm")))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
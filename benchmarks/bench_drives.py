@@ -0,0 +1,83 @@
+"""
+Compare Disk, MemoryDrive and SQLiteDrive on a tree of many small pages.
+
+Each drive is filled with the same tree, then timed on the operations a refresh
+leans on: exists, read, listing and a full walk.
+
+Usage:
+
+    python benchmarks/bench_drives.py [number of pages]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from prism import Disk, MemoryDrive, PrismPath  # noqa: E402
+from prism.filesystem.sqlite import SQLiteDrive  # noqa: E402
+
+PAGES_PER_FOLDER = 50
+TEXT = "# Title\n\n" + "Some page content.\n" * 20
+
+
+def page_paths(count: int) -> list[PrismPath]:
+    return [
+        PrismPath(f"folder{i // PAGES_PER_FOLDER}/page{i}.md") for i in range(count)
+    ]
+
+
+async def timed(label: str, op, repeat: int) -> None:
+    start = time.perf_counter()
+    for i in range(repeat):
+        await op(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<14} {elapsed / repeat * 1e6:>10.1f} us/op")
+
+
+async def bench(name: str, drive, paths: list[PrismPath]) -> None:
+    print(f"{name}:")
+    start = time.perf_counter()
+    await drive.write_many([(path, TEXT) for path in paths])
+    print(f"  {'fill':<14} {(time.perf_counter() - start) * 1e3:>10.1f} ms total")
+
+    folders = sorted({path.parent for path in paths})
+    n = len(paths)
+    await timed("exists", lambda i: drive.exists(paths[i * 7919 % n]), 1000)
+    await timed("read", lambda i: drive.read(paths[i * 7919 % n]), 1000)
+    await timed(
+        "list_entries",
+        lambda i: drive.list_entries(folders[i % len(folders)]),
+        200,
+    )
+
+    async def walk(_):
+        async for _ in drive.walk():
+            pass
+
+    await timed("walk", walk, 3)
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    paths = page_paths(count)
+    print(f"{count} pages in {len(paths) // PAGES_PER_FOLDER} folders\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = Disk(tmp)
+        await bench("Disk", disk, paths)
+        disk.close()
+
+    await bench("MemoryDrive", MemoryDrive(), paths)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        drive = SQLiteDrive(Path(tmp) / "prism.db")
+        await bench("SQLiteDrive", drive, paths)
+        drive.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Time a full recursive refresh of a generated repository at several job counts,
+then in several worker processes, one per core up to the machine's core count,
+and finally an incremental refresh of an already refreshed tree and the
+propagation of one retitled README.
+
+The repository has one folder per PAGES_PER_FOLDER pages, each page with
+breadcrumbs, pages, siblings and toc blocks. Every run starts from the same
+stale tree, so each refresh rewrites every page.
+
+Usage:
+
+    python benchmarks/bench_refresh.py [number of pages] [jobs ...]
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from prism import CachingFileSystem, Disk, Prism, PrismPath  # noqa: E402
+from prism.parallel import refresh_in_processes  # noqa: E402
+
+PAGES_PER_FOLDER = 50
+
+PAGE = """# {title}
+
+<!-- prism:generate:breadcrumbs -->
+<!-- /prism:generate:breadcrumbs -->
+
+<!-- prism:generate:toc -->
+<!-- /prism:generate:toc -->
+
+## Pages
+
+<!-- prism:generate:pages -->
+<!-- /prism:generate:pages -->
+
+## Siblings
+
+<!-- prism:generate:siblings -->
+<!-- /prism:generate:siblings -->
+"""
+
+
+async def build(root: Path, count: int) -> None:
+    drive = Disk(root)
+    await drive.create_directory(PrismPath(".prism"))
+    items = [(PrismPath("README.md"), PAGE.format(title="Home"))]
+    for i in range(count):
+        folder = PrismPath(f"folder{i // PAGES_PER_FOLDER}")
+        if i % PAGES_PER_FOLDER == 0:
+            items.append((folder / "README.md", PAGE.format(title=str(folder))))
+        items.append((folder / f"page{i}.md", PAGE.format(title=f"Page {i}")))
+    await drive.write_many(items)
+    drive.close()
+
+
+async def refresh(root: Path, jobs: int, incremental: bool = False) -> None:
+    drive = Disk(root)
+    prism = Prism(CachingFileSystem(drive, validate=False))
+    stats = await prism.refresh_folder(
+        PrismPath(), recursive=True, jobs=jobs, incremental=incremental
+    )
+    drive.close()
+    print(f"  jobs={jobs:<3} {'incremental ' if incremental else ''}{stats}")
+
+
+async def propagate(root: Path, path: PrismPath) -> None:
+    drive = Disk(root)
+    stats = await Prism(CachingFileSystem(drive, validate=False)).propagate(path)
+    drive.close()
+    print(f"  propagate {path} {stats}")
+
+
+async def refresh_processes(root: Path, processes: int) -> None:
+    stats = await refresh_in_processes(root, processes)
+    print(f"  processes={processes:<3} {stats}")
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    job_counts = [int(j) for j in sys.argv[2:]] or [1, 4, 16]
+    print(f"{count} pages in {count // PAGES_PER_FOLDER} folders")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stale = Path(tmp) / "stale"
+        stale.mkdir()
+        await build(stale, count)
+        for jobs in job_counts:
+            root = Path(tmp) / f"jobs{jobs}"
+            shutil.copytree(stale, root)
+            await refresh(root, jobs)
+
+        cores = os.cpu_count() or 1
+        for processes in [p for p in (1, 2, 4, 8) if p <= cores]:
+            root = Path(tmp) / f"processes{processes}"
+            shutil.copytree(stale, root)
+            await refresh_processes(root, processes)
+
+        # Nothing changed since the last refresh of this tree.
+        await refresh(root, 1, incremental=True)
+
+        # Retitling a folder's README changes its pages' breadcrumbs and the
+        # root's listing.
+        readme = root / "folder0" / "README.md"
+        readme.write_text(readme.read_text().replace("folder0", "First folder", 1))
+        await propagate(root, PrismPath("folder0/README.md"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,18 +1,26 @@
 from .exceptions import PrismError, PrismNotFoundError
-from .filesystem import FileSystem
+from .filesystem import DirEntry, FileSystem
+from .filesystem.caching import CachingFileSystem
 from .filesystem.disk import Disk
 from .filesystem.memory import MemoryDrive
+from .filesystem.overlay import OverlayFileSystem
+from .filesystem.pack import PackDrive
+from .filesystem.sqlite import SQLiteDrive
 from .folder import Folder, FolderError
 from .page import Page, PageError, PageValidationError
 from .prism import Prism
 from .types import PrismPath
 
 __all__ = [
+    "CachingFileSystem",
+    "DirEntry",
     "Disk",
     "FileSystem",
     "Folder",
     "FolderError",
     "MemoryDrive",
+    "OverlayFileSystem",
+    "PackDrive",
     "Page",
     "PageError",
     "PageValidationError",
@@ -20,4 +28,5 @@ __all__ = [
     "PrismError",
     "PrismPath",
     "PrismNotFoundError",
+    "SQLiteDrive",
 ]
@@ -3,7 +3,7 @@ from pathlib import Path
 
 import asyncclick as click
 
-from prism import Disk, Prism, PrismNotFoundError
+from prism import CachingFileSystem, Disk, Prism, PrismNotFoundError
 
 
 @click.group()
@@ -35,7 +35,15 @@ async def add(path: Path):
 @folder.command()
 @click.argument("path", type=click.Path())
 @click.option("--recursive", "-r", is_flag=True, help="Recursively refresh subfolders")
-async def refresh(path: str, recursive: bool):
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of pages to refresh at a time",
+)
+async def refresh(path: str, recursive: bool, jobs: int):
     """Refresh all pages in a folder"""
     try:
         drive = Disk.find_prism_drive()
@@ -43,12 +51,12 @@ async def refresh(path: str, recursive: bool):
         raise click.ClickException("No prism found in current directory")
 
     try:
-        prism = Prism(drive)
+        prism = Prism(CachingFileSystem(drive, validate=False))
         prism_path = await prism.drive.prism_path(path)
-        await prism.refresh_folder(prism_path, recursive=recursive)
+        stats = await prism.refresh_folder(prism_path, recursive=recursive, jobs=jobs)
         if recursive:
-            click.echo("Refreshed folder and subfolders.")
+            click.echo(f"Refreshed folder and subfolders ({stats}).")
         else:
-            click.echo("Refreshed folder.")
+            click.echo(f"Refreshed folder ({stats}).")
     except Exception as e:
         raise click.ClickException(str(e))
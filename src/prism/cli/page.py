@@ -52,7 +52,9 @@ async def refresh(path: str):
 
     try:
         prism = Prism(drive)
-        await prism.refresh_page(path)
-        click.echo("Refreshed page.")
+        if await prism.refresh_page(path):
+            click.echo("Refreshed page.")
+        else:
+            click.echo("Page is up to date.")
     except Exception as e:
         raise click.ClickException(str(e))
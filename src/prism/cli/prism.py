@@ -2,7 +2,12 @@ from pathlib import Path
 
 import asyncclick as click
 
-from prism import Disk, Prism, PrismNotFoundError, PrismPath
+from prism import CachingFileSystem, Disk, Prism, PrismNotFoundError, PrismPath
+from prism.filesystem.overlay import OverlayFileSystem
+from prism.filesystem.pack import write_pack
+from prism.parallel import refresh_in_processes
+from prism.refresh import RefreshStats
+from prism.types import METADATA_ROOT_DIR_NAME
 
 from .folder import folder
 from .page import page
@@ -33,18 +38,128 @@ async def init(path: str):
 
 
 @cli.command()
-async def refresh():
-    """Refresh all folders and pages in the current repository"""
+@click.argument("path", type=click.Path(path_type=Path), required=False)
+@click.option(
+    "--dry-run", is_flag=True, help="Show what would change without writing anything"
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of pages to refresh at a time",
+)
+@click.option(
+    "--processes",
+    "-p",
+    type=click.IntRange(min=1),
+    help="Refresh top-level folders in this many processes",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Skip pages that haven't changed, nor their inputs, since the last refresh",
+)
+@click.option(
+    "--propagate",
+    is_flag=True,
+    help="Refresh PATH and the pages that depend on it, instead of all pages",
+)
+async def refresh(
+    path: Path | None,
+    dry_run: bool,
+    jobs: int,
+    processes: int | None,
+    incremental: bool,
+    propagate: bool,
+):
+    """Refresh all folders and pages in the current repository.
+
+    With --propagate, only refresh the page at PATH, after it was edited, and
+    the pages whose generated content depends on it.
+    """
+
+    if propagate != (path is not None):
+        raise click.UsageError("PATH and --propagate must be given together")
+    if propagate and processes is not None:
+        raise click.UsageError("--propagate can't be combined with --processes")
 
     try:
         drive = Disk.find_prism_drive()
     except PrismNotFoundError:
         raise click.ClickException("No prism found in current directory")
 
+    if processes is not None:
+        if dry_run:
+            raise click.UsageError("--dry-run can't be combined with --processes")
+        try:
+            # Worker processes open their own drives, so the refresh is
+            # written folder by folder rather than staged.
+            drive.close()
+            stats: RefreshStats = await refresh_in_processes(
+                drive.root, processes, jobs, incremental
+            )
+        except Exception as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Refreshed all pages ({stats}).")
+        return
+
+    try:
+        # Nothing else changes the repository during the refresh, so cached
+        # pages, stats and listings can be trusted without revalidation. All
+        # changes are staged in memory and written together at the end.
+        overlay = OverlayFileSystem(CachingFileSystem(drive, validate=False))
+        prism = Prism(overlay)
+        refreshed = "all pages"
+        if path is not None:  # Given with --propagate only.
+            page_path = await drive.prism_path(path.resolve())
+            stats = await prism.propagate(page_path, jobs=jobs)
+            refreshed = f"{page_path} and its dependents"
+        else:
+            stats = await prism.refresh_folder(
+                PrismPath(), recursive=True, jobs=jobs, incremental=incremental
+            )
+        if dry_run:
+            # Index files under the metadata directory are rewritten on every
+            # refresh; only the pages themselves are worth listing.
+            changes = await overlay.changes()
+            for written in changes.written:
+                if written.parts[0] != METADATA_ROOT_DIR_NAME:
+                    click.echo(f"Would write {written}")
+            for touched in changes.touched:
+                if touched.parts[0] != METADATA_ROOT_DIR_NAME:
+                    click.echo(f"Would touch {touched}")
+            click.echo(f"Dry run, nothing written ({stats}).")
+        else:
+            changes = await overlay.commit()
+            # The committed pages have new stats, which the title index and the
+            # manifest must record for the next incremental refresh to trust
+            # them; committing again writes the updated indexes.
+            await prism.restat_pages(changes.written + changes.touched)
+            await overlay.commit()
+            click.echo(f"Refreshed {refreshed} ({stats}).")
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command()
+@click.argument("output", type=click.Path(path_type=Path), required=False)
+async def pack(output: Path | None):
+    """Write the current repository into a single read-only pack file"""
+
+    try:
+        drive = Disk.find_prism_drive()
+    except PrismNotFoundError:
+        raise click.ClickException("No prism found in current directory")
+
+    target = (output or drive.root.parent / f"{drive.root.name}.pack").resolve()
+    if target.is_relative_to(drive.root):
+        raise click.ClickException("The pack file must be outside the repository")
+
     try:
-        prism = Prism(drive)
-        await prism.refresh_folder(PrismPath(), recursive=True)
-        click.echo("Refreshed all pages.")
+        count = await write_pack(drive, target)
+        click.echo(f"Packed {count} entries into {target}.")
     except Exception as e:
         raise click.ClickException(str(e))
 
@@ -12,11 +12,59 @@ Key characteristics:
 - Binary and text operations are strictly separated
 """
 
+import asyncio
+import codecs
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from os import PathLike
-from typing import AsyncIterator
+from typing import AsyncIterator, Collection, Sequence
 
-from ..types import PrismPath
+from ..types import METADATA_ROOT_DIR_NAME, PrismPath
+
+# Default number of listed directories walk() keeps ahead of its consumer.
+DEFAULT_WALK_QUEUE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class DirEntry:
+    """A typed entry returned by FileSystem.list_entries.
+
+    Attributes:
+        name: Name of the entry within its directory (not a full path)
+        is_directory: Whether this entry is a directory
+        size: Size in bytes (0 for directories)
+        mtime: Last modification time as seconds since the epoch
+    """
+
+    name: str
+    is_directory: bool
+    size: int
+    mtime: float
+
+    @property
+    def is_file(self) -> bool:
+        return not self.is_directory
+
+
+# What walk() yields for each directory: its path, the names of its
+# subdirectories, and an entry for each of its files.
+WalkItem = tuple[PrismPath, list[str], list[DirEntry]]
+
+
+def _decode_head(head: bytes) -> str:
+    """Decode the start of a UTF-8 text, dropping a character cut off at its end.
+
+    Raises:
+        UnicodeDecodeError: If the bytes are not UTF-8.
+    """
+    return codecs.getincrementaldecoder("utf-8")().decode(head)
+
+
+def _truncate(text: str, max_bytes: int) -> str:
+    """Cut a text to at most max_bytes bytes of UTF-8, as read_head does."""
+    if len(text) * 4 <= max_bytes:
+        return text  # Short enough whatever its characters.
+    return _decode_head(text[:max_bytes].encode("utf-8")[:max_bytes])
 
 
 class FileSystem(ABC):
@@ -106,6 +154,130 @@ class FileSystem(ABC):
         """
         pass
 
+    async def read_many(self, paths: Sequence[PrismPath]) -> list[str | Exception]:
+        """Read the text content of several files.
+
+        Implementations should read the whole batch with as little per-call
+        overhead as they can. The default reads the files one at a time.
+
+        Args:
+            paths: Paths of the files to read.
+
+        Returns:
+            list: For each path, in order, either its text content or the
+            exception reading it raised (see read).
+        """
+        results: list[str | Exception] = []
+        for path in paths:
+            try:
+                results.append(await self.read(path))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def read_head(self, path: PrismPath, max_bytes: int) -> str:
+        """Read the start of a text file.
+
+        Implementations should read no more than max_bytes of the file. The
+        default reads the whole file and truncates it.
+
+        Args:
+            path: Path to the file to read.
+            max_bytes: Maximum number of bytes to read.
+
+        Returns:
+            str: The text in the first max_bytes bytes of the file. A
+            character cut in two by the limit is dropped.
+
+        Raises:
+            FileNotFoundError: If the path doesn't exist.
+            IsADirectoryError: If the path points to a directory.
+            ValueError: If the file contains binary data.
+        """
+        content = await self.read(path)
+        return _truncate(content, max_bytes)
+
+    async def read_head_many(
+        self, paths: Sequence[PrismPath], max_bytes: int
+    ) -> list[str | Exception]:
+        """Read the start of several text files (see read_head).
+
+        Returns:
+            list: For each path, in order, either the start of its text or the
+            exception reading it raised.
+        """
+        results: list[str | Exception] = []
+        for path in paths:
+            try:
+                results.append(await self.read_head(path, max_bytes))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def write_many(
+        self, items: Sequence[tuple[PrismPath, str]]
+    ) -> list[Exception | None]:
+        """Write text content to several files.
+
+        Implementations should write the whole batch with as little per-call
+        overhead as they can. The default writes the files one at a time.
+
+        Args:
+            items: (path, content) pairs to write, in order.
+
+        Returns:
+            list: For each item, in order, None if it was written or the
+            exception writing it raised (see write).
+        """
+        results: list[Exception | None] = []
+        for path, content in items:
+            try:
+                await self.write(path, content)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def write_atomic(
+        self, items: Sequence[tuple[PrismPath, str | bytes]]
+    ) -> None:
+        """Write several text or binary files as one all-or-nothing batch.
+
+        Backends that can make the batch atomic: after a crash, either every
+        file has its new content or none does. The default writes the files
+        one at a time and stops at the first error.
+
+        Args:
+            items: (path, content) pairs to write, in order.
+
+        Raises:
+            NotADirectoryError: If a parent path exists but is a file.
+            IsADirectoryError: If a path points to a directory.
+        """
+        for path, content in items:
+            if isinstance(content, str):
+                await self.write(path, content)
+            else:
+                await self.write_binary(path, content)
+
+    async def stat_many(self, paths: Sequence[PrismPath]) -> list[DirEntry | Exception]:
+        """Stat several files or directories.
+
+        Args:
+            paths: Paths to check.
+
+        Returns:
+            list: For each path, in order, either its DirEntry or the exception
+            stat raised (FileNotFoundError if it doesn't exist).
+        """
+        results: list[DirEntry | Exception] = []
+        for path in paths:
+            try:
+                results.append(await self.stat(path))
+            except Exception as e:
+                results.append(e)
+        return results
+
     @abstractmethod
     async def write(self, path: PrismPath, content: str) -> None:
         """Write text content to a file, creating parent directories if needed.
@@ -137,7 +309,41 @@ class FileSystem(ABC):
         pass
 
     @abstractmethod
-    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+    async def stat(self, path: PrismPath) -> DirEntry:
+        """Get the kind, size and modification time of a file or directory.
+
+        Args:
+            path: Path to check.
+
+        Returns:
+            DirEntry: The entry for the path, named after its last component.
+
+        Raises:
+            FileNotFoundError: If the path doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    async def list_entries(self, directory: PrismPath) -> list[DirEntry]:
+        """List all files and directories directly in the specified directory.
+
+        Unlike list_files and list_directories, each entry carries its kind,
+        size and modification time, so callers don't need a follow-up stat.
+
+        Args:
+            directory: Path to the directory to list.
+
+        Returns:
+            list[DirEntry]: The entries of the directory, in no particular order.
+
+        Raises:
+            FileNotFoundError: If the directory doesn't exist.
+            NotADirectoryError: If the path exists but is not a directory.
+        """
+        pass
+
+    @abstractmethod
+    def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
         """List all files (not directories) directly in the specified directory.
 
         Args:
@@ -152,7 +358,7 @@ class FileSystem(ABC):
         pass
 
     @abstractmethod
-    async def list_directories(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+    def list_directories(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
         """List all directories (not files) directly in the specified directory.
 
         Args:
@@ -166,6 +372,79 @@ class FileSystem(ABC):
         """
         pass
 
+    async def walk(
+        self,
+        root: PrismPath = PrismPath(),
+        exclude: Collection[str] = (METADATA_ROOT_DIR_NAME,),
+        queue_size: int = DEFAULT_WALK_QUEUE_SIZE,
+    ) -> AsyncIterator[WalkItem]:
+        """Walk a directory tree top-down.
+
+        Directories are listed by a background task that runs ahead of the
+        consumer. It pauses once queue_size listings are waiting, so a slow
+        consumer holds back the traversal instead of letting listings pile up.
+
+        Args:
+            root: Directory to start from.
+            exclude: Names of directories to skip, along with everything below
+                them. The metadata directory is skipped by default.
+            queue_size: Maximum number of listings waiting for the consumer.
+
+        Returns:
+            AsyncIterator[WalkItem]: For each directory, a (dirpath, dirs, files)
+            tuple of its path, the names of its subdirectories and a DirEntry
+            for each of its files. A directory always comes before its
+            subdirectories.
+
+        Raises:
+            FileNotFoundError: If root doesn't exist.
+            NotADirectoryError: If root is not a directory.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        done = object()
+
+        async def produce() -> None:
+            try:
+                async for item in self._walk(PrismPath(root), frozenset(exclude)):
+                    await queue.put(item)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(done)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+
+    async def _walk(
+        self, root: PrismPath, exclude: frozenset[str]
+    ) -> AsyncIterator[WalkItem]:
+        """Produce the listings of walk(), one list_entries call per directory.
+
+        Backends override this with a traversal native to them. Directories
+        that disappear during the walk are skipped.
+        """
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                entries = await self.list_entries(directory)
+            except (FileNotFoundError, NotADirectoryError):
+                if directory == root:
+                    raise
+                continue
+            dirs = [e.name for e in entries if e.is_directory and e.name not in exclude]
+            yield directory, dirs, [e for e in entries if e.is_file]
+            pending.extend(directory / name for name in reversed(dirs))
+
     @abstractmethod
     async def create_directory(self, directory: PrismPath) -> None:
         """Create a directory and all necessary parent directories.
@@ -0,0 +1,522 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from os import PathLike
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from ..types import METADATA_ROOT_DIR_NAME
+from . import (
+    DEFAULT_WALK_QUEUE_SIZE,
+    DirEntry,
+    FileSystem,
+    PrismPath,
+    WalkItem,
+    _truncate,
+)
+
+# Kind of content read, text or binary.
+C = TypeVar("C", str, bytes)
+
+# Default upper bound on the bytes of file content kept in memory.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Kinds of cached directory listings, the first part of their cache keys.
+_LISTING_KINDS = ("entries", "files", "directories")
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of a CachingFileSystem."""
+
+    content_hits: int = 0
+    content_misses: int = 0
+    listing_hits: int = 0
+    listing_misses: int = 0
+    stat_hits: int = 0
+    stat_misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.content_hits + self.listing_hits + self.stat_hits
+
+    @property
+    def misses(self) -> int:
+        return self.content_misses + self.listing_misses + self.stat_misses
+
+
+@dataclass
+class _CachedContent:
+    content: Union[str, bytes]
+    mtime: float
+    size: int
+
+
+class CachingFileSystem(FileSystem):
+    """A FileSystem wrapper that caches the contents, stats and listings of another.
+
+    File contents are kept in an LRU cache bounded by max_bytes. Directory
+    listings are cached per directory. Writes, removals, moves and copies made
+    through the wrapper invalidate the affected entries.
+
+    With validate=True (the default), every cache hit is first confirmed with a
+    stat of the base drive: contents must match the file's mtime and size, and
+    listings the directory's mtime. This way, changes made behind the wrapper's
+    back are picked up. With validate=False, cached entries are trusted until the
+    wrapper itself changes them. Use that mode when nothing else modifies the
+    drive while the wrapper is in use, such as during a single refresh run.
+    Stats, and list_entries results (whose sizes and mtimes a directory mtime
+    can't validate), are only cached in this mode.
+    """
+
+    def __init__(
+        self,
+        base: FileSystem,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        validate: bool = True,
+    ):
+        self.base = base
+        self.max_bytes = max_bytes
+        self.validate = validate
+        self.stats = CacheStats()
+
+        self._contents: OrderedDict[PrismPath, _CachedContent] = OrderedDict()
+        self._content_bytes = 0
+        self._listings: Dict[tuple[str, PrismPath], tuple[float, list]] = {}
+        self._stats: Dict[PrismPath, Optional[DirEntry]] = {}
+        # File stats from walks, by directory and name, so that walking a
+        # large tree doesn't build a path for every file it lists.
+        self._walked: Dict[PrismPath, Dict[str, DirEntry]] = {}
+
+    @property
+    def root(self):
+        return self.base.root
+
+    # Cache maintenance.
+
+    def _drop_content(self, path: PrismPath) -> None:
+        cached = self._contents.pop(path, None)
+        if cached is not None:
+            self._content_bytes -= cached.size
+
+    def _store_content(self, path: PrismPath, cached: _CachedContent) -> None:
+        self._drop_content(path)
+        if cached.size > self.max_bytes:
+            return
+        self._contents[path] = cached
+        self._content_bytes += cached.size
+        while self._content_bytes > self.max_bytes:
+            _, evicted = self._contents.popitem(last=False)
+            self._content_bytes -= evicted.size
+            self.stats.evictions += 1
+
+    def _invalidate(self, path: PrismPath, recursive: bool = False) -> None:
+        """Forget a path (and, if recursive, everything below it).
+
+        The stats and listings of its ancestors are dropped too, as the change
+        may have created or removed them, or entries in them.
+        """
+        path = PrismPath(path)
+        if not recursive:
+            # Only the path and its ancestors are affected, so look them up
+            # rather than scanning the caches.
+            self._drop_content(path)
+            self._walked.pop(path, None)
+            for p in (path, *path.parents):
+                self._stats.pop(p, None)
+                self._walked.get(p.parent, {}).pop(p.name, None)
+                for kind in _LISTING_KINDS:
+                    self._listings.pop((kind, p), None)
+            return
+
+        prefix = path.parts
+
+        def affected(p: PrismPath) -> bool:
+            return p.parts[: len(prefix)] == prefix
+
+        for p in [p for p in self._contents if affected(p)]:
+            self._drop_content(p)
+        for p in [p for p in self._stats if affected(p) or p in path.parents]:
+            del self._stats[p]
+        for p in [p for p in self._walked if affected(p)]:
+            del self._walked[p]
+        for p in (path, *path.parents):
+            self._walked.get(p.parent, {}).pop(p.name, None)
+        for key in [
+            k for k in self._listings if affected(k[1]) or k[1] in path.parents
+        ]:
+            del self._listings[key]
+
+    def clear(self) -> None:
+        """Drop everything cached."""
+        self._contents.clear()
+        self._content_bytes = 0
+        self._listings.clear()
+        self._stats.clear()
+        self._walked.clear()
+
+    def _cached_stat(self, path: PrismPath) -> tuple[bool, Optional[DirEntry]]:
+        """Look up a stat kept from a stat or a walk (without validation).
+
+        Returns:
+            tuple: Whether the path's stat is cached, and its entry, which is
+            None if the path was found not to exist.
+        """
+        if self.validate:
+            return False, None
+        if path in self._stats:
+            return True, self._stats[path]
+        entry = self._walked.get(path.parent, {}).get(path.name)
+        return entry is not None, entry
+
+    async def _stat(self, path: PrismPath) -> DirEntry:
+        path = PrismPath(path)
+        found, cached = self._cached_stat(path)
+        if found:
+            self.stats.stat_hits += 1
+            if cached is None:
+                raise FileNotFoundError(f"Path {path} does not exist")
+            return cached
+
+        self.stats.stat_misses += 1
+        try:
+            entry = await self.base.stat(path)
+        except FileNotFoundError:
+            if not self.validate:
+                self._stats[path] = None
+            raise
+        if not self.validate:
+            self._stats[path] = entry
+        return entry
+
+    async def _stat_many(
+        self, paths: Sequence[PrismPath]
+    ) -> list[DirEntry | Exception]:
+        results: dict[int, DirEntry | Exception] = {}
+        missing = []
+        for i, path in enumerate(paths):
+            found, cached = self._cached_stat(path)
+            if found:
+                self.stats.stat_hits += 1
+                results[i] = cached or FileNotFoundError(f"Path {path} does not exist")
+            else:
+                missing.append(i)
+
+        if not missing:
+            return [results[i] for i in range(len(paths))]
+        self.stats.stat_misses += len(missing)
+        fetched = await self.base.stat_many([paths[i] for i in missing])
+        for i, entry in zip(missing, fetched):
+            results[i] = entry
+            if not self.validate:
+                if isinstance(entry, DirEntry):
+                    self._stats[paths[i]] = entry
+                elif isinstance(entry, FileNotFoundError):
+                    self._stats[paths[i]] = None
+        return [results[i] for i in range(len(paths))]
+
+    async def _read_cached(
+        self,
+        path: PrismPath,
+        kind: type[C],
+        reader: Callable[[PrismPath], Awaitable[C]],
+    ) -> C:
+        path = PrismPath(path)
+        cached = self._contents.get(path)
+        if cached is not None and isinstance(cached.content, kind):
+            if not self.validate:
+                self._contents.move_to_end(path)
+                self.stats.content_hits += 1
+                return cached.content
+            entry = await self._stat(path)
+            if (entry.mtime, entry.size) == (cached.mtime, cached.size):
+                self._contents.move_to_end(path)
+                self.stats.content_hits += 1
+                return cached.content
+        else:
+            entry = None
+
+        self.stats.content_misses += 1
+        if entry is None:
+            try:
+                entry = await self._stat(path)
+            except FileNotFoundError:
+                entry = None
+        content = await reader(path)
+        if entry is not None and not entry.is_directory:
+            self._store_content(path, _CachedContent(content, entry.mtime, entry.size))
+        return content
+
+    async def _list_cached(
+        self,
+        kind: str,
+        directory: PrismPath,
+        lister: Callable[[], Awaitable[list]],
+    ) -> list:
+        directory = PrismPath(directory)
+        key = (kind, directory)
+        cached = self._listings.get(key)
+        entry = None
+        if cached is not None:
+            if not self.validate:
+                self.stats.listing_hits += 1
+                return cached[1]
+            entry = await self._stat(directory)
+            if entry.mtime == cached[0]:
+                self.stats.listing_hits += 1
+                return cached[1]
+
+        self.stats.listing_misses += 1
+        if self.validate and entry is None:
+            try:
+                entry = await self._stat(directory)
+            except FileNotFoundError:
+                pass
+        listing = await lister()
+        if not self.validate or entry is not None:
+            self._listings[key] = (entry.mtime if entry else 0.0, listing)
+        return listing
+
+    # FileSystem interface implementation.
+
+    async def full_native_path(self, path: PrismPath) -> str:
+        return await self.base.full_native_path(path)
+
+    async def prism_path(self, native_path: PathLike) -> PrismPath:
+        return await self.base.prism_path(native_path)
+
+    async def is_root(self, path: PrismPath) -> bool:
+        return await self.base.is_root(path)
+
+    async def stat(self, path: PrismPath) -> DirEntry:
+        return await self._stat(path)
+
+    async def exists(self, path: PrismPath) -> bool:
+        if await self.is_root(path):
+            return True
+        try:
+            await self._stat(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    async def is_directory(self, path: PrismPath) -> bool:
+        if await self.is_root(path):
+            return True
+        try:
+            return (await self._stat(path)).is_directory
+        except FileNotFoundError:
+            return False
+
+    async def is_file(self, path: PrismPath) -> bool:
+        try:
+            return (await self._stat(path)).is_file
+        except FileNotFoundError:
+            return False
+
+    async def read(self, path: PrismPath) -> str:
+        return await self._read_cached(path, str, self.base.read)
+
+    async def read_binary(self, path: PrismPath) -> bytes:
+        return await self._read_cached(path, bytes, self.base.read_binary)
+
+    async def read_many(self, paths: Sequence[PrismPath]) -> list[str | Exception]:
+        paths = [PrismPath(path) for path in paths]
+        entries: list[DirEntry | Exception | None] | None = None
+        if self.validate:
+            entries = list(await self._stat_many(paths))
+
+        results: dict[int, str | Exception] = {}
+        misses = []
+        for i, path in enumerate(paths):
+            cached = self._contents.get(path)
+            if cached is not None and isinstance(cached.content, str):
+                entry = entries[i] if entries else None
+                if not self.validate or (
+                    isinstance(entry, DirEntry)
+                    and (entry.mtime, entry.size) == (cached.mtime, cached.size)
+                ):
+                    self._contents.move_to_end(path)
+                    self.stats.content_hits += 1
+                    results[i] = cached.content
+                    continue
+            misses.append(i)
+
+        self.stats.content_misses += len(misses)
+        if not misses:
+            return [results[i] for i in range(len(paths))]
+        if entries is None:
+            entries = [None] * len(paths)
+            for i, entry in zip(
+                misses, await self._stat_many([paths[i] for i in misses])
+            ):
+                entries[i] = entry
+        contents = await self.base.read_many([paths[i] for i in misses])
+        for i, content in zip(misses, contents):
+            results[i] = content
+            entry = entries[i]
+            if isinstance(content, str) and isinstance(entry, DirEntry):
+                self._store_content(
+                    paths[i], _CachedContent(content, entry.mtime, entry.size)
+                )
+        return [results[i] for i in range(len(paths))]
+
+    async def read_head(self, path: PrismPath, max_bytes: int) -> str:
+        result = (await self.read_head_many([path], max_bytes))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def read_head_many(
+        self, paths: Sequence[PrismPath], max_bytes: int
+    ) -> list[str | Exception]:
+        """Cut heads from cached contents, and read the rest from the base drive.
+
+        Heads are not cached themselves, since they aren't whole contents.
+        """
+        paths = [PrismPath(path) for path in paths]
+        # Cached texts with the stat they were cached with, by index.
+        hits: dict[int, tuple[str, float, int]] = {}
+        for i, path in enumerate(paths):
+            cached = self._contents.get(path)
+            if cached is not None and isinstance(cached.content, str):
+                hits[i] = (cached.content, cached.mtime, cached.size)
+        if self.validate and hits:
+            entries = await self._stat_many([paths[i] for i in hits])
+            hits = {
+                i: hit
+                for (i, hit), entry in zip(hits.items(), entries)
+                if isinstance(entry, DirEntry) and (entry.mtime, entry.size) == hit[1:]
+            }
+
+        results: dict[int, str | Exception] = {}
+        for i, (content, _, _) in hits.items():
+            self._contents.move_to_end(paths[i])
+            self.stats.content_hits += 1
+            results[i] = _truncate(content, max_bytes)
+
+        misses = [i for i in range(len(paths)) if i not in hits]
+        if misses:
+            missed = [paths[i] for i in misses]
+            heads = await self.base.read_head_many(missed, max_bytes)
+            for i, head in zip(misses, heads):
+                results[i] = head
+        return [results[i] for i in range(len(paths))]
+
+    async def write_many(
+        self, items: Sequence[tuple[PrismPath, str]]
+    ) -> list[Exception | None]:
+        try:
+            return await self.base.write_many(items)
+        finally:
+            for path, _ in items:
+                self._invalidate(path)
+
+    async def write_atomic(
+        self, items: Sequence[tuple[PrismPath, str | bytes]]
+    ) -> None:
+        try:
+            await self.base.write_atomic(items)
+        finally:
+            for path, _ in items:
+                self._invalidate(path)
+
+    async def stat_many(self, paths: Sequence[PrismPath]) -> list[DirEntry | Exception]:
+        return await self._stat_many([PrismPath(path) for path in paths])
+
+    async def write(self, path: PrismPath, content: str) -> None:
+        try:
+            await self.base.write(path, content)
+        finally:
+            self._invalidate(path)
+
+    async def write_binary(self, path: PrismPath, content: bytes) -> None:
+        try:
+            await self.base.write_binary(path, content)
+        finally:
+            self._invalidate(path)
+
+    async def list_entries(self, directory: PrismPath) -> list[DirEntry]:
+        # A directory's mtime doesn't change when one of its files is modified,
+        # so it can't validate the sizes and mtimes in a listing.
+        if self.validate:
+            return await self.base.list_entries(directory)
+        return await self._list_cached(
+            "entries", directory, lambda: self.base.list_entries(directory)
+        )
+
+    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        async def lister():
+            return [f async for f in self.base.list_files(directory)]
+
+        for f in await self._list_cached("files", directory, lister):
+            yield f
+
+    async def list_directories(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        async def lister():
+            return [d async for d in self.base.list_directories(directory)]
+
+        for d in await self._list_cached("directories", directory, lister):
+            yield d
+
+    async def walk(
+        self,
+        root: PrismPath = PrismPath(),
+        exclude: Collection[str] = (METADATA_ROOT_DIR_NAME,),
+        queue_size: int = DEFAULT_WALK_QUEUE_SIZE,
+    ) -> AsyncIterator[WalkItem]:
+        # Walks always go to the base drive. Without validation, the file
+        # stats they return are kept, so later reads and stats can use them.
+        async for directory, dirs, files in self.base.walk(root, exclude, queue_size):
+            if not self.validate:
+                self._walked[directory] = {entry.name: entry for entry in files}
+            yield directory, dirs, files
+
+    async def create_directory(self, directory: PrismPath) -> None:
+        try:
+            await self.base.create_directory(directory)
+        finally:
+            self._invalidate(directory)
+
+    async def remove(self, path: PrismPath) -> None:
+        try:
+            await self.base.remove(path)
+        finally:
+            self._invalidate(path, recursive=True)
+
+    async def move(self, source: PrismPath, destination: PrismPath) -> None:
+        try:
+            await self.base.move(source, destination)
+        finally:
+            self._invalidate(source, recursive=True)
+            self._invalidate(destination, recursive=True)
+
+    async def copy(self, source: PrismPath, destination: PrismPath) -> None:
+        try:
+            await self.base.copy(source, destination)
+        finally:
+            self._invalidate(destination, recursive=True)
+
+    async def get_size(self, path: PrismPath) -> int:
+        return (await self._stat(path)).size
+
+    async def get_creation_time(self, path: PrismPath) -> float:
+        return await self.base.get_creation_time(path)
+
+    async def get_modification_time(self, path: PrismPath) -> float:
+        return (await self._stat(path)).mtime
+
+    async def set_modification_time(self, path: PrismPath, time: float) -> None:
+        try:
+            await self.base.set_modification_time(path, time)
+        finally:
+            self._invalidate(path)
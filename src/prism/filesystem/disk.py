@@ -1,20 +1,173 @@
-import asyncio
+import codecs
+import ctypes
+import itertools
+import json
 import os
 import shutil
+import stat
+import struct
+import sys
+import threading
+import time
+import zlib
+from functools import partial
+from logging import getLogger
 from os import PathLike
 from pathlib import Path
-from typing import AsyncIterator
-
-import aiofiles
-import aiopath
+from typing import AsyncIterator, Callable, Literal, Self, Sequence, TypeVar, overload
 
 from ..exceptions import PrismNotFoundError
 from ..types import METADATA_ROOT_DIR_NAME
-from . import FileSystem, PrismPath
+from . import DirEntry, FileSystem, PrismPath, WalkItem
+from .executor import DEFAULT_IO_WORKERS, IOExecutor
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# syncfs(2), which flushes a single filesystem, where the C library has it.
+_syncfs: Callable[[int], int] | None = None
+if sys.platform == "linux":
+    try:
+        _syncfs = getattr(ctypes.CDLL(None, use_errno=True), "syncfs", None)
+    except OSError:
+        pass
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+# Size of the chunks in which files are read and classified as text or binary.
+READ_CHUNK_SIZE = 64 * 1024
+
+# Number of directories walk() scans per worker thread hop.
+WALK_BATCH_SIZE = 16
+
+# Directory in the metadata directory holding write_atomic journals.
+JOURNAL_DIR_NAME = "journal"
+
+# Journal trailer: manifest length, CRC-32 of everything before it, magic.
+_JOURNAL_TRAILER = struct.Struct("<QI8s")
+_JOURNAL_MAGIC = b"PRISMJNL"
+
+
+# Lock file in the journal directory, held while a batch is committed or
+# journals are replayed.
+JOURNAL_LOCK_NAME = "lock"
+
+# Distinguishes journals written in the same nanosecond by one process.
+_journal_ids = itertools.count()
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Make the entries of a directory, such as a rename into it, durable.
+
+    Windows can't open directories, and makes renames durable on its own.
+    """
+    if sys.platform == "win32":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _flush_filesystem(directory: Path) -> None:
+    """Write the files and renames of the filesystem holding a directory to
+    stable storage, in one call.
+
+    Linux flushes only that filesystem; other systems flush all of them.
+    """
+    if _syncfs is None:
+        os.sync()
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        if _syncfs(fd) != 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+    finally:
+        os.close(fd)
+
+
+class _JournalLock:
+    """An exclusive lock on a repository's journals, across processes and the
+    threads of each process."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __enter__(self) -> Self:
+        self._file = open(self.path, "a+b")
+        try:
+            if sys.platform == "win32":
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK gives up after ten seconds.
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            self._file.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            if sys.platform == "win32":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+
+
+def _decode_chunk(decoder: codecs.IncrementalDecoder, chunk: bytes) -> str | None:
+    """Decode the next chunk of a file, or return None if it isn't text.
+
+    An empty chunk marks the end of the file and flushes the decoder.
+    """
+    if b"\x00" in chunk:
+        return None
+    try:
+        return decoder.decode(chunk, final=not chunk)
+    except UnicodeDecodeError:
+        return None
+
+
+def _is_text(data: bytes) -> bool:
+    """Check whether a whole file is text, without keeping its decoded text."""
+    if b"\x00" in data:
+        return False
+    if data.isascii():
+        return True
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
 
 
 class Disk(FileSystem):
-    def __init__(self, root: PathLike):
+    """A FileSystem on a local directory.
+
+    Blocking calls run on the drive's own IOExecutor, which bounds the number
+    of concurrent operations to max_workers. Each operation takes a single
+    thread hop, and several small calls can share one hop with run_batch.
+    """
+
+    def __init__(
+        self,
+        root: PathLike,
+        max_workers: int = DEFAULT_IO_WORKERS,
+        replay: bool = True,
+    ):
         root = Path(root)
         if not root.exists():
             raise FileNotFoundError(f"Root directory {root} does not exist")
@@ -22,6 +175,17 @@ class Disk(FileSystem):
             raise NotADirectoryError(f"Root path {root} is not a directory")
 
         self.root = root.resolve()
+        self.io = IOExecutor(max_workers)
+
+        # Directories this drive has created or seen created, so writes into
+        # them can skip the mkdir call. Worker threads add to the set while the
+        # event loop prunes it, so both go through the lock.
+        self._known_directories: set[Path] = {self.root}
+        self._directories_lock = threading.Lock()
+
+        # Finish any write_atomic batch an earlier process was interrupted in,
+        # unless the caller already did for this repository.
+        self.replayed = self._replay_journals() if replay else 0
 
     @staticmethod
     def find_prism_root(path: PathLike | None = None) -> Path:
@@ -41,9 +205,23 @@ class Disk(FileSystem):
         raise PrismNotFoundError("Could not find Prism root")
 
     @staticmethod
-    def find_prism_drive(path: PathLike | None = None) -> "Disk":
+    def find_prism_drive(
+        path: PathLike | None = None, max_workers: int = DEFAULT_IO_WORKERS
+    ) -> "Disk":
         """Find the Prism drive by looking for the Prism root directory."""
-        return Disk(Disk.find_prism_root(path))
+        return Disk(Disk.find_prism_root(path), max_workers=max_workers)
+
+    async def run_batch(self, calls: list[Callable[[], T]]) -> list[T | Exception]:
+        """Run several small blocking calls in a single thread hop.
+
+        Returns the results in order, with each failed call's exception in its
+        place. See IOExecutor.run_batch.
+        """
+        return await self.io.run_batch(calls)
+
+    def close(self) -> None:
+        """Stop the drive's I/O worker threads."""
+        self.io.shutdown()
 
     # FileSystem interface implementation.
 
@@ -69,102 +247,461 @@ class Disk(FileSystem):
 
     async def exists(self, path: PrismPath) -> bool:
         resolved = await self.full_native_path(path)
-        return await aiopath.AsyncPath(resolved).exists()
+        return await self.io.run(os.path.exists, resolved)
 
     async def is_directory(self, path: PrismPath) -> bool:
         resolved = await self.full_native_path(path)
-        return await aiopath.AsyncPath(resolved).is_dir()
+        return await self.io.run(os.path.isdir, resolved)
 
     async def is_file(self, path: PrismPath) -> bool:
         resolved = await self.full_native_path(path)
-        return await aiopath.AsyncPath(resolved).is_file()
+        return await self.io.run(os.path.isfile, resolved)
 
-    async def read(self, path: PrismPath) -> str:
-        resolved = await self.full_native_path(path)
-        if not await self.exists(path):
+    @staticmethod
+    def _read_file(resolved: Path, as_text: bool) -> str | bytes | None:
+        """Read a file in one pass, classifying it as text or binary.
+
+        Content is text if it is valid UTF-8 without null bytes. Text is
+        checked and decoded chunk by chunk as it is read, so binary files are
+        rejected by read() after their first chunk, without reading the rest.
+        Binary reads keep only the raw bytes and check them once at the end.
+
+        Returns the decoded text (as_text) or the raw bytes (not as_text), or
+        None if the file holds the other kind of content.
+        """
+        if not as_text:
+            with open(resolved, "rb", buffering=0) as f:
+                data = f.readall()
+            return None if _is_text(data) else data
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        text: list[str] = []
+        with open(resolved, "rb", buffering=0) as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                decoded = _decode_chunk(decoder, chunk)
+                if decoded is None:
+                    return None
+                text.append(decoded)
+                if not chunk:
+                    break
+        return "".join(text)
+
+    @staticmethod
+    def _read_file_head(resolved: Path, max_bytes: int) -> str | None:
+        """Read and decode at most max_bytes from the start of a file.
+
+        Returns None if the bytes read aren't text.
+        """
+        with open(resolved, "rb", buffering=0) as f:
+            head = f.read(max_bytes)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        text = _decode_chunk(decoder, head)
+        if text is not None and len(head) < max_bytes:
+            # The whole file was read, so it must not end mid-character.
+            if _decode_chunk(decoder, b"") is None:
+                return None
+        return text
+
+    @overload
+    def _read_path(
+        self,
+        path: PrismPath,
+        resolved: Path,
+        as_text: Literal[True],
+        max_bytes: int | None = None,
+    ) -> str: ...
+
+    @overload
+    def _read_path(
+        self, path: PrismPath, resolved: Path, as_text: Literal[False]
+    ) -> bytes: ...
+
+    def _read_path(
+        self,
+        path: PrismPath,
+        resolved: Path,
+        as_text: bool,
+        max_bytes: int | None = None,
+    ) -> str | bytes:
+        """Read a file, raising FileSystem errors (runs in a worker thread).
+
+        With max_bytes, only the start of a text file is read.
+        """
+        try:
+            if max_bytes is None:
+                content = self._read_file(resolved, as_text)
+            else:
+                content = self._read_file_head(resolved, max_bytes)
+        except FileNotFoundError:
             raise FileNotFoundError(f"File {path} does not exist")
-        if await self.is_directory(path):
+        except IsADirectoryError:
             raise IsADirectoryError(f"Path {path} is a directory")
+        except PermissionError:
+            # Windows reports opening a directory as a permission error.
+            if resolved.is_dir():
+                raise IsADirectoryError(f"Path {path} is a directory")
+            raise
 
-        # First read as binary to check for binary content
-        async with aiofiles.open(resolved, mode="rb") as f:
-            content = await f.read()
-            # Check for null bytes which indicate binary content
-            if b"\x00" in content:
-                raise ValueError(f"File {path} contains binary data")
+        if content is None:
+            kind = "binary" if as_text else "text"
+            raise ValueError(f"File {path} contains {kind} data")
+        return content
 
-            # If we get here, try to decode as text
-            try:
-                return content.decode("utf-8")
-            except UnicodeDecodeError:
-                raise ValueError(f"File {path} contains binary data")
+    async def read(self, path: PrismPath) -> str:
+        resolved = await self.full_native_path(path)
+        return await self.io.run(self._read_path, path, resolved, True)
 
     async def read_binary(self, path: PrismPath) -> bytes:
         resolved = await self.full_native_path(path)
-        if not await self.exists(path):
-            raise FileNotFoundError(f"File {path} does not exist")
-        if await self.is_directory(path):
-            raise IsADirectoryError(f"Path {path} is a directory")
+        return await self.io.run(self._read_path, path, resolved, False)
 
-        async with aiofiles.open(resolved, mode="rb") as f:
-            content = await f.read()
-            # Try to decode as text to check if it's actually text data
-            try:
-                content.decode("utf-8")
-                raise ValueError(f"File {path} contains text data")
-            except UnicodeDecodeError:
-                return content
+    async def read_many(self, paths: Sequence[PrismPath]) -> list[str | Exception]:
+        calls = [
+            partial(self._read_path, path, await self.full_native_path(path), True)
+            for path in paths
+        ]
+        return await self.io.run_batch(calls)
 
-    async def write(self, path: PrismPath, content: str) -> None:
+    async def read_head(self, path: PrismPath, max_bytes: int) -> str:
         resolved = await self.full_native_path(path)
-        if resolved.exists() and resolved.is_dir():
+        return await self.io.run(self._read_path, path, resolved, True, max_bytes)
+
+    async def read_head_many(
+        self, paths: Sequence[PrismPath], max_bytes: int
+    ) -> list[str | Exception]:
+        calls = []
+        for path in paths:
+            resolved = await self.full_native_path(path)
+            calls.append(partial(self._read_path, path, resolved, True, max_bytes))
+        return await self.io.run_batch(calls)
+
+    def _is_known_directory(self, directory: Path) -> bool:
+        with self._directories_lock:
+            return directory in self._known_directories
+
+    def _remember_directory(self, directory: Path) -> None:
+        with self._directories_lock:
+            self._known_directories.add(directory)
+
+    def _write_file(self, resolved: Path, content: bytes) -> None:
+        """Write a file, creating its parent directories on first use."""
+        parent = resolved.parent
+        if not self._is_known_directory(parent):
+            try:
+                parent.mkdir(parents=True, exist_ok=True)
+            except FileExistsError:
+                raise NotADirectoryError(f"Path {parent} exists but is not a directory")
+            self._remember_directory(parent)
+
+        try:
+            f = open(resolved, "wb")
+        except FileNotFoundError:
+            # The parent was removed since we created it; create it again.
+            parent.mkdir(parents=True, exist_ok=True)
+            f = open(resolved, "wb")
+        with f:
+            f.write(content)
+
+    def _write_path(self, path: PrismPath, resolved: Path, content: bytes) -> None:
+        """Write a file, raising FileSystem errors (runs in a worker thread)."""
+        try:
+            self._write_file(resolved, content)
+        except IsADirectoryError:
             raise IsADirectoryError(f"Path {path} is a directory")
+        except PermissionError:
+            if resolved.is_dir():
+                raise IsADirectoryError(f"Path {path} is a directory")
+            raise
+
+    def _forget_directories(self, resolved: Path) -> None:
+        """Drop remembered directories at or below a removed path."""
+        with self._directories_lock:
+            self._known_directories = {
+                d
+                for d in self._known_directories
+                if d != resolved and resolved not in d.parents
+            }
 
-        # Create parent directories if they don't exist
-        await asyncio.to_thread(
-            lambda: resolved.parent.mkdir(parents=True, exist_ok=True)
-        )
-
+    async def write(self, path: PrismPath, content: str) -> None:
+        resolved = await self.full_native_path(path)
         # Use binary mode and encode to UTF-8 explicitly to avoid encoding issues
-        async with aiofiles.open(resolved, mode="wb") as f:
-            await f.write(content.encode("utf-8"))
+        await self.io.run(self._write_path, path, resolved, content.encode("utf-8"))
 
     async def write_binary(self, path: PrismPath, content: bytes) -> None:
         resolved = await self.full_native_path(path)
-        if resolved.exists() and resolved.is_dir():
+        await self.io.run(self._write_path, path, resolved, content)
+
+    # Journaled batches.
+
+    @property
+    def journal_directory(self) -> Path:
+        return self.root / METADATA_ROOT_DIR_NAME / JOURNAL_DIR_NAME
+
+    def _check_target(self, path: PrismPath, resolved: Path) -> None:
+        """Raise the error writing to a path would, without writing to it."""
+        if resolved.is_dir():
             raise IsADirectoryError(f"Path {path} is a directory")
+        parent = resolved.parent
+        while parent != self.root and not self._is_known_directory(parent):
+            if parent.exists():
+                if not parent.is_dir():
+                    raise NotADirectoryError(
+                        f"Path {parent} exists but is not a directory"
+                    )
+                break
+            parent = parent.parent
+
+    def _write_journal(self, batch: list[tuple[str, bytes]]) -> Path:
+        """Write a batch to a single journal file and fsync it once.
+
+        The journal ends with a trailer holding a checksum of its content, so
+        a journal that was only partly written is recognized and ignored.
+        """
+        manifest = json.dumps([[path, len(data)] for path, data in batch]).encode()
+        crc = zlib.crc32(manifest)
+        for _, data in batch:
+            crc = zlib.crc32(data, crc)
+
+        directory = self.journal_directory
+        name = f"{time.time_ns():020d}-{os.getpid()}-{next(_journal_ids):08d}"
+        journal = directory / f"{name}.journal"
+        with open(journal, "wb") as f:
+            f.write(manifest)
+            for _, data in batch:
+                f.write(data)
+            f.write(_JOURNAL_TRAILER.pack(len(manifest), crc, _JOURNAL_MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_directory(directory)
+        return journal
 
-        # Create parent directories if they don't exist
-        await asyncio.to_thread(
-            lambda: resolved.parent.mkdir(parents=True, exist_ok=True)
+    @staticmethod
+    def _read_journal(journal: Path) -> list[tuple[str, bytes]] | None:
+        """Read a journal's batch, or None if the journal is incomplete."""
+        content = journal.read_bytes()
+        if len(content) < _JOURNAL_TRAILER.size:
+            return None
+        body = content[: -_JOURNAL_TRAILER.size]
+        manifest_size, crc, magic = _JOURNAL_TRAILER.unpack_from(content, len(body))
+        if magic != _JOURNAL_MAGIC or zlib.crc32(body) != crc:
+            return None
+
+        batch = []
+        offset = manifest_size
+        for path, size in json.loads(body[:manifest_size]):
+            batch.append((path, body[offset : offset + size]))
+            offset += size
+        return batch
+
+    def _apply_batch(self, batch: list[tuple[Path, bytes]]) -> None:
+        """Replace each file with an atomic rename, so readers never see it torn.
+
+        Once every file is renamed, the repository's filesystem is flushed
+        once, so the batch is durable on return. Windows can't flush a
+        filesystem, so there each staged file is fsynced before its rename,
+        which Windows makes durable on its own.
+        """
+        for parent in {resolved.parent for resolved, _ in batch}:
+            parent.mkdir(parents=True, exist_ok=True)
+        sync_each = sys.platform == "win32"
+        for resolved, data in batch:
+            target = os.fspath(resolved)
+            head, name = os.path.split(target)
+            staged = os.path.join(head, f".{name}.prism-tmp")
+            with open(staged, "wb") as f:
+                f.write(data)
+                if sync_each:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(staged, target)
+        if not sync_each:
+            _flush_filesystem(self.root)
+
+    def _commit_batch(self, batch: list[tuple[PrismPath, Path, bytes]]) -> None:
+        for path, resolved, _ in batch:
+            self._check_target(path, resolved)
+        files = [(resolved, data) for _, resolved, data in batch]
+        if not (self.root / METADATA_ROOT_DIR_NAME).is_dir():
+            # Creating the journal directory would make this a repository.
+            self._apply_batch(files)
+            return
+
+        entries = [
+            (resolved.relative_to(self.root).as_posix(), data)
+            for resolved, data in files
+        ]
+        directory = self.journal_directory
+        directory.mkdir(exist_ok=True)
+        with _JournalLock(directory / JOURNAL_LOCK_NAME):
+            journal = self._write_journal(entries)
+            self._apply_batch(files)
+            journal.unlink()
+
+    def _replay_journals(self) -> int:
+        """Apply the batches of complete journals left behind by a crash.
+
+        Journals are written and applied under the journal lock, so none that
+        replay sees while holding it is still in use. A journal that fails to
+        replay is logged and moved aside with a .failed suffix, so it doesn't
+        stop the repository from being opened.
+
+        Returns:
+            int: The number of batches replayed.
+        """
+        directory = self.journal_directory
+        if not directory.is_dir():
+            return 0
+
+        replayed = 0
+        try:
+            with _JournalLock(directory / JOURNAL_LOCK_NAME):
+                for journal in sorted(directory.glob("*.journal")):
+                    try:
+                        batch = self._read_journal(journal)
+                        if batch is not None:
+                            self._apply_batch(
+                                [(self.root / path, data) for path, data in batch]
+                            )
+                            replayed += 1
+                    except (OSError, ValueError, KeyError, TypeError) as e:
+                        logger.warning(f"Failed to replay journal {journal}: {e}")
+                        journal.replace(journal.with_suffix(".failed"))
+                        continue
+                    # Incomplete journals were never applied, so they are
+                    # simply dropped.
+                    journal.unlink()
+        except OSError as e:
+            logger.warning(f"Failed to replay the journals in {directory}: {e}")
+        return replayed
+
+    async def write_atomic(
+        self, items: Sequence[tuple[PrismPath, str | bytes]]
+    ) -> None:
+        """Write several files as one all-or-nothing batch through a journal.
+
+        Every target is checked first. The batch is then written to a single
+        journal file in the metadata directory and fsynced once (group
+        commit), after which each file is replaced with an atomic rename. A
+        single flush of the filesystem then makes the renamed files durable,
+        and the journal is removed. If the process dies in between, the next
+        Disk opened on the repository replays the journal. Batches are
+        committed one at a time per repository, across threads and processes.
+
+        Outside a repository (a root without a metadata directory), there is
+        no journal: each file is still replaced atomically, but a crash can
+        leave the batch partly written.
+        """
+        if not items:
+            return
+        batch = []
+        for path, content in items:
+            data = content.encode("utf-8") if isinstance(content, str) else content
+            batch.append((path, await self.full_native_path(path), data))
+        await self.io.run(self._commit_batch, batch)
+
+    async def write_many(
+        self, items: Sequence[tuple[PrismPath, str]]
+    ) -> list[Exception | None]:
+        calls = [
+            partial(
+                self._write_path,
+                path,
+                await self.full_native_path(path),
+                content.encode("utf-8"),
+            )
+            for path, content in items
+        ]
+        return await self.io.run_batch(calls)
+
+    @staticmethod
+    def _dir_entry(name: str, stats: os.stat_result) -> DirEntry:
+        is_directory = stat.S_ISDIR(stats.st_mode)
+        return DirEntry(
+            name=name,
+            is_directory=is_directory,
+            size=0 if is_directory else stats.st_size,
+            mtime=stats.st_mtime,
         )
 
-        async with aiofiles.open(resolved, mode="wb") as f:
-            await f.write(content)
+    async def stat(self, path: PrismPath) -> DirEntry:
+        stats = await self._stat_result(path)
+        return self._dir_entry(PrismPath(path).name, stats)
 
-    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
-        if not await self.exists(directory):
+    def _stat_path(self, path: PrismPath, resolved: Path) -> DirEntry:
+        try:
+            stats = os.stat(resolved)
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError(f"Path {path} does not exist")
+        return self._dir_entry(PrismPath(path).name, stats)
+
+    async def stat_many(self, paths: Sequence[PrismPath]) -> list[DirEntry | Exception]:
+        calls = [
+            partial(self._stat_path, path, await self.full_native_path(path))
+            for path in paths
+        ]
+        return await self.io.run_batch(calls)
+
+    @classmethod
+    def _scan(cls, directory: Path) -> list[DirEntry]:
+        """List a directory with a single scandir pass (runs in a worker thread)."""
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    # Follows symlinks, like is_file/is_dir. Broken links are
+                    # skipped, as they are neither files nor directories.
+                    stats = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append(cls._dir_entry(entry.name, stats))
+        return entries
+
+    async def list_entries(self, directory: PrismPath) -> list[DirEntry]:
+        resolved = await self.full_native_path(directory)
+        try:
+            return await self.io.run(self._scan, resolved)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Directory {directory} does not exist")
-        if not await self.is_directory(directory):
+        except NotADirectoryError:
             raise NotADirectoryError(f"Path {directory} is not a directory")
 
-        async for entry in aiopath.AsyncPath(
-            await self.full_native_path(directory)
-        ).iterdir():
-            if await entry.is_file():
-                yield await self.prism_path(entry)
+    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        for entry in await self.list_entries(directory):
+            if entry.is_file:
+                yield PrismPath(directory) / entry.name
 
     async def list_directories(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
-        if not await self.exists(directory):
-            raise FileNotFoundError(f"Directory {directory} does not exist")
-        if not await self.is_directory(directory):
-            raise NotADirectoryError(f"Path {directory} is not a directory")
-
-        async for entry in aiopath.AsyncPath(
-            await self.full_native_path(directory)
-        ).iterdir():
-            if await entry.is_dir():
-                yield await self.prism_path(entry)
+        for entry in await self.list_entries(directory):
+            if entry.is_directory:
+                yield PrismPath(directory) / entry.name
+
+    async def _walk(
+        self, root: PrismPath, exclude: frozenset[str]
+    ) -> AsyncIterator[WalkItem]:
+        """Scan directories breadth-first, up to WALK_BATCH_SIZE per thread hop."""
+        pending = [root]
+        while pending:
+            batch = pending[:WALK_BATCH_SIZE]
+            del pending[:WALK_BATCH_SIZE]
+            calls = [
+                partial(self._scan, await self.full_native_path(directory))
+                for directory in batch
+            ]
+            for directory, entries in zip(batch, await self.io.run_batch(calls)):
+                if isinstance(entries, (FileNotFoundError, NotADirectoryError)):
+                    if directory != root:
+                        continue  # Removed during the walk.
+                    if isinstance(entries, FileNotFoundError):
+                        raise FileNotFoundError(f"Directory {root} does not exist")
+                    raise NotADirectoryError(f"Path {root} is not a directory")
+                if isinstance(entries, Exception):
+                    raise entries
+                dirs = [
+                    e.name for e in entries if e.is_directory and e.name not in exclude
+                ]
+                yield directory, dirs, [e for e in entries if e.is_file]
+                pending.extend(directory / name for name in dirs)
 
     async def create_directory(self, directory: PrismPath) -> None:
         """Create a directory and all necessary parent directories."""
@@ -177,75 +714,84 @@ class Disk(FileSystem):
 
         # Create the directory
         target_path = self.root / directory
-        target_path.mkdir(exist_ok=True)
-
-    async def remove(self, path: PrismPath) -> None:
-        if not await self.exists(path):
-            raise FileNotFoundError(f"Path {path} does not exist")
+        await self.io.run(partial(target_path.mkdir, exist_ok=True))
+        self._remember_directory(target_path)
 
-        resolved = await self.full_native_path(path)
-        if await self.is_directory(path):
-            await asyncio.to_thread(lambda: shutil.rmtree(resolved))
+    @staticmethod
+    def _remove_path(resolved: Path) -> None:
+        if resolved.is_dir() and not resolved.is_symlink():
+            shutil.rmtree(resolved)
         else:
-            await aiopath.AsyncPath(resolved).unlink()
+            os.unlink(resolved)
 
-    async def move(self, source: PrismPath, destination: PrismPath) -> None:
-        if not await self.exists(source):
-            raise FileNotFoundError(f"Source path {source} does not exist")
+    async def remove(self, path: PrismPath) -> None:
+        resolved = await self.full_native_path(path)
+        self._forget_directories(resolved)
+        try:
+            await self.io.run(self._remove_path, resolved)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Path {path} does not exist")
 
+    @staticmethod
+    def _move_path(src: Path, dst: Path) -> None:
+        if not os.path.lexists(src):
+            raise FileNotFoundError(src)
         # Create parent directories if they don't exist
-        dst = await self.full_native_path(destination)
-        await asyncio.to_thread(lambda: dst.parent.mkdir(parents=True, exist_ok=True))
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(src, dst)
 
+    async def move(self, source: PrismPath, destination: PrismPath) -> None:
         src = await self.full_native_path(source)
-        await asyncio.to_thread(lambda: shutil.move(src, dst))
-
-    async def copy(self, source: PrismPath, destination: PrismPath) -> None:
-        if not await self.exists(source):
+        dst = await self.full_native_path(destination)
+        self._forget_directories(src)
+        try:
+            await self.io.run(self._move_path, src, dst)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Source path {source} does not exist")
 
+    @classmethod
+    def _copy_path(cls, src: Path, dst: Path) -> None:
+        if not os.path.lexists(src):
+            raise FileNotFoundError(src)
         # Create parent directories if they don't exist
-        dst = await self.full_native_path(destination)
-        await asyncio.to_thread(lambda: dst.parent.mkdir(parents=True, exist_ok=True))
-
-        src = await self.full_native_path(source)
-        if await self.is_directory(source):
-            if await self.exists(destination):
-                await self.remove(destination)
-            await asyncio.to_thread(lambda: shutil.copytree(src, dst))
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if src.is_dir():
+            if os.path.lexists(dst):
+                cls._remove_path(dst)
+            shutil.copytree(src, dst)
         else:
-            await asyncio.to_thread(lambda: shutil.copy2(src, dst))
+            shutil.copy2(src, dst)
 
-    async def get_size(self, path: PrismPath) -> int:
-        if not await self.exists(path):
+    async def copy(self, source: PrismPath, destination: PrismPath) -> None:
+        src = await self.full_native_path(source)
+        dst = await self.full_native_path(destination)
+        self._forget_directories(dst)
+        try:
+            await self.io.run(self._copy_path, src, dst)
+        except FileNotFoundError:
+            if not await self.exists(source):
+                raise FileNotFoundError(f"Source path {source} does not exist")
+            raise
+
+    async def _stat_result(self, path: PrismPath) -> os.stat_result:
+        resolved = await self.full_native_path(path)
+        try:
+            return await self.io.run(os.stat, resolved)
+        except (FileNotFoundError, NotADirectoryError):
             raise FileNotFoundError(f"Path {path} does not exist")
 
-        if await self.is_directory(path):
-            return 0
-
-        resolved = await self.full_native_path(path)
-        stats = await aiopath.AsyncPath(resolved).stat()
-        return stats.st_size
+    async def get_size(self, path: PrismPath) -> int:
+        return (await self.stat(path)).size
 
     async def get_creation_time(self, path: PrismPath) -> float:
-        if not await self.exists(path):
-            raise FileNotFoundError(f"Path {path} does not exist")
-
-        resolved = await self.full_native_path(path)
-        stats = await aiopath.AsyncPath(resolved).stat()
-        return stats.st_ctime
+        return (await self._stat_result(path)).st_ctime
 
     async def get_modification_time(self, path: PrismPath) -> float:
-        if not await self.exists(path):
-            raise FileNotFoundError(f"Path {path} does not exist")
-
-        resolved = await self.full_native_path(path)
-        stats = await aiopath.AsyncPath(resolved).stat()
-        return stats.st_mtime
+        return (await self._stat_result(path)).st_mtime
 
     async def set_modification_time(self, path: PrismPath, time: float) -> None:
-        if not await self.exists(path):
-            raise FileNotFoundError(f"Path {path} does not exist")
-
         resolved = await self.full_native_path(path)
-        await asyncio.to_thread(lambda: os.utime(resolved, (time, time)))
+        try:
+            await self.io.run(os.utime, resolved, (time, time))
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError(f"Path {path} does not exist")
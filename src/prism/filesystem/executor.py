@@ -0,0 +1,115 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Default number of worker threads for blocking filesystem calls.
+DEFAULT_IO_WORKERS = 8
+
+
+@dataclass
+class IOStats:
+    """Counters of an IOExecutor.
+
+    Attributes:
+        submitted: Operations (or batches) handed to the executor
+        completed: Operations (or batches) that finished, successfully or not
+        in_flight: Operations currently running on a worker thread
+        queued: Operations waiting for a free worker
+        peak_in_flight: Highest in_flight seen
+        peak_queued: Highest queue depth seen
+        batched_calls: Calls run as part of a batch
+    """
+
+    submitted: int = 0
+    completed: int = 0
+    in_flight: int = 0
+    queued: int = 0
+    peak_in_flight: int = 0
+    peak_queued: int = 0
+    batched_calls: int = 0
+
+
+class IOExecutor:
+    """A bounded thread pool for blocking filesystem calls.
+
+    At most max_workers calls run at once, which also bounds the number of open
+    file descriptors. Further calls wait on the event loop, where they are
+    counted as queued, rather than piling up inside the thread pool.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_IO_WORKERS):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.stats = IOStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _limit(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; make a new one if the loop changed.
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="prism-io"
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on a worker thread and return its result."""
+        stats = self.stats
+        stats.submitted += 1
+        stats.queued += 1
+        stats.peak_queued = max(stats.peak_queued, stats.queued)
+        limit = self._limit()
+        try:
+            await limit.acquire()
+        finally:
+            stats.queued -= 1
+
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool(), partial(fn, *args))
+        finally:
+            stats.in_flight -= 1
+            stats.completed += 1
+            limit.release()
+
+    async def run_batch(self, calls: Sequence[Callable[[], T]]) -> list[T | Exception]:
+        """Run several small blocking calls one after another in one thread hop.
+
+        Returns the results in order. A call that raises doesn't stop the
+        others; its exception is returned in its place.
+        """
+
+        def run_all() -> list[T | Exception]:
+            results: list[T | Exception] = []
+            for call in calls:
+                try:
+                    results.append(call())
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        if not calls:
+            return []
+        self.stats.batched_calls += len(calls)
+        return await self.run(run_all)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads. The executor restarts them if used again."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
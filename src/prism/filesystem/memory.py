@@ -1,9 +1,16 @@
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field, replace
 from os import PathLike
 from pathlib import Path
-from typing import AsyncIterator, Dict, Optional, Union
+from typing import AsyncIterator, Dict, Optional, Sequence, Union
 
-from . import FileSystem, PrismPath
+from . import (
+    DirEntry,
+    FileSystem,
+    PrismPath,
+    WalkItem,
+    _truncate,
+)
 
 
 @dataclass
@@ -13,29 +20,94 @@ class FSEntry:
     Attributes:
         is_directory: Whether this entry is a directory
         content: File content (str for text, bytes for binary) or None for directories
+        children: Entries of a directory by name, or None for files
+        shared: Whether this entry may be reachable from more than one place in
+            the tree (after a copy), so it must be copied before it is modified
+        size: Size of the content in bytes (0 for directories)
+        ctime: Creation time as seconds since the epoch
+        mtime: Modification time as seconds since the epoch. For directories,
+            this changes when an entry is added or removed.
+        version: Value of the drive's change counter when this entry last changed
+        linked: Value of the drive's change counter when this entry was moved
+            or copied into place, which the versions below it never fall under
     """
 
     is_directory: bool
     content: Optional[Union[str, bytes]] = None
+    children: Optional[Dict[str, "FSEntry"]] = None
+    shared: bool = field(default=False, compare=False)
+    size: int = field(default=0, compare=False)
+    ctime: float = field(default_factory=time.time, compare=False)
+    mtime: float = field(default_factory=time.time, compare=False)
+    version: int = field(default=0, compare=False)
+    linked: int = field(default=0, compare=False)
 
     def __post_init__(self):
         if not self.is_directory and self.content is None:
             raise ValueError("Files must have content")
         if self.is_directory and self.content is not None:
             raise ValueError("Directories cannot have content")
+        if not self.is_directory and self.children is not None:
+            raise ValueError("Files cannot have children")
+        if self.is_directory and self.children is None:
+            self.children = {}
+        if isinstance(self.content, bytes) or (
+            isinstance(self.content, str) and self.content.isascii()
+        ):
+            self.size = len(self.content)
+        elif self.content is not None:
+            self.size = len(self.content.encode("utf-8"))
+
+    @property
+    def entries(self) -> Dict[str, "FSEntry"]:
+        """A directory's children by name."""
+        if self.children is None:
+            raise NotADirectoryError("Files have no children")
+        return self.children
+
+    def unshare(self) -> "FSEntry":
+        """Make a private, modifiable copy of a shared entry.
+
+        Only this entry is copied. A directory's children are not copied but
+        become shared themselves, as both copies now refer to them.
+        """
+        if not self.is_directory:
+            return replace(self, shared=False)
+        for child in self.entries.values():
+            child.shared = True
+        return replace(self, children=dict(self.entries), shared=False)
 
 
 class MemoryDrive(FileSystem):
     """In-memory implementation of the FileSystem ABC.
 
-    This implementation stores all files and directories in memory using a dictionary.
-    Keys are PrismPath objects and values are FSEntry objects.
-    The root directory is implicitly present and not stored in the entries dict.
+    This implementation stores all files and directories in memory as a tree of
+    FSEntry nodes, each directory holding its children by name. Looking up a
+    path costs O(depth), and listing a directory only touches its children.
+
+    Moving relinks the source node under its new parent, and copying links the
+    same node in a second place, marked shared. A shared node is copied,
+    one level at a time, only when something below it is modified
+    (copy-on-write), so moves and copies cost O(depth) whatever their size.
+
+    Entries track their size, creation and modification times. The drive also
+    keeps a change counter that increases on every modification and is stamped
+    on the entries changed, so caches can check freshness by comparing
+    integers.
     """
 
     def __init__(self):
-        self.entries: Dict[PrismPath, FSEntry] = {}
+        self.tree = FSEntry(is_directory=True)
         self.root = Path("/")  # Base path for native path operations
+        self.change_counter = 0
+
+    def _touch(self, *entries: FSEntry) -> None:
+        """Record a change to entries, updating their mtime and version."""
+        self.change_counter += 1
+        now = time.time()
+        for entry in entries:
+            entry.mtime = now
+            entry.version = self.change_counter
 
     async def full_native_path(self, path: PrismPath) -> str:
         """Convert a PrismPath to a full native path."""
@@ -48,183 +120,326 @@ class MemoryDrive(FileSystem):
             path = self.root / path
         return PrismPath(path.relative_to(self.root))
 
+    # Tree helpers.
+
+    @staticmethod
+    def _parts(path: PrismPath) -> tuple[str, ...]:
+        return PrismPath(path).parts
+
+    def _lookup(self, path: PrismPath) -> Optional[FSEntry]:
+        """Find the entry at a path, or None if it doesn't exist."""
+        entry = self.tree
+        for part in self._parts(path):
+            if not entry.is_directory or part not in entry.entries:
+                return None
+            entry = entry.entries[part]
+        return entry
+
+    @staticmethod
+    def _own(parent: FSEntry, name: str) -> FSEntry:
+        """Get a child of an owned directory, unsharing it so it can be modified."""
+        child = parent.entries[name]
+        if child.shared:
+            child = parent.entries[name] = child.unshare()
+        return child
+
+    def _parent(self, path: PrismPath, create: bool = False) -> tuple[FSEntry, str]:
+        """Find the directory containing a path and the path's name within it.
+
+        Every directory on the way is unshared, so the returned parent can be
+        modified without affecting copies of it.
+
+        Args:
+            path: Path whose parent to find. Must not be the root.
+            create: Create missing parent directories.
+
+        Raises:
+            FileNotFoundError: If a parent is missing and create is False.
+            NotADirectoryError: If a parent path exists but is a file.
+        """
+        parts = self._parts(path)
+        if not parts:
+            raise ValueError("The root directory has no parent")
+
+        entry = self.tree
+        current = PrismPath()
+        for part in parts[:-1]:
+            current = current / part
+            if part not in entry.entries:
+                if not create:
+                    raise FileNotFoundError(f"Path {current} does not exist")
+                entry.entries[part] = FSEntry(is_directory=True)
+                self._touch(entry, entry.entries[part])
+            elif not entry.entries[part].is_directory:
+                raise NotADirectoryError(
+                    f"Path {current} exists but is not a directory"
+                )
+            entry = self._own(entry, part)
+        return entry, parts[-1]
+
     async def is_root(self, path: PrismPath) -> bool:
         """Check if a path represents the root directory."""
         return str(path) in ("", ".")
 
     async def exists(self, path: PrismPath) -> bool:
         """Check if a path exists in the filesystem."""
-        return await self.is_root(path) or path in self.entries
+        return self._lookup(path) is not None
 
     async def is_directory(self, path: PrismPath) -> bool:
         """Check if a path is a directory."""
-        if await self.is_root(path):
-            return True
-        return path in self.entries and self.entries[path].is_directory
+        entry = self._lookup(path)
+        return entry is not None and entry.is_directory
 
     async def is_file(self, path: PrismPath) -> bool:
         """Check if a path is a file."""
-        return path in self.entries and not self.entries[path].is_directory
-
-    async def _ensure_parent_exists(self, path: PrismPath) -> None:
-        """Create parent directories if they don't exist."""
-        parent = PrismPath(Path(str(path)).parent)
-        if str(parent) in ("", "."):
-            return
-
-        # Create all parent directories
-        current = PrismPath(".")
-        for part in Path(str(path)).parts[:-1]:
-            current = PrismPath(str(current / part))
-            if not await self.exists(current):
-                self.entries[current] = FSEntry(is_directory=True)
-            elif not await self.is_directory(current):
-                raise NotADirectoryError(
-                    f"Path {current} exists but is not a directory"
-                )
+        entry = self._lookup(path)
+        return entry is not None and not entry.is_directory
 
-    async def read(self, path: PrismPath) -> str:
-        """Read text content from a file."""
-        if path not in self.entries:
+    def _file(self, path: PrismPath) -> FSEntry:
+        """Get the file entry at a path for reading."""
+        entry = self._lookup(path)
+        if entry is None:
             raise FileNotFoundError(f"Path {path} does not exist")
-
-        entry = self.entries[path]
         if entry.is_directory:
             raise IsADirectoryError(f"Path {path} is a directory")
+        return entry
+
+    def _read_text(self, path: PrismPath) -> str:
+        entry = self._file(path)
         if isinstance(entry.content, bytes):
             raise ValueError(f"Path {path} contains binary data")
 
         return entry.content
 
+    async def read(self, path: PrismPath) -> str:
+        """Read text content from a file."""
+        return self._read_text(path)
+
+    async def read_many(self, paths: Sequence[PrismPath]) -> list[str | Exception]:
+        """Read the text content of several files in one pass."""
+        results: list[str | Exception] = []
+        for path in paths:
+            try:
+                results.append(self._read_text(path))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def read_head(self, path: PrismPath, max_bytes: int) -> str:
+        """Read the start of a text file."""
+        return _truncate(self._read_text(path), max_bytes)
+
     async def read_binary(self, path: PrismPath) -> bytes:
         """Read binary content from a file."""
-        if path not in self.entries:
-            raise FileNotFoundError(f"Path {path} does not exist")
-
-        entry = self.entries[path]
-        if entry.is_directory:
-            raise IsADirectoryError(f"Path {path} is a directory")
+        entry = self._file(path)
         if isinstance(entry.content, str):
             raise ValueError(f"Path {path} contains text data")
 
         return entry.content
 
+    def _write(self, path: PrismPath, content: Union[str, bytes]) -> None:
+        parent, name = self._parent(path, create=True)
+        existing = parent.entries.get(name)
+        if existing is not None and existing.is_directory:
+            raise IsADirectoryError(f"Path {path} is a directory")
+        entry = parent.entries[name] = FSEntry(is_directory=False, content=content)
+        if existing is None:
+            self._touch(parent, entry)
+        else:
+            entry.ctime = existing.ctime
+            self._touch(entry)
+
     async def write(self, path: PrismPath, content: str) -> None:
         """Write text content to a file."""
-        await self._ensure_parent_exists(path)
-        self.entries[path] = FSEntry(is_directory=False, content=content)
+        self._write(path, content)
 
     async def write_binary(self, path: PrismPath, content: bytes) -> None:
         """Write binary content to a file."""
-        await self._ensure_parent_exists(path)
-        self.entries[path] = FSEntry(is_directory=False, content=content)
+        self._write(path, content)
+
+    async def write_many(
+        self, items: Sequence[tuple[PrismPath, str]]
+    ) -> list[Exception | None]:
+        """Write text content to several files in one pass."""
+        results: list[Exception | None] = []
+        for path, content in items:
+            try:
+                self._write(path, content)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    @staticmethod
+    def _dir_entry(name: str, entry: FSEntry) -> DirEntry:
+        return DirEntry(
+            name=name,
+            is_directory=entry.is_directory,
+            size=entry.size,
+            mtime=entry.mtime,
+        )
 
-    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
-        """List all files in a directory."""
-        if not await self.is_directory(directory):
+    async def stat(self, path: PrismPath) -> DirEntry:
+        """Get the kind, size and modification time of a path."""
+        return self._dir_entry(PrismPath(path).name, self._entry(path))
+
+    async def stat_many(self, paths: Sequence[PrismPath]) -> list[DirEntry | Exception]:
+        """Stat several paths in one pass."""
+        results: list[DirEntry | Exception] = []
+        for path in paths:
+            entry = self._lookup(path)
+            if entry is None:
+                results.append(FileNotFoundError(f"Path {path} does not exist"))
+            else:
+                results.append(self._dir_entry(PrismPath(path).name, entry))
+        return results
+
+    async def list_entries(self, directory: PrismPath) -> list[DirEntry]:
+        """List all files and directories in a directory."""
+        entry = self._lookup(directory)
+        if entry is None:
+            raise FileNotFoundError(f"Directory {directory} does not exist")
+        if not entry.is_directory:
             raise NotADirectoryError(f"Path {directory} is not a directory")
 
-        for path, entry in self.entries.items():
-            if not entry.is_directory and Path(str(path)).parent == Path(
-                str(directory)
-            ):
-                yield PrismPath(Path(str(path)).name)
+        return [self._dir_entry(name, child) for name, child in entry.entries.items()]
+
+    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        """List all files in a directory."""
+        for entry in await self.list_entries(directory):
+            if entry.is_file:
+                yield PrismPath(entry.name)
 
     async def list_directories(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
         """List all directories in a directory."""
-        if not await self.is_directory(directory):
-            raise NotADirectoryError(f"Path {directory} is not a directory")
-
-        for path, entry in self.entries.items():
-            if entry.is_directory and Path(str(path)).parent == Path(str(directory)):
-                yield PrismPath(Path(str(path)).name)
+        for entry in await self.list_entries(directory):
+            if entry.is_directory:
+                yield PrismPath(entry.name)
+
+    async def _walk(
+        self, root: PrismPath, exclude: frozenset[str]
+    ) -> AsyncIterator[WalkItem]:
+        """Walk the tree in memory, without a list_entries call per directory."""
+        await self.list_entries(root)  # Raises if root isn't a directory.
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            # Look each directory up again, as the consumer may change the tree.
+            entry = self._lookup(directory)
+            if entry is None or not entry.is_directory:
+                continue
+            dirs = []
+            files = []
+            for name, child in entry.entries.items():
+                if not child.is_directory:
+                    files.append(self._dir_entry(name, child))
+                elif name not in exclude:
+                    dirs.append(name)
+            yield directory, dirs, files
+            pending.extend(directory / name for name in reversed(dirs))
 
     async def create_directory(self, directory: PrismPath) -> None:
         """Create a new directory."""
         if await self.exists(directory):
             raise FileExistsError(f"Path {directory} already exists")
 
-        await self._ensure_parent_exists(directory)
-        self.entries[directory] = FSEntry(is_directory=True)
+        parent, name = self._parent(directory, create=True)
+        parent.entries[name] = FSEntry(is_directory=True)
+        self._touch(parent, parent.entries[name])
 
     async def remove(self, path: PrismPath) -> None:
         """Remove a file or directory."""
         if not await self.exists(path):
             raise FileNotFoundError(f"Path {path} does not exist")
+        if await self.is_root(path):
+            raise ValueError("Cannot remove the root directory")
+
+        # Detaching the entry drops its whole subtree with it.
+        parent, name = self._parent(path)
+        del parent.entries[name]
+        self._touch(parent)
 
-        if await self.is_directory(path):
-            # Remove all entries under this directory
-            prefix = str(path) + "/"
-            paths_to_remove = [p for p in self.entries if str(p).startswith(prefix)]
-            for p in paths_to_remove:
-                del self.entries[p]
-
-        del self.entries[path]
-
-    async def _recursive_copy(self, source: PrismPath, dest: PrismPath) -> None:
-        """Helper for copying directory contents."""
-        # First collect all items that need to be copied
-        copies = []
-        source_prefix = str(source) + "/"
-        for path, entry in self.entries.items():
-            if str(path).startswith(source_prefix):
-                # Calculate new path by replacing source prefix with destination
-                rel_path = str(path)[len(str(source)) :]
-                new_path = PrismPath(str(dest) + rel_path)
-                copies.append((new_path, entry))
-
-        # Then perform all copies
-        for new_path, entry in copies:
-            self.entries[new_path] = FSEntry(
-                is_directory=entry.is_directory, content=entry.content
-            )
+    def _check_not_inside(self, source: PrismPath, destination: PrismPath) -> None:
+        source_parts = self._parts(source)
+        if self._parts(destination)[: len(source_parts)] == source_parts:
+            raise ValueError(f"Cannot copy or move {source} into itself")
 
     async def move(self, source: PrismPath, destination: PrismPath) -> None:
         """Move a file or directory to a new location."""
         if not await self.exists(source):
             raise FileNotFoundError(f"Source path {source} does not exist")
+        if self._parts(source) == self._parts(destination):
+            return
+        self._check_not_inside(source, destination)
 
-        # First copy everything
-        await self.copy(source, destination)
-
-        # Then remove the source
-        await self.remove(source)
+        # Relink the source node under its new parent; nothing is copied.
+        dest_parent, dest_name = self._parent(destination, create=True)
+        source_parent, source_name = self._parent(source)
+        node = self._own(source_parent, source_name)
+        dest_parent.entries[dest_name] = source_parent.entries.pop(source_name)
+        self._touch(source_parent, dest_parent)
+        node.linked = self.change_counter
 
     async def copy(self, source: PrismPath, destination: PrismPath) -> None:
         """Copy a file or directory to a new location."""
-        if not await self.exists(source):
+        source_entry = self._lookup(source)
+        if source_entry is None:
             raise FileNotFoundError(f"Source path {source} does not exist")
-
-        await self._ensure_parent_exists(destination)
-        source_entry = self.entries[source]
-        self.entries[destination] = FSEntry(
-            is_directory=source_entry.is_directory, content=source_entry.content
-        )
-
-        if source_entry.is_directory:
-            await self._recursive_copy(source, destination)
+        if self._parts(source) == self._parts(destination):
+            return
+        self._check_not_inside(source, destination)
+
+        # Share the source node's children; they're copied lazily when either
+        # side changes. Only the node itself is copied, to be stamped below.
+        parent, name = self._parent(destination, create=True)
+        entry = parent.entries[name] = source_entry.unshare()
+        self._touch(parent)
+        entry.linked = self.change_counter
+
+    def _entry(self, path: PrismPath) -> FSEntry:
+        entry = self._lookup(path)
+        if entry is None:
+            raise FileNotFoundError(f"Path {path} does not exist")
+        return entry
 
     async def get_size(self, path: PrismPath) -> int:
         """Get the size of a file in bytes."""
-        if path not in self.entries:
-            raise FileNotFoundError(f"Path {path} does not exist")
-
-        entry = self.entries[path]
-        return 0 if entry.is_directory else len(entry.content)
+        return self._entry(path).size
 
     async def get_creation_time(self, path: PrismPath) -> float:
-        """Get creation time (always returns 0.0)."""
-        if not await self.exists(path):
-            raise FileNotFoundError(f"Path {path} does not exist")
-        return 0.0
+        """Get the creation time of a file or directory."""
+        return self._entry(path).ctime
 
     async def get_modification_time(self, path: PrismPath) -> float:
-        """Get modification time (always returns 0.0)."""
-        if not await self.exists(path):
-            raise FileNotFoundError(f"Path {path} does not exist")
-        return 0.0
+        """Get the modification time of a file or directory."""
+        return self._entry(path).mtime
+
+    async def get_version(self, path: PrismPath) -> int:
+        """Get the change counter value from when a path last changed.
+
+        A file's version changes whenever it is written. A directory's version
+        changes whenever an entry is added to or removed from it. Moving or
+        copying onto a path gives it, and every path below it, a new version,
+        so a path's version never goes backwards.
+        """
+        entry = self.tree
+        linked = 0
+        for part in self._parts(path):
+            if not entry.is_directory or part not in entry.entries:
+                raise FileNotFoundError(f"Path {path} does not exist")
+            entry = entry.entries[part]
+            linked = max(linked, entry.linked)
+        return max(linked, entry.version)
 
     async def set_modification_time(self, path: PrismPath, time: float) -> None:
-        """Set modification time (no-op)."""
+        """Set the modification time of a file or directory."""
         if not await self.exists(path):
             raise FileNotFoundError(f"Path {path} does not exist")
+
+        if await self.is_root(path):
+            entry = self.tree
+        else:
+            parent, name = self._parent(path)
+            entry = self._own(parent, name)
+        self._touch(entry)
+        entry.mtime = time
@@ -0,0 +1,388 @@
+from dataclasses import dataclass, field, replace
+from os import PathLike
+from typing import AsyncIterator, Sequence
+
+from . import DirEntry, FileSystem, PrismPath
+from .memory import MemoryDrive
+
+
+@dataclass
+class OverlayChanges:
+    """Changes an OverlayFileSystem holds for its base drive.
+
+    Attributes:
+        written: Files created or modified in the overlay
+        removed: Paths removed from the base drive (each with everything below it)
+        directories: Empty directories created in the overlay
+        touched: Paths whose modification time alone was set in the overlay
+    """
+
+    written: list[PrismPath] = field(default_factory=list)
+    removed: list[PrismPath] = field(default_factory=list)
+    directories: list[PrismPath] = field(default_factory=list)
+    touched: list[PrismPath] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return (
+            len(self.written)
+            + len(self.removed)
+            + len(self.directories)
+            + len(self.touched)
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.written)} written, {len(self.removed)} removed, "
+            f"{len(self.directories)} directories created, "
+            f"{len(self.touched)} touched"
+        )
+
+
+class OverlayFileSystem(FileSystem):
+    """A FileSystem that stages every change in memory above a base drive.
+
+    Reads see the base drive with the staged changes applied. Writes go to an
+    upper MemoryDrive, and removals are recorded as whiteouts that hide a base
+    path and everything below it. The base drive is never touched until
+    commit(), which applies all staged changes in one batch, or discard(),
+    which drops them.
+
+    Moves and copies are staged by copying the source tree into the upper
+    drive, so they cost as much as the tree is large. A new modification time
+    for a base path is staged on its own, without copying the path.
+    """
+
+    def __init__(self, base: FileSystem):
+        self.base = base
+        self.upper = MemoryDrive()
+        self._whiteouts: set[PrismPath] = set()
+        self._mtimes: dict[PrismPath, float] = {}
+
+    @property
+    def root(self):
+        return self.base.root
+
+    # Overlay helpers.
+
+    def _hidden(self, path: PrismPath) -> bool:
+        """Whether a base path is hidden by a whiteout on it or a parent."""
+        parts = PrismPath(path).parts
+        return any(
+            PrismPath(*parts[:i]) in self._whiteouts for i in range(1, len(parts) + 1)
+        )
+
+    def _in_base(self, path: PrismPath) -> bool:
+        """Whether lookups of path fall through to the base drive."""
+        return not self._hidden(path)
+
+    async def _check_parents(self, path: PrismPath) -> None:
+        """Raise NotADirectoryError if a parent of path is a file."""
+        for parent in reversed(PrismPath(path).parents):
+            if await self.upper.is_directory(parent):
+                continue
+            try:
+                entry = await self.stat(parent)
+            except FileNotFoundError:
+                return  # This and the remaining parents will be created.
+            if not entry.is_directory:
+                raise NotADirectoryError(f"Path {parent} exists but is not a directory")
+
+    async def _check_writable(self, path: PrismPath) -> None:
+        await self._check_parents(path)
+        if (
+            not await self.upper.exists(path)
+            and self._in_base(path)
+            and await self.base.is_directory(path)
+        ):
+            raise IsADirectoryError(f"Path {path} is a directory")
+
+    def _staged_time(self, path: PrismPath, entry: DirEntry) -> DirEntry:
+        """Apply a modification time staged for a base path to its entry."""
+        time = self._mtimes.get(PrismPath(path))
+        return entry if time is None else replace(entry, mtime=time)
+
+    async def _copy_file(self, source: PrismPath, destination: PrismPath) -> None:
+        try:
+            await self.write(destination, await self.read(source))
+        except ValueError:
+            await self.write_binary(destination, await self.read_binary(source))
+
+    # Staged changes.
+
+    async def changes(self) -> OverlayChanges:
+        """List the changes that commit() would apply to the base drive."""
+        changes = OverlayChanges()
+        for path in sorted(self._whiteouts):
+            if self._hidden(path.parent) or not await self.base.exists(path):
+                continue
+            changes.removed.append(path)
+
+        async for directory, dirs, files in self.upper.walk(exclude=()):
+            changes.written.extend(directory / f.name for f in files)
+            if (
+                not dirs
+                and not files
+                and not await self.upper.is_root(directory)
+                and (self._hidden(directory) or not await self.base.exists(directory))
+            ):
+                changes.directories.append(directory)
+
+        written = set(changes.written)
+        changes.touched.extend(p for p in sorted(self._mtimes) if p not in written)
+        return changes
+
+    async def commit(self) -> OverlayChanges:
+        """Apply the staged changes to the base drive and clear them.
+
+        Removals are applied first, then all files are written as a single
+        write_atomic batch.
+
+        Returns:
+            OverlayChanges: The changes that were applied.
+        """
+        changes = await self.changes()
+        for path in changes.removed:
+            await self.base.remove(path)
+        for directory in changes.directories:
+            if not await self.base.exists(directory):
+                await self.base.create_directory(directory)
+
+        items: list[tuple[PrismPath, str | bytes]] = []
+        for path in changes.written:
+            try:
+                items.append((path, await self.upper.read(path)))
+            except ValueError:
+                items.append((path, await self.upper.read_binary(path)))
+        await self.base.write_atomic(items)
+
+        for path, time in self._mtimes.items():
+            await self.base.set_modification_time(path, time)
+
+        self.discard()
+        return changes
+
+    def discard(self) -> None:
+        """Drop all staged changes."""
+        self.upper = MemoryDrive()
+        self._whiteouts.clear()
+        self._mtimes.clear()
+
+    # FileSystem interface implementation.
+
+    async def full_native_path(self, path: PrismPath) -> str:
+        return await self.base.full_native_path(path)
+
+    async def prism_path(self, native_path: PathLike) -> PrismPath:
+        return await self.base.prism_path(native_path)
+
+    async def is_root(self, path: PrismPath) -> bool:
+        return await self.base.is_root(path)
+
+    async def stat(self, path: PrismPath) -> DirEntry:
+        if await self.upper.exists(path):
+            return await self.upper.stat(path)
+        if not self._in_base(path):
+            raise FileNotFoundError(f"Path {path} does not exist")
+        return self._staged_time(path, await self.base.stat(path))
+
+    async def stat_many(self, paths: Sequence[PrismPath]) -> list[DirEntry | Exception]:
+        results: dict[int, DirEntry | Exception] = {}
+        from_base = []
+        for i, path in enumerate(paths):
+            if await self.upper.exists(path):
+                results[i] = await self.upper.stat(path)
+            elif not self._in_base(path):
+                results[i] = FileNotFoundError(f"Path {path} does not exist")
+            else:
+                from_base.append(i)
+
+        entries = await self.base.stat_many([paths[i] for i in from_base])
+        for i, entry in zip(from_base, entries):
+            if isinstance(entry, DirEntry):
+                entry = self._staged_time(paths[i], entry)
+            results[i] = entry
+        return [results[i] for i in range(len(paths))]
+
+    async def exists(self, path: PrismPath) -> bool:
+        if await self.upper.exists(path):
+            return True
+        return self._in_base(path) and await self.base.exists(path)
+
+    async def is_directory(self, path: PrismPath) -> bool:
+        try:
+            return (await self.stat(path)).is_directory
+        except FileNotFoundError:
+            return False
+
+    async def is_file(self, path: PrismPath) -> bool:
+        try:
+            return (await self.stat(path)).is_file
+        except FileNotFoundError:
+            return False
+
+    async def read(self, path: PrismPath) -> str:
+        if await self.upper.exists(path):
+            return await self.upper.read(path)
+        if not self._in_base(path):
+            raise FileNotFoundError(f"File {path} does not exist")
+        return await self.base.read(path)
+
+    async def read_binary(self, path: PrismPath) -> bytes:
+        if await self.upper.exists(path):
+            return await self.upper.read_binary(path)
+        if not self._in_base(path):
+            raise FileNotFoundError(f"File {path} does not exist")
+        return await self.base.read_binary(path)
+
+    async def read_many(self, paths: Sequence[PrismPath]) -> list[str | Exception]:
+        results: dict[int, str | Exception] = {}
+        from_base = []
+        for i, path in enumerate(paths):
+            if await self.upper.exists(path):
+                (results[i],) = await self.upper.read_many([path])
+            elif not self._in_base(path):
+                results[i] = FileNotFoundError(f"File {path} does not exist")
+            else:
+                from_base.append(i)
+
+        contents = await self.base.read_many([paths[i] for i in from_base])
+        for i, content in zip(from_base, contents):
+            results[i] = content
+        return [results[i] for i in range(len(paths))]
+
+    async def read_head(self, path: PrismPath, max_bytes: int) -> str:
+        if await self.upper.exists(path):
+            return await self.upper.read_head(path, max_bytes)
+        if not self._in_base(path):
+            raise FileNotFoundError(f"File {path} does not exist")
+        return await self.base.read_head(path, max_bytes)
+
+    async def read_head_many(
+        self, paths: Sequence[PrismPath], max_bytes: int
+    ) -> list[str | Exception]:
+        results: dict[int, str | Exception] = {}
+        from_base = []
+        for i, path in enumerate(paths):
+            if await self.upper.exists(path):
+                (results[i],) = await self.upper.read_head_many([path], max_bytes)
+            elif not self._in_base(path):
+                results[i] = FileNotFoundError(f"File {path} does not exist")
+            else:
+                from_base.append(i)
+
+        heads = await self.base.read_head_many([paths[i] for i in from_base], max_bytes)
+        for i, head in zip(from_base, heads):
+            results[i] = head
+        return [results[i] for i in range(len(paths))]
+
+    async def write(self, path: PrismPath, content: str) -> None:
+        await self._check_writable(path)
+        await self.upper.write(path, content)
+        self._mtimes.pop(PrismPath(path), None)  # Writing sets a new time.
+
+    async def write_binary(self, path: PrismPath, content: bytes) -> None:
+        await self._check_writable(path)
+        await self.upper.write_binary(path, content)
+        self._mtimes.pop(PrismPath(path), None)
+
+    async def list_entries(self, directory: PrismPath) -> list[DirEntry]:
+        entry = await self.stat(directory)  # Raises if it doesn't exist.
+        if not entry.is_directory:
+            raise NotADirectoryError(f"Path {directory} is not a directory")
+
+        entries: dict[str, DirEntry] = {}
+        if self._in_base(directory):
+            try:
+                for e in await self.base.list_entries(directory):
+                    path = PrismPath(directory) / e.name
+                    if path not in self._whiteouts:
+                        entries[e.name] = self._staged_time(path, e)
+            except (FileNotFoundError, NotADirectoryError):
+                pass  # Created, or replaced by a directory, in the overlay.
+        if await self.upper.is_directory(directory):
+            for e in await self.upper.list_entries(directory):
+                entries[e.name] = e
+        return list(entries.values())
+
+    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        for entry in await self.list_entries(directory):
+            if entry.is_file:
+                yield PrismPath(directory) / entry.name
+
+    async def list_directories(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        for entry in await self.list_entries(directory):
+            if entry.is_directory:
+                yield PrismPath(directory) / entry.name
+
+    async def create_directory(self, directory: PrismPath) -> None:
+        if await self.exists(directory):
+            raise FileExistsError(f"Path {directory} already exists")
+        await self._check_parents(directory)
+        await self.upper.create_directory(directory)
+
+    async def remove(self, path: PrismPath) -> None:
+        if not await self.exists(path):
+            raise FileNotFoundError(f"Path {path} does not exist")
+        if await self.is_root(path):
+            raise ValueError("Cannot remove the root directory")
+
+        path = PrismPath(path)
+        if await self.upper.exists(path):
+            await self.upper.remove(path)
+        self._whiteouts.add(path)
+        for p in [p for p in self._mtimes if p == path or path in p.parents]:
+            del self._mtimes[p]
+
+    async def move(self, source: PrismPath, destination: PrismPath) -> None:
+        if PrismPath(source).parts == PrismPath(destination).parts:
+            if not await self.exists(source):
+                raise FileNotFoundError(f"Source path {source} does not exist")
+            return
+        await self.copy(source, destination)
+        await self.remove(source)
+
+    async def copy(self, source: PrismPath, destination: PrismPath) -> None:
+        source, destination = PrismPath(source), PrismPath(destination)
+        if not await self.exists(source):
+            raise FileNotFoundError(f"Source path {source} does not exist")
+        if source.parts == destination.parts:
+            return
+        if destination.parts[: len(source.parts)] == source.parts:
+            raise ValueError(f"Cannot copy or move {source} into itself")
+
+        if await self.exists(destination):
+            await self.remove(destination)
+        if await self.is_file(source):
+            await self._copy_file(source, destination)
+            return
+        async for directory, _, files in self.walk(source, exclude=()):
+            target = destination / directory.relative_to(source)
+            if not files and not await self.exists(target):
+                await self.create_directory(target)
+            for f in files:
+                await self._copy_file(directory / f.name, target / f.name)
+
+    async def get_size(self, path: PrismPath) -> int:
+        return (await self.stat(path)).size
+
+    async def get_creation_time(self, path: PrismPath) -> float:
+        if await self.upper.exists(path):
+            return await self.upper.get_creation_time(path)
+        if not self._in_base(path):
+            raise FileNotFoundError(f"Path {path} does not exist")
+        return await self.base.get_creation_time(path)
+
+    async def get_modification_time(self, path: PrismPath) -> float:
+        return (await self.stat(path)).mtime
+
+    async def set_modification_time(self, path: PrismPath, time: float) -> None:
+        if not await self.exists(path):
+            raise FileNotFoundError(f"Path {path} does not exist")
+
+        # Paths in the upper drive take the time themselves. Reads of base
+        # paths apply it from _mtimes, so nothing is copied.
+        path = PrismPath(path)
+        if await self.upper.exists(path):
+            await self.upper.set_modification_time(path, time)
+        self._mtimes[path] = time
@@ -0,0 +1,341 @@
+"""
+A read-only FileSystem served from a single pack file.
+
+Layout of a pack file (all integers little-endian):
+
+    header   magic (8 bytes), entry count (u64), index offset (u64)
+    data     file contents, back to back
+    keys     one key per entry: parent path, a NUL byte, then the entry's name
+    index    one fixed-size record per entry, sorted by key: key offset (u64),
+             key length (u32), flags (u32), data offset (u64), data size (u64),
+             mtime (f64)
+
+NUL never appears in a path, so sorting keys as bytes sorts entries by parent,
+then name. The children of a directory are therefore contiguous in the index,
+and both lookups and listings are binary searches over fixed-size records.
+"""
+
+import asyncio
+import mmap
+import struct
+import time
+from os import PathLike
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Optional
+
+from . import DirEntry, FileSystem, PrismPath, _decode_head
+
+MAGIC = b"PRISMPK1"
+
+_HEADER = struct.Struct("<8sQQ")
+_RECORD = struct.Struct("<QIIQQd")
+
+_DIRECTORY = 1
+_TEXT = 2
+
+
+def _key(path: PrismPath) -> bytes:
+    """The index key of a path: its parent, NUL, then its name."""
+    parts = PrismPath(path).parts
+    return "/".join(parts[:-1]).encode("utf-8") + b"\0" + parts[-1].encode("utf-8")
+
+
+def _parent_key(directory: PrismPath) -> bytes:
+    """The key prefix shared by all children of a directory."""
+    return "/".join(PrismPath(directory).parts).encode("utf-8") + b"\0"
+
+
+def _write_index(
+    f: BinaryIO, records: list[tuple[bytes, int, int, int, float]], offset: int
+) -> None:
+    """Write the keys and index of a pack after its data, then its header."""
+    records.sort()
+    key_offsets = []
+    for key, *_ in records:
+        key_offsets.append(offset)
+        f.write(key)
+        offset += len(key)
+
+    index_offset = offset
+    for key_offset, (key, flags, data_offset, size, mtime) in zip(key_offsets, records):
+        f.write(_RECORD.pack(key_offset, len(key), flags, data_offset, size, mtime))
+
+    f.seek(0)
+    f.write(_HEADER.pack(MAGIC, len(records), index_offset))
+
+
+async def write_pack(
+    source: FileSystem, destination: PathLike | str, root: PrismPath = PrismPath()
+) -> int:
+    """Write every file and directory below root on a drive into a pack file.
+
+    Contents are streamed into the pack as they are read, so only the index is
+    held in memory. Text files stay text and binary files stay binary. The
+    pack file is written in a worker thread, one directory's contents at a
+    time, so the event loop isn't blocked.
+
+    Returns:
+        int: The number of entries (files and directories) written.
+    """
+    root = PrismPath(root)
+    records: list[tuple[bytes, int, int, int, float]] = []
+
+    f = await asyncio.to_thread(open, destination, "wb")
+    try:
+        await asyncio.to_thread(f.write, b"\0" * _HEADER.size)
+        offset = _HEADER.size
+
+        async for directory, dirs, files in source.walk(root, exclude=()):
+            target = PrismPath(directory.relative_to(root))
+            for name in dirs:
+                mtime = (await source.stat(directory / name)).mtime
+                records.append((_key(target / name), _DIRECTORY, 0, 0, mtime))
+
+            paths = [directory / entry.name for entry in files]
+            chunks = []
+            for path, entry, content in zip(
+                paths, files, await source.read_many(paths)
+            ):
+                flags = _TEXT
+                if isinstance(content, ValueError):
+                    data = await source.read_binary(path)
+                    flags = 0
+                elif isinstance(content, Exception):
+                    raise content
+                else:
+                    data = content.encode("utf-8")
+                chunks.append(data)
+                key = _key(target / entry.name)
+                records.append((key, flags, offset, len(data), entry.mtime))
+                offset += len(data)
+            await asyncio.to_thread(f.writelines, chunks)
+
+        await asyncio.to_thread(_write_index, f, records, offset)
+    finally:
+        await asyncio.to_thread(f.close)
+
+    return len(records)
+
+
+class PackDrive(FileSystem):
+    """A read-only FileSystem backed by a pack file written by write_pack.
+
+    The pack is mapped into memory, and only its header is read on open, so
+    opening costs the same whatever the pack's size. Looking up a path or
+    listing a directory is a binary search over the index. Nothing is read into
+    memory until it is asked for, and read_view returns file contents as a
+    slice of the mapping without copying them.
+
+    Every method that would modify the drive raises PermissionError.
+    """
+
+    def __init__(self, pack: PathLike | str):
+        self.pack = Path(pack)
+        self.root = Path("/")  # Base path for native path operations
+        with open(self.pack, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, self._count, self._index = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{pack} is not a prism pack")
+        self._opened = time.time()
+
+    def close(self) -> None:
+        """Unmap the pack file."""
+        self._view.release()
+        self._map.close()
+
+    # Index helpers.
+
+    def _record(self, i: int) -> tuple[int, int, int, int, int, float]:
+        return _RECORD.unpack_from(self._map, self._index + i * _RECORD.size)
+
+    def _record_key(self, i: int) -> bytes:
+        key_offset, key_length = _RECORD.unpack_from(
+            self._map, self._index + i * _RECORD.size
+        )[:2]
+        return self._map[key_offset : key_offset + key_length]
+
+    def _bisect(self, key: bytes) -> int:
+        """Find the first record whose key is not less than key."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, path: PrismPath) -> Optional[tuple]:
+        """Find the record of a path, or None if it isn't in the pack."""
+        key = _key(path)
+        i = self._bisect(key)
+        if i < self._count and self._record_key(i) == key:
+            return self._record(i)
+        return None
+
+    def _is_root(self, path: PrismPath) -> bool:
+        return not PrismPath(path).parts
+
+    def _file(self, path: PrismPath) -> tuple:
+        record = None if self._is_root(path) else self._find(path)
+        if record is None:
+            raise FileNotFoundError(f"Path {path} does not exist")
+        if record[2] & _DIRECTORY:
+            raise IsADirectoryError(f"Path {path} is a directory")
+        return record
+
+    def _read_only(self) -> PermissionError:
+        return PermissionError(f"Pack {self.pack} is read-only")
+
+    # FileSystem interface implementation.
+
+    async def full_native_path(self, path: PrismPath) -> str:
+        """Convert a PrismPath to a full native path."""
+        return str(self.root / str(path))
+
+    async def prism_path(self, native_path: PathLike) -> PrismPath:
+        """Convert a native path to a PrismPath."""
+        path = Path(native_path)
+        if not path.is_absolute():
+            path = self.root / path
+        return PrismPath(path.relative_to(self.root))
+
+    async def is_root(self, path: PrismPath) -> bool:
+        """Check if a path represents the root directory."""
+        return str(path) in ("", ".")
+
+    async def exists(self, path: PrismPath) -> bool:
+        """Check if a path exists in the pack."""
+        return self._is_root(path) or self._find(path) is not None
+
+    async def is_directory(self, path: PrismPath) -> bool:
+        """Check if a path is a directory."""
+        if self._is_root(path):
+            return True
+        record = self._find(path)
+        return record is not None and bool(record[2] & _DIRECTORY)
+
+    async def is_file(self, path: PrismPath) -> bool:
+        """Check if a path is a file."""
+        if self._is_root(path):
+            return False
+        record = self._find(path)
+        return record is not None and not record[2] & _DIRECTORY
+
+    def read_view(self, path: PrismPath) -> memoryview:
+        """Get a file's raw content as a slice of the pack, without copying it.
+
+        Release the view (or drop every reference to it) before closing the
+        drive, which raises BufferError while views are still alive.
+        """
+        _, _, _, offset, size, _ = self._file(path)
+        return self._view[offset : offset + size]
+
+    async def read(self, path: PrismPath) -> str:
+        """Read text content from a file."""
+        if not self._file(path)[2] & _TEXT:
+            raise ValueError(f"Path {path} contains binary data")
+        return str(self.read_view(path), "utf-8")
+
+    async def read_head(self, path: PrismPath, max_bytes: int) -> str:
+        """Read the start of a text file, touching only that part of the pack."""
+        _, _, flags, offset, size, _ = self._file(path)
+        if not flags & _TEXT:
+            raise ValueError(f"Path {path} contains binary data")
+        return _decode_head(self._map[offset : offset + min(size, max_bytes)])
+
+    async def read_binary(self, path: PrismPath) -> bytes:
+        """Read binary content from a file."""
+        if self._file(path)[2] & _TEXT:
+            raise ValueError(f"Path {path} contains text data")
+        return bytes(self.read_view(path))
+
+    async def write(self, path: PrismPath, content: str) -> None:
+        raise self._read_only()
+
+    async def write_binary(self, path: PrismPath, content: bytes) -> None:
+        raise self._read_only()
+
+    async def stat(self, path: PrismPath) -> DirEntry:
+        """Get the kind, size and modification time of a path."""
+        if self._is_root(path):
+            return DirEntry(name="", is_directory=True, size=0, mtime=self._opened)
+        record = self._find(path)
+        if record is None:
+            raise FileNotFoundError(f"Path {path} does not exist")
+        _, _, flags, _, size, mtime = record
+        return DirEntry(
+            name=PrismPath(path).name,
+            is_directory=bool(flags & _DIRECTORY),
+            size=size,
+            mtime=mtime,
+        )
+
+    async def list_entries(self, directory: PrismPath) -> list[DirEntry]:
+        """List a directory with a binary search for its first child."""
+        if not await self.is_directory(directory):
+            if await self.exists(directory):
+                raise NotADirectoryError(f"Path {directory} is not a directory")
+            raise FileNotFoundError(f"Directory {directory} does not exist")
+
+        prefix = _parent_key(directory)
+        entries = []
+        i = self._bisect(prefix)
+        while i < self._count:
+            key = self._record_key(i)
+            if not key.startswith(prefix):
+                break
+            _, _, flags, _, size, mtime = self._record(i)
+            entries.append(
+                DirEntry(
+                    name=key[len(prefix) :].decode("utf-8"),
+                    is_directory=bool(flags & _DIRECTORY),
+                    size=size,
+                    mtime=mtime,
+                )
+            )
+            i += 1
+        return entries
+
+    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        """List all files in a directory."""
+        for entry in await self.list_entries(directory):
+            if entry.is_file:
+                yield PrismPath(directory) / entry.name
+
+    async def list_directories(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        """List all directories in a directory."""
+        for entry in await self.list_entries(directory):
+            if entry.is_directory:
+                yield PrismPath(directory) / entry.name
+
+    async def create_directory(self, directory: PrismPath) -> None:
+        raise self._read_only()
+
+    async def remove(self, path: PrismPath) -> None:
+        raise self._read_only()
+
+    async def move(self, source: PrismPath, destination: PrismPath) -> None:
+        raise self._read_only()
+
+    async def copy(self, source: PrismPath, destination: PrismPath) -> None:
+        raise self._read_only()
+
+    async def get_size(self, path: PrismPath) -> int:
+        """Get the size of a file in bytes."""
+        return (await self.stat(path)).size
+
+    async def get_creation_time(self, path: PrismPath) -> float:
+        """Get the creation time of a file, the same as its modification time."""
+        return (await self.stat(path)).mtime
+
+    async def get_modification_time(self, path: PrismPath) -> float:
+        """Get the modification time of a file or directory."""
+        return (await self.stat(path)).mtime
+
+    async def set_modification_time(self, path: PrismPath, time: float) -> None:
+        raise self._read_only()
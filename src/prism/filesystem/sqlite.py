@@ -0,0 +1,649 @@
+import sqlite3
+import time
+from os import PathLike
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Literal,
+    Optional,
+    Sequence,
+    TypeVar,
+    overload,
+)
+
+from . import DirEntry, FileSystem, PrismPath, WalkItem, _decode_head
+from .executor import IOExecutor
+
+T = TypeVar("T")
+
+# Number of directories walk() lists per query.
+WALK_BATCH_SIZE = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    name TEXT NOT NULL,
+    is_directory INTEGER NOT NULL,
+    is_text INTEGER NOT NULL DEFAULT 0,
+    content BLOB,
+    size INTEGER NOT NULL DEFAULT 0,
+    ctime REAL NOT NULL,
+    mtime REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_by_parent ON entries (parent, name);
+"""
+
+# Matches a path and everything below it. Bound to (path, path + "/", path + "0"):
+# "0" is the character after "/", so the range covers exactly the descendants.
+_SUBTREE = "(path = ? OR (path > ? AND path < ?))"
+
+
+def _key(path: PrismPath) -> str:
+    """The database key of a path: its parts joined by "/", "" for the root."""
+    return "/".join(PrismPath(path).parts)
+
+
+def _parent_key(key: str) -> str:
+    return key.rpartition("/")[0]
+
+
+def _subtree(key: str) -> tuple[str, str, str]:
+    return key, key + "/", key + "0"
+
+
+class SQLiteDrive(FileSystem):
+    """A FileSystem stored in a single SQLite database.
+
+    Every file and directory is a row keyed by its path and indexed by its
+    parent, so looking up a path is one index probe and listing a directory one
+    range scan, however many entries the drive holds. Text and binary content
+    are stored as BLOBs along with their kind, size and times. The database
+    runs in WAL mode, so readers don't block the writer.
+
+    Each operation runs in one transaction, including recursive moves, copies
+    and removals, which rewrite a whole subtree with a few statements.
+
+    SQLite connections can't be shared between threads, so all queries run on
+    the drive's own single-threaded IOExecutor.
+    """
+
+    def __init__(self, database: PathLike | str):
+        self.database = Path(database)
+        self.root = Path("/")  # Base path for native path operations
+        self.io = IOExecutor(max_workers=1)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.database, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            now = time.time()
+            connection.execute(
+                "INSERT OR IGNORE INTO entries (path, parent, name, is_directory, "
+                "ctime, mtime) VALUES ('', NULL, '', 1, ?, ?)",
+                (now, now),
+            )
+            self._connection = connection
+        return self._connection
+
+    def _read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(connection, *args) outside a transaction (worker thread)."""
+        return fn(self._connect(), *args)
+
+    def _transaction(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(connection, *args) in one write transaction (worker thread)."""
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(connection, *args)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return result
+
+    async def _query(self, fn: Callable[..., T], *args: Any) -> T:
+        return await self.io.run(self._read, fn, *args)
+
+    async def _modify(self, fn: Callable[..., T], *args: Any) -> T:
+        return await self.io.run(self._transaction, fn, *args)
+
+    def close(self) -> None:
+        """Close the database and stop the drive's worker thread."""
+        self.io.shutdown()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    # Row helpers (worker thread).
+
+    @staticmethod
+    def _row(connection: sqlite3.Connection, key: str) -> Optional[tuple]:
+        return connection.execute(
+            "SELECT is_directory, is_text, content, size, ctime, mtime "
+            "FROM entries WHERE path = ?",
+            (key,),
+        ).fetchone()
+
+    @staticmethod
+    def _touch(connection: sqlite3.Connection, key: str, now: float) -> None:
+        connection.execute("UPDATE entries SET mtime = ? WHERE path = ?", (now, key))
+
+    def _insert_directory(
+        self, connection: sqlite3.Connection, key: str, now: float
+    ) -> None:
+        connection.execute(
+            "INSERT INTO entries (path, parent, name, is_directory, ctime, mtime) "
+            "VALUES (?, ?, ?, 1, ?, ?)",
+            (key, _parent_key(key), key.rpartition("/")[2], now, now),
+        )
+        self._touch(connection, _parent_key(key), now)
+
+    def _make_parents(
+        self, connection: sqlite3.Connection, key: str, now: float
+    ) -> None:
+        """Create the missing parent directories of a path.
+
+        Raises:
+            NotADirectoryError: If a parent path exists but is a file.
+        """
+        parts = key.split("/")
+        parent = ""
+        for part in parts[:-1]:
+            current = f"{parent}/{part}" if parent else part
+            row = connection.execute(
+                "SELECT is_directory FROM entries WHERE path = ?", (current,)
+            ).fetchone()
+            if row is None:
+                self._insert_directory(connection, current, now)
+            elif not row[0]:
+                raise NotADirectoryError(
+                    f"Path {current} exists but is not a directory"
+                )
+            parent = current
+
+    def _write_row(
+        self, connection: sqlite3.Connection, path: PrismPath, content: str | bytes
+    ) -> None:
+        key = _key(path)
+        if not key:
+            raise IsADirectoryError(f"Path {path} is a directory")
+        now = time.time()
+        self._make_parents(connection, key, now)
+        existing = connection.execute(
+            "SELECT is_directory, ctime FROM entries WHERE path = ?", (key,)
+        ).fetchone()
+        if existing is not None and existing[0]:
+            raise IsADirectoryError(f"Path {path} is a directory")
+
+        if isinstance(content, str):
+            is_text, data = True, content.encode("utf-8")
+        else:
+            is_text, data = False, content
+        connection.execute(
+            "INSERT OR REPLACE INTO entries (path, parent, name, is_directory, "
+            "is_text, content, size, ctime, mtime) VALUES (?, ?, ?, 0, ?, ?, ?, ?, ?)",
+            (
+                key,
+                _parent_key(key),
+                key.rpartition("/")[2],
+                is_text,
+                data,
+                len(data),
+                existing[1] if existing else now,
+                now,
+            ),
+        )
+        if existing is None:
+            self._touch(connection, _parent_key(key), now)
+
+    @overload
+    def _read_row(
+        self, connection: sqlite3.Connection, path: PrismPath, as_text: Literal[True]
+    ) -> str: ...
+
+    @overload
+    def _read_row(
+        self, connection: sqlite3.Connection, path: PrismPath, as_text: Literal[False]
+    ) -> bytes: ...
+
+    def _read_row(
+        self, connection: sqlite3.Connection, path: PrismPath, as_text: bool
+    ) -> str | bytes:
+        row = self._row(connection, _key(path))
+        if row is None:
+            raise FileNotFoundError(f"Path {path} does not exist")
+        is_directory, is_text, content = row[:3]
+        if is_directory:
+            raise IsADirectoryError(f"Path {path} is a directory")
+        if as_text and not is_text:
+            raise ValueError(f"Path {path} contains binary data")
+        if not as_text and is_text:
+            raise ValueError(f"Path {path} contains text data")
+        return content.decode("utf-8") if as_text else bytes(content)
+
+    def _read_head_row(
+        self, connection: sqlite3.Connection, path: PrismPath, max_bytes: int
+    ) -> str:
+        row = connection.execute(
+            "SELECT is_directory, is_text, substr(content, 1, ?) "
+            "FROM entries WHERE path = ?",
+            (max_bytes, _key(path)),
+        ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Path {path} does not exist")
+        is_directory, is_text, head = row
+        if is_directory:
+            raise IsADirectoryError(f"Path {path} is a directory")
+        if not is_text:
+            raise ValueError(f"Path {path} contains binary data")
+        return _decode_head(head)
+
+    @staticmethod
+    def _dir_entry(name: str, is_directory: int, size: int, mtime: float) -> DirEntry:
+        return DirEntry(
+            name=name, is_directory=bool(is_directory), size=size, mtime=mtime
+        )
+
+    def _stat_row(self, connection: sqlite3.Connection, path: PrismPath) -> DirEntry:
+        row = self._row(connection, _key(path))
+        if row is None:
+            raise FileNotFoundError(f"Path {path} does not exist")
+        return self._dir_entry(PrismPath(path).name, row[0], row[3], row[5])
+
+    @staticmethod
+    def _many(fn: Callable[..., T], items: Sequence) -> list[T | Exception]:
+        results: list[T | Exception] = []
+        for item in items:
+            try:
+                results.append(fn(*item))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _list_rows(self, connection: sqlite3.Connection, directory: PrismPath) -> list:
+        key = _key(directory)
+        row = self._row(connection, key)
+        if row is None:
+            raise FileNotFoundError(f"Directory {directory} does not exist")
+        if not row[0]:
+            raise NotADirectoryError(f"Path {directory} is not a directory")
+        return connection.execute(
+            "SELECT name, is_directory, size, mtime FROM entries WHERE parent = ?",
+            (key,),
+        ).fetchall()
+
+    def _relocate(
+        self,
+        connection: sqlite3.Connection,
+        source: PrismPath,
+        destination: PrismPath,
+        keep_source: bool,
+    ) -> None:
+        """Move or copy the subtree at source to destination in SQL."""
+        source_key = _key(source)
+        destination_key = _key(destination)
+        if self._row(connection, source_key) is None:
+            raise FileNotFoundError(f"Source path {source} does not exist")
+        if source_key == destination_key:
+            return
+        if not source_key or not destination_key:
+            raise ValueError("Cannot copy or move the root directory")
+        if destination_key.startswith(source_key + "/"):
+            raise ValueError(f"Cannot copy or move {source} into itself")
+
+        now = time.time()
+        offset = len(source_key) + 1
+        connection.execute("DROP TABLE IF EXISTS temp.staged")
+        connection.execute(
+            "CREATE TEMP TABLE staged AS SELECT "
+            "? || substr(path, ?) AS path, "
+            "CASE WHEN path = ? THEN ? ELSE ? || substr(parent, ?) END AS parent, "
+            "CASE WHEN path = ? THEN ? ELSE name END AS name, "
+            "is_directory, is_text, content, size, ctime, mtime "
+            f"FROM entries WHERE {_SUBTREE}",
+            (
+                destination_key,
+                offset,
+                source_key,
+                _parent_key(destination_key),
+                destination_key,
+                offset,
+                source_key,
+                destination_key.rpartition("/")[2],
+                *_subtree(source_key),
+            ),
+        )
+        if not keep_source:
+            connection.execute(
+                f"DELETE FROM entries WHERE {_SUBTREE}", _subtree(source_key)
+            )
+            self._touch(connection, _parent_key(source_key), now)
+        self._make_parents(connection, destination_key, now)
+        connection.execute(
+            f"DELETE FROM entries WHERE {_SUBTREE}", _subtree(destination_key)
+        )
+        connection.execute("INSERT INTO entries SELECT * FROM staged")
+        connection.execute("DROP TABLE temp.staged")
+        self._touch(connection, _parent_key(destination_key), now)
+
+    # FileSystem interface implementation.
+
+    async def full_native_path(self, path: PrismPath) -> str:
+        """Convert a PrismPath to a full native path."""
+        return str(self.root / str(path))
+
+    async def prism_path(self, native_path: PathLike) -> PrismPath:
+        """Convert a native path to a PrismPath."""
+        path = Path(native_path)
+        if not path.is_absolute():
+            path = self.root / path
+        return PrismPath(path.relative_to(self.root))
+
+    async def is_root(self, path: PrismPath) -> bool:
+        """Check if a path represents the root directory."""
+        return str(path) in ("", ".")
+
+    async def exists(self, path: PrismPath) -> bool:
+        """Check if a path exists in the filesystem."""
+        return await self._query(self._row, _key(path)) is not None
+
+    async def is_directory(self, path: PrismPath) -> bool:
+        """Check if a path is a directory."""
+        row = await self._query(self._row, _key(path))
+        return row is not None and bool(row[0])
+
+    async def is_file(self, path: PrismPath) -> bool:
+        """Check if a path is a file."""
+        row = await self._query(self._row, _key(path))
+        return row is not None and not row[0]
+
+    async def read(self, path: PrismPath) -> str:
+        """Read text content from a file."""
+        return await self._query(self._read_row, path, True)
+
+    async def read_binary(self, path: PrismPath) -> bytes:
+        """Read binary content from a file."""
+        return await self._query(self._read_row, path, False)
+
+    async def read_many(self, paths: Sequence[PrismPath]) -> list[str | Exception]:
+        """Read the text content of several files in one query batch."""
+
+        def read_all(connection):
+            return self._many(
+                lambda path: self._read_row(connection, path, True),
+                [(path,) for path in paths],
+            )
+
+        return await self._query(read_all)
+
+    async def read_head(self, path: PrismPath, max_bytes: int) -> str:
+        """Read the start of a text file, without loading the rest of it."""
+        return await self._query(self._read_head_row, path, max_bytes)
+
+    async def read_head_many(
+        self, paths: Sequence[PrismPath], max_bytes: int
+    ) -> list[str | Exception]:
+        """Read the start of several text files in one query batch."""
+
+        def read_all(connection):
+            return self._many(
+                lambda path: self._read_head_row(connection, path, max_bytes),
+                [(path,) for path in paths],
+            )
+
+        return await self._query(read_all)
+
+    async def write(self, path: PrismPath, content: str) -> None:
+        """Write text content to a file."""
+        await self._modify(self._write_row, path, content)
+
+    async def write_binary(self, path: PrismPath, content: bytes) -> None:
+        """Write binary content to a file."""
+        await self._modify(self._write_row, path, content)
+
+    async def write_many(
+        self, items: Sequence[tuple[PrismPath, str]]
+    ) -> list[Exception | None]:
+        """Write text content to several files in one transaction."""
+
+        def write_all(connection):
+            return self._many(
+                lambda path, content: self._write_row(connection, path, content),
+                items,
+            )
+
+        return await self._modify(write_all)
+
+    async def write_atomic(
+        self, items: Sequence[tuple[PrismPath, str | bytes]]
+    ) -> None:
+        """Write several files in one transaction, all or nothing."""
+
+        def write_all(connection):
+            for path, content in items:
+                self._write_row(connection, path, content)
+
+        await self._modify(write_all)
+
+    async def stat(self, path: PrismPath) -> DirEntry:
+        """Get the kind, size and modification time of a path."""
+        return await self._query(self._stat_row, path)
+
+    async def stat_many(self, paths: Sequence[PrismPath]) -> list[DirEntry | Exception]:
+        """Stat several paths in one query batch."""
+
+        def stat_all(connection):
+            return self._many(
+                lambda path: self._stat_row(connection, path),
+                [(path,) for path in paths],
+            )
+
+        return await self._query(stat_all)
+
+    async def list_entries(self, directory: PrismPath) -> list[DirEntry]:
+        """List all files and directories in a directory."""
+        rows = await self._query(self._list_rows, directory)
+        return [self._dir_entry(*row) for row in rows]
+
+    async def list_files(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        """List all files in a directory."""
+        for entry in await self.list_entries(directory):
+            if entry.is_file:
+                yield PrismPath(directory) / entry.name
+
+    async def list_directories(self, directory: PrismPath) -> AsyncIterator[PrismPath]:
+        """List all directories in a directory."""
+        for entry in await self.list_entries(directory):
+            if entry.is_directory:
+                yield PrismPath(directory) / entry.name
+
+    async def _walk(
+        self, root: PrismPath, exclude: frozenset[str]
+    ) -> AsyncIterator[WalkItem]:
+        """List directories breadth-first, up to WALK_BATCH_SIZE per query."""
+
+        def list_children(connection, keys):
+            placeholders = ", ".join("?" * len(keys))
+            return connection.execute(
+                "SELECT parent, name, is_directory, size, mtime FROM entries "
+                f"WHERE parent IN ({placeholders})",
+                keys,
+            ).fetchall()
+
+        await self.list_entries(root)  # Raises if root isn't a directory.
+        pending = [root]
+        while pending:
+            batch = pending[:WALK_BATCH_SIZE]
+            del pending[:WALK_BATCH_SIZE]
+            children: dict[str, list[DirEntry]] = {_key(d): [] for d in batch}
+            for parent, *row in await self._query(list_children, list(children.keys())):
+                children[parent].append(self._dir_entry(*row))
+            for directory in batch:
+                entries = children[_key(directory)]
+                dirs = [
+                    e.name for e in entries if e.is_directory and e.name not in exclude
+                ]
+                yield directory, dirs, [e for e in entries if e.is_file]
+                pending.extend(directory / name for name in dirs)
+
+    async def create_directory(self, directory: PrismPath) -> None:
+        """Create a new directory."""
+
+        def create(connection):
+            key = _key(directory)
+            if self._row(connection, key) is not None:
+                raise FileExistsError(f"Path {directory} already exists")
+            now = time.time()
+            self._make_parents(connection, key, now)
+            self._insert_directory(connection, key, now)
+
+        await self._modify(create)
+
+    async def remove(self, path: PrismPath) -> None:
+        """Remove a file or directory and everything below it."""
+
+        def remove(connection):
+            key = _key(path)
+            if self._row(connection, key) is None:
+                raise FileNotFoundError(f"Path {path} does not exist")
+            if not key:
+                raise ValueError("Cannot remove the root directory")
+            connection.execute(f"DELETE FROM entries WHERE {_SUBTREE}", _subtree(key))
+            self._touch(connection, _parent_key(key), time.time())
+
+        await self._modify(remove)
+
+    async def move(self, source: PrismPath, destination: PrismPath) -> None:
+        """Move a file or directory to a new location in one transaction."""
+        await self._modify(self._relocate, source, destination, False)
+
+    async def copy(self, source: PrismPath, destination: PrismPath) -> None:
+        """Copy a file or directory to a new location in one transaction."""
+        await self._modify(self._relocate, source, destination, True)
+
+    async def _entry_row(self, path: PrismPath) -> tuple:
+        row = await self._query(self._row, _key(path))
+        if row is None:
+            raise FileNotFoundError(f"Path {path} does not exist")
+        return row
+
+    async def get_size(self, path: PrismPath) -> int:
+        """Get the size of a file in bytes."""
+        return (await self._entry_row(path))[3]
+
+    async def get_creation_time(self, path: PrismPath) -> float:
+        """Get the creation time of a file or directory."""
+        return (await self._entry_row(path))[4]
+
+    async def get_modification_time(self, path: PrismPath) -> float:
+        """Get the modification time of a file or directory."""
+        return (await self._entry_row(path))[5]
+
+    async def set_modification_time(self, path: PrismPath, time: float) -> None:
+        """Set the modification time of a file or directory."""
+
+        def set_mtime(connection):
+            key = _key(path)
+            if self._row(connection, key) is None:
+                raise FileNotFoundError(f"Path {path} does not exist")
+            self._touch(connection, key, time)
+
+        await self._modify(set_mtime)
+
+    # Import and export.
+
+    def _store_files(
+        self,
+        connection: sqlite3.Connection,
+        directory: PrismPath,
+        files: Sequence[DirEntry],
+        contents: Sequence[str | bytes],
+    ) -> None:
+        """Write imported files into a directory, keeping their mtimes."""
+        key = _key(directory)
+        if key and self._row(connection, key) is None:
+            now = time.time()
+            self._make_parents(connection, key, now)
+            self._insert_directory(connection, key, now)
+        for entry, content in zip(files, contents):
+            path = directory / entry.name
+            self._write_row(connection, path, content)
+            self._touch(connection, _key(path), entry.mtime)
+
+    def _export_rows(
+        self,
+        connection: sqlite3.Connection,
+        directory: PrismPath,
+        target: PrismPath,
+        files: Sequence[DirEntry],
+    ) -> list[tuple[PrismPath, int, bytes]]:
+        """Get the (path under target, is_text, content) of a directory's files."""
+        return [
+            (target / f.name, row[1], row[2])
+            for f in files
+            if (row := self._row(connection, _key(directory / f.name)))
+        ]
+
+    async def import_tree(
+        self, source: FileSystem, root: PrismPath = PrismPath()
+    ) -> int:
+        """Copy every file below root on another drive into this one.
+
+        Files keep their relative paths and modification times. Existing files
+        at the same paths are replaced. The metadata directory is included.
+
+        Returns:
+            int: The number of files imported.
+        """
+        root = PrismPath(root)
+        count = 0
+        async for directory, _, files in source.walk(root, exclude=()):
+            paths = [directory / f.name for f in files]
+            contents: list[str | bytes] = []
+            for path, content in zip(paths, await source.read_many(paths)):
+                if isinstance(content, ValueError):
+                    contents.append(await source.read_binary(path))
+                elif isinstance(content, Exception):
+                    raise content
+                else:
+                    contents.append(content)
+            target = PrismPath(directory.relative_to(root))
+            await self._modify(self._store_files, target, files, contents)
+            count += len(files)
+        return count
+
+    async def export_tree(
+        self, destination: FileSystem, root: PrismPath = PrismPath()
+    ) -> int:
+        """Copy every file below root into another drive, such as a Disk.
+
+        Returns:
+            int: The number of files exported.
+        """
+        root = PrismPath(root)
+        count = 0
+        async for directory, _, files in self.walk(root, exclude=()):
+            target = PrismPath(directory.relative_to(root))
+            if not files and not await destination.exists(target):
+                await destination.create_directory(target)
+
+            texts = []
+            rows = await self._query(self._export_rows, directory, target, files)
+            for path, is_text, content in rows:
+                if is_text:
+                    texts.append((path, content.decode("utf-8")))
+                else:
+                    await destination.write_binary(path, bytes(content))
+            for error in await destination.write_many(texts):
+                if error is not None:
+                    raise error
+            count += len(files)
+        return count
@@ -1,11 +1,16 @@
 # src/prism/core/folder.py
 
+import asyncio
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, AsyncGenerator, Iterator, Optional
 
 from .exceptions import PrismError
-from .filesystem import FileSystem
+from .filesystem import DirEntry, FileSystem
+from .manifest import Manifest
 from .page import Page
+from .refresh import RefreshSession, RefreshStats
+from .titles import TitleIndex
 from .types import METADATA_ROOT_DIR_NAME, PrismPath
 
 if TYPE_CHECKING:
@@ -52,35 +57,207 @@ class Folder:
             return None
         return Page(self.prism.drive, self.path / "README.md")
 
-    async def refresh(self, recursive: bool = False):
-        """Refresh all pages in this folder"""
-        # Validate folder structure
-        await self._validate_structure()
-
-        # Handle README first if it exists.
-        readme = await self.readme
-        if readme:
-            await self.prism.refresh_page(readme.path)
-
-        # Refresh all other markdown files
-        async for md_file in self.list_pages():
-            if md_file.name != "README.md":
-                await self.prism.refresh_page(md_file)
-
-        # Recursively handle subfolders if requested
-        if recursive:
-            async for subfolder in self.list_subfolders():
-                if self.path == PrismPath(METADATA_ROOT_DIR_NAME):
-                    continue
-                await self.prism.get_folder(subfolder).refresh(recursive=True)
-
-    async def _validate_structure(self):
-        """Validate folder structure"""
+    async def refresh(
+        self, recursive: bool = False, jobs: int = 1, incremental: bool = False
+    ) -> RefreshStats:
+        """Refresh all pages in this folder, and in its subfolders if recursive.
+
+        Up to jobs pages are regenerated at a time. A folder's README is always
+        regenerated before the folder's other pages and its subfolders' pages.
+
+        If incremental, pages that haven't changed since the manifest recorded
+        them, and whose generators' inputs haven't either, are skipped. Every
+        refresh records the pages it regenerated in the manifest.
+        """
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1")
+
+        start = time.perf_counter()
+        session = RefreshSession(self.prism.drive)
+        slots = asyncio.Semaphore(jobs)
+        if not recursive:
+            files = [
+                entry
+                for entry in await self.prism.drive.list_entries(self.path)
+                if not entry.is_directory and entry.name.endswith(".md")
+            ]
+            self._check_readme(files)
+            stats = await self._refresh_pages(
+                files, session, slots, incremental=incremental
+            )
+        else:
+            stats = await self._refresh_tree(session, slots, jobs, incremental)
+
+        await session.save()
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    async def _refresh_tree(
+        self,
+        session: RefreshSession,
+        slots: asyncio.Semaphore,
+        jobs: int,
+        incremental: bool = False,
+    ) -> RefreshStats:
+        """Refresh this folder and all its subfolders, up to jobs at a time.
+
+        The tree is walked once, each folder before its subfolders. A folder
+        starts as soon as its parent's README has been regenerated.
+        """
+        stats = RefreshStats()
+        readme_done: dict[PrismPath, asyncio.Event] = {}
+        folders = asyncio.Semaphore(jobs)
+
+        async def refresh_folder(directory: PrismPath, files: list[DirEntry]) -> None:
+            try:
+                if directory != self.path:
+                    await readme_done[directory.parent].wait()
+                folder = self.prism.get_folder(directory)
+                folder._check_readme(files)
+                stats.merge(
+                    await folder._refresh_pages(
+                        files, session, slots, readme_done[directory], incremental
+                    )
+                )
+            finally:
+                readme_done[directory].set()
+                folders.release()
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                async for directory, dirs, files in self.prism.drive.walk(self.path):
+                    session.listed(directory, dirs, files)
+                    pages = [f for f in files if f.name.endswith(".md")]
+                    readme_done[directory] = asyncio.Event()
+                    await folders.acquire()
+                    group.create_task(refresh_folder(directory, pages))
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+        return stats
+
+    async def _refresh_pages(
+        self,
+        files: list[DirEntry],
+        session: RefreshSession,
+        slots: asyncio.Semaphore,
+        readme_done: asyncio.Event | None = None,
+        incremental: bool = False,
+    ) -> RefreshStats:
+        """Refresh the listed pages of this folder, README first.
+
+        Pages are regenerated while holding one of the slots, and readme_done
+        is set once the README has been. If incremental, unchanged pages are
+        skipped (see refresh).
+        """
+        stats = RefreshStats()
+        readme = [f for f in files if f.name == "README.md"]
+        files = readme + [f for f in files if f.name != "README.md"]
+
+        # Read the folder's pages in one batch and write the changed ones in
+        # another, all or nothing. Refreshing never changes a page's title,
+        # which is all other pages read from it, so deferring the writes
+        # doesn't change the result.
+        if incremental:
+            stale, contents = await self._read_changed(files, session)
+            stats.skipped += len(files) - len(stale)
+            paths = [self.path / f.name for f in stale]
+        else:
+            paths = [self.path / f.name for f in files]
+            contents = await self._read_all(paths)
+        pages = [self.prism.get_page(path) for path in paths]
+
+        async def regenerate(page: Page, content: str) -> bool:
+            async with slots:
+                return await page.regenerate(content, session)
+
+        changed = []
+        if paths and paths[0] == self.path / "README.md":
+            changed.append(await regenerate(pages[0], contents[0]))
+        if readme_done is not None:
+            readme_done.set()
+        rest = range(len(changed), len(pages))
+        changed += await asyncio.gather(
+            *(regenerate(pages[i], contents[i]) for i in rest)
+        )
+
+        updates = []
+        titles = []
+        for page, page_changed in zip(pages, changed):
+            if page_changed:
+                updates.append((page.path, await page.content))
+                parsed = page.parsed
+                titles.append((page.path, parsed.title, parsed.title_position))
+            else:
+                stats.record(False)
+
+        await self.prism.drive.write_atomic(updates)
+        session.wrote([path for path, _ in updates])
+        await TitleIndex.for_drive(self.prism.drive).record(titles)
+        await Manifest.for_drive(self.prism.drive).record(
+            self.path,
+            [
+                (page.path.name, await page.content, page.generator_reads)
+                for page in pages
+            ],
+            session,
+        )
+        stats.written += len(updates)
+
+        return stats
+
+    async def _refresh_named(
+        self, names: list[str], session: RefreshSession, slots: asyncio.Semaphore
+    ) -> RefreshStats:
+        """Incrementally refresh some of this folder's pages, by name (see
+        refresh). Pages that don't exist are ignored."""
+        stats = await self.prism.drive.stat_many([self.path / name for name in names])
+        files = [
+            stat
+            for stat in stats
+            if not isinstance(stat, Exception) and not stat.is_directory
+        ]
+        return await self._refresh_pages(files, session, slots, incremental=True)
+
+    def _check_readme(self, files: list[DirEntry]) -> None:
+        """Validate the folder's structure from a listing of its pages."""
         if self.path == PrismPath(METADATA_ROOT_DIR_NAME):
             return
-        if not await self.readme:
+        if not any(f.name == "README.md" for f in files):
             raise FolderError(f"Folder {self.path} is missing README.md")
 
+    async def _read_changed(
+        self, files: list[DirEntry], session: RefreshSession
+    ) -> tuple[list[DirEntry], list[str]]:
+        """Find which of this folder's pages an incremental refresh must
+        regenerate, and read them.
+
+        Pages whose stats, as listed, and inputs are as the manifest recorded
+        them aren't read.
+
+        Returns:
+            tuple: The entries of the pages to regenerate, in order, and their
+            contents.
+        """
+        manifest = Manifest.for_drive(self.prism.drive)
+        unchanged = await manifest.unchanged(self.path, files, session)
+        candidates = [f for f, same in zip(files, unchanged) if not same]
+        contents = await self._read_all([self.path / f.name for f in candidates])
+
+        # A page that was only touched still has the content it was refreshed
+        # with, and needs no regenerating if its inputs are unchanged.
+        touched = await manifest.unchanged(self.path, candidates, session, contents)
+        changed = [i for i, same in enumerate(touched) if not same]
+        return [candidates[i] for i in changed], [contents[i] for i in changed]
+
+    async def _read_all(self, paths: list[PrismPath]) -> list[str]:
+        """Read pages in one batch, raising the first error."""
+        contents = []
+        for content in await self.prism.drive.read_many(paths):
+            if isinstance(content, Exception):
+                raise content
+            contents.append(content)
+        return contents
+
     async def list_pages(self) -> AsyncGenerator[PrismPath, None]:
         """List all markdown files in this folder"""
         async for f in self.prism.drive.list_files(self.path):
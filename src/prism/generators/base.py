@@ -1,13 +1,37 @@
 # src/prism/generators/base.py
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from ..page import Page
 
+# What a generator can read to produce its output.
+# The titles of the READMEs from the page's directory up to the root.
+ANCESTOR_TITLES = "ancestor_titles"
+# The pages of the page's directory and its subdirectories' READMEs, with
+# their titles.
+DIRECTORY_LISTING = "directory_listing"
+# The pages of the page's directory, except the README, with their titles.
+SIBLING_TITLES = "sibling_titles"
+# The headings of the page itself.
+OWN_HEADINGS = "own_headings"
+
 
 class Generator(ABC):
-    """Base class for all generators"""
+    """Base class for all generators
+
+    A page's generators run concurrently. Set concurrent to False for a
+    generator that must run alone: such generators run one at a time, in page
+    order, after the concurrent ones have finished.
+
+    Set reads to what the generator reads besides the page's own title (see
+    the constants above). Incremental refreshes regenerate a page when one of
+    its generators' inputs changes, and always regenerate pages with a
+    generator whose reads is None.
+    """
+
+    concurrent: bool = True
+    reads: Optional[frozenset[str]] = None
 
     @abstractmethod
     async def generate(self, page: "Page") -> str:
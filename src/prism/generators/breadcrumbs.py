@@ -1,8 +1,9 @@
 from logging import getLogger
 from typing import TYPE_CHECKING
 
+from ..refresh import RefreshSession
 from ..types import PrismPath
-from .base import Generator
+from .base import ANCESTOR_TITLES, Generator
 
 logger = getLogger(__name__)
 
@@ -16,42 +17,31 @@ class BreadcrumbsGenerator(Generator):
     Generates a list of breadcrumbs from the current page to the root.
     """
 
-    async def generate(self, page: "Page") -> str:
-        from ..page import Page
+    reads = frozenset({ANCESTOR_TITLES})
 
+    async def generate(self, page: "Page") -> str:
         breadcrumbs: list[tuple[str, PrismPath | None]] = []
 
         # Add current page without link
         if not page.path.name == "README.md":
             breadcrumbs.append((await page.title, None))
 
-        # Build up parent links by traversing up the tree
-        current_dir = page.path.parent
-        relative_path = PrismPath()
-
-        while True:
-            readme_path = current_dir / "README.md"
-
-            if await page.drive.exists(readme_path):
-                readme = Page(page.drive, readme_path)
+        # Link each ancestor README, looked up once per refresh and shared by
+        # every page in the folder, relative to this page.
+        session = page.session or RefreshSession(page.drive)
+        depth = len(page.path.parent.parts)
+        for directory, title in await session.readme_titles(page.path.parent):
+            readme_path = directory / "README.md"
+            if page.path == readme_path:
+                link_path = None
+            elif directory == page.path.parent:
                 # For immediate parent, use ./README.md
-                if page.path == readme_path:
-                    link_path = None
-                elif current_dir == page.path.parent:
-                    link_path = PrismPath("./README.md")
-                else:
-                    # For other ancestors, use the accumulated relative path
-                    link_path = relative_path / "README.md"
-                breadcrumbs.append((await readme.title, link_path))
-
-            if current_dir == PrismPath("."):
-                break
-
-            # Move up one level and add to relative path
-            current_dir = current_dir.parent
-            relative_path = (
-                PrismPath("..") / relative_path if relative_path else PrismPath("..")
-            )
+                link_path = PrismPath("./README.md")
+            else:
+                # For other ancestors, go up one level per directory
+                levels = depth - len(directory.parts)
+                link_path = PrismPath(*[".."] * levels) / "README.md"
+            breadcrumbs.append((title, link_path))
 
         # Reverse to get root -> current order
         breadcrumbs.reverse()
@@ -1,8 +1,9 @@
 from logging import getLogger
 from typing import TYPE_CHECKING
 
+from ..refresh import RefreshSession
 from ..types import PrismPath
-from .base import Generator
+from .base import DIRECTORY_LISTING, Generator
 
 logger = getLogger(__name__)
 
@@ -13,42 +14,30 @@ if TYPE_CHECKING:
 class PagesGenerator(Generator):
     """Lists sibling and subdirectory pages in the current directory"""
 
-    async def generate(self, page: "Page") -> str:
-        from ..page import Page
+    reads = frozenset({DIRECTORY_LISTING})
 
-        pages: list[Page] = []
+    async def generate(self, page: "Page") -> str:
         current_dir = page.path.parent
+        session = page.session or RefreshSession(page.drive)
+        snapshot = await session.snapshot(current_dir)
 
-        # Get sibling markdown files (except README.md)
-        async for file_path in page.drive.list_files(current_dir):
-            if str(file_path).endswith(".md") and not str(file_path).endswith(
-                "README.md"
-            ):
-                if file_path == page.path:
-                    continue
-                sibling = Page(page.drive, file_path)
-                pages.append(sibling)
-
-        # Get subdirectory README files
-        async for folder in page.drive.list_directories(current_dir):
-            readme_path = folder / "README.md"
-            if await page.drive.exists(readme_path):
-                readme = Page(page.drive, readme_path)
-                pages.append(readme)
-
-        if not pages:
-            return "No pages yet."
-
-        # Get titles and create links
+        # Sibling pages (except this one), then subdirectory READMEs
+        found = False
         pages_with_titles = []
-        for subpage in pages:
-            try:
-                title = await subpage.title
-                rel_path = PrismPath(subpage.path.relative_to(current_dir))
-                pages_with_titles.append((title, rel_path))
-            except Exception as e:
-                logger.warning(f"Failed to get title for {subpage.path}: {e}")
+        for path, title in snapshot.pages + snapshot.readmes:
+            if path == page.path:
                 continue
+            if path.name == "README.md" and isinstance(title, FileNotFoundError):
+                continue  # Subdirectory without a README.
+            found = True
+            if isinstance(title, Exception):
+                logger.warning(f"Failed to get title for {path}: {title}")
+                continue
+            rel_path = PrismPath(path.relative_to(current_dir))
+            pages_with_titles.append((title, rel_path))
+
+        if not found:
+            return "No pages yet."
 
         # Sort by title and generate markdown links
         lines = []
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
-from .base import Generator
+from ..refresh import RefreshSession
+from .base import SIBLING_TITLES, Generator
 
 if TYPE_CHECKING:
     from ..page import Page
@@ -15,6 +16,8 @@ logger = getLogger(__name__)
 class SiblingsGenerator(Generator):
     """Generates a list of sibling pages in the current directory"""
 
+    reads = frozenset({SIBLING_TITLES})
+
     async def generate_old(self, page: "Page") -> str:
         """Generate list of sibling pages"""
 
@@ -43,36 +46,22 @@ class SiblingsGenerator(Generator):
         return "\n".join(lines)
 
     async def generate(self, page: "Page") -> str:
-        from ..page import Page
-
-        pages: list[Page] = []
-        current_dir = page.path.parent
-
-        # Get sibling markdown files (except README.md)
-        async for file_path in page.drive.list_files(current_dir):
-            if str(file_path).endswith(".md") and not str(file_path).endswith(
-                "README.md"
-            ):
-                # Create proper paths relative to current directory
-                sibling = Page(page.drive, file_path)
-                pages.append(sibling)
-
-        if not pages:
+        session = page.session or RefreshSession(page.drive)
+        snapshot = await session.snapshot(page.path.parent)
+        if not snapshot.pages:
             return "No pages yet."
 
-        # Get titles and create links
+        # Create links to the other pages
         pages_with_titles = []
-        for subpage in pages:
-            if subpage.path == page.path:
+        for path, title in snapshot.pages:
+            if path == page.path:
                 continue
-            try:
-                title = await subpage.title
-                # Make path relative to current page
-                rel_path = PrismPath(subpage.path.name)
-                pages_with_titles.append((title, rel_path))
-            except Exception as e:
-                logger.warning(f"Failed to get title for {subpage.path}: {e}")
+            if isinstance(title, Exception):
+                logger.warning(f"Failed to get title for {path}: {title}")
                 continue
+            # Make path relative to current page
+            rel_path = PrismPath(path.name)
+            pages_with_titles.append((title, rel_path))
 
         # Sort by title and generate markdown links
         lines = []
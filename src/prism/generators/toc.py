@@ -2,7 +2,7 @@
 import re
 from typing import TYPE_CHECKING
 
-from .base import Generator
+from .base import OWN_HEADINGS, Generator
 
 if TYPE_CHECKING:
     from ..page import Page
@@ -13,15 +13,12 @@ INVALID_ANCHOR_CHARS = re.compile(r"[^a-z0-9\-]")
 class TocGenerator(Generator):
     """Generates a table of contents from page headers"""
 
+    reads = frozenset({OWN_HEADINGS})
+
     async def generate(self, page: "Page") -> str:
         """Generate table of contents"""
         # Find all headers (excluding the title)
-        headers = []
-        for line in page._content.split("\n"):
-            if line.startswith("##"):
-                level = line.count("#")
-                title = line.strip("#").strip()
-                headers.append((level, title))
+        headers = [(header.level, header.title) for header in page.parsed.headers]
 
         if not headers:
             return "<!-- No headers found for TOC -->"
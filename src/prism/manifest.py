@@ -0,0 +1,378 @@
+# src/prism/manifest.py
+import asyncio
+import hashlib
+import json
+from logging import getLogger
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence
+from weakref import WeakKeyDictionary
+
+from .filesystem import DirEntry, FileSystem
+from .generators.base import ANCESTOR_TITLES, DIRECTORY_LISTING, SIBLING_TITLES
+from .types import MANIFEST_NAME, METADATA_ROOT_DIR_NAME, PrismPath
+
+if TYPE_CHECKING:
+    from .refresh import RefreshSession
+
+logger = getLogger(__name__)
+
+# Version of the manifest file format; a manifest of another version is
+# discarded, so the next incremental refresh regenerates every page.
+MANIFEST_VERSION = 2
+
+# The inputs generators read from outside their page (see Generator.reads),
+# each an input of the page's directory. A page's own headings are covered by
+# its content hash.
+INPUT_KINDS = (ANCESTOR_TITLES, DIRECTORY_LISTING, SIBLING_TITLES)
+
+
+def digest(data) -> str:
+    """Hash JSON-serializable data into a short fingerprint."""
+    return hashlib.sha1(json.dumps(data).encode()).hexdigest()[:16]
+
+
+def content_hash(content: str) -> str:
+    """Hash a page's content as recorded in the manifest."""
+    return hashlib.sha1(content.encode()).hexdigest()[:16]
+
+
+def input_key(kind: str, directory: PrismPath) -> str:
+    """The key of an input of a directory (see INPUT_KINDS)."""
+    return f"{kind}:{directory}"
+
+
+def parse_input_key(key: str) -> tuple[str, PrismPath]:
+    """Split an input key into its kind and directory."""
+    kind, _, directory = key.partition(":")
+    return kind, PrismPath(directory)
+
+
+class PageRecord(NamedTuple):
+    """What a page was last refreshed from, stored as a list in the manifest
+    file (a tuple, as there is one per page to load).
+
+    Attributes:
+        mtime: The page's modification time after the refresh
+        size: The page's size after the refresh
+        hash: Hash of the page's content after the refresh
+        inputs: Fingerprint of each input of its directory its generators
+            read, by kind, or None if one of its generators doesn't declare
+            what it reads
+    """
+
+    mtime: float
+    size: int
+    hash: str
+    inputs: Optional[dict[str, str]]
+
+
+class Manifest:
+    """A persistent record of what each page was last refreshed from, kept in
+    .prism, so an incremental refresh can skip pages that wouldn't change.
+
+    For each page, the manifest records its modification time, size and
+    content hash, and a fingerprint of each input its generators read. For
+    each input, it also records a signature of the stats of the files the
+    input was derived from. A page is unchanged if its own stat, or failing
+    that its content hash, matches, and each input's fingerprint does. An
+    input whose signature matches has the fingerprint it was recorded with,
+    so checking an unchanged repository costs listings and stats only.
+
+    Inverting the page records gives the pages that read each input, so the
+    pages an edit can affect are found without walking the repository (see
+    dependents).
+
+    There is one manifest per drive (see for_drive). Changes are kept in memory
+    until save(), and are never saved on a drive without a .prism directory,
+    or when persistent is False.
+    """
+
+    _manifests: "WeakKeyDictionary[FileSystem, Manifest]" = WeakKeyDictionary()
+
+    @classmethod
+    def for_drive(cls, drive: FileSystem) -> "Manifest":
+        """Get the manifest of a drive, creating it on first use."""
+        manifest = cls._manifests.get(drive)
+        if manifest is None:
+            manifest = cls._manifests[drive] = cls(drive)
+        return manifest
+
+    def __init__(self, drive: FileSystem):
+        self.drive = drive
+        self.path = PrismPath(METADATA_ROOT_DIR_NAME) / MANIFEST_NAME
+        # Page records by directory, then by name.
+        self._pages: dict[str, dict[str, PageRecord]] | None = None
+        self._inputs: dict[str, tuple[str, str]] = {}
+        # Reverse dependency graph: the pages that read each input, built
+        # from the page records on first use and kept in step with them.
+        self._dependents: dict[str, set[tuple[str, str]]] | None = None
+        self._dirty = False
+        self._lock = asyncio.Lock()
+        self.persistent = True
+
+    async def _load(self) -> dict[str, dict[str, PageRecord]]:
+        async with self._lock:
+            if self._pages is None:
+                self._pages, self._inputs = await self._read()
+        return self._pages
+
+    async def _read(
+        self,
+    ) -> tuple[dict[str, dict[str, PageRecord]], dict[str, tuple[str, str]]]:
+        try:
+            data = json.loads(await self.drive.read(self.path))
+            if data["version"] != MANIFEST_VERSION:
+                return {}, {}
+            pages = {
+                directory: {
+                    name: PageRecord._make(record) for name, record in records.items()
+                }
+                for directory, records in data["pages"].items()
+            }
+            inputs = {key: tuple(state) for key, state in data["inputs"].items()}
+            return pages, inputs
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}, {}  # Missing or unreadable: every page is refreshed.
+
+    async def recorded_input(self, key: str) -> Optional[tuple[str, str]]:
+        """Get the (signature, fingerprint) an input was last recorded with."""
+        await self._load()
+        return self._inputs.get(key)
+
+    async def unchanged(
+        self,
+        directory: PrismPath,
+        files: Sequence[DirEntry],
+        session: "RefreshSession",
+        contents: Sequence[str] | None = None,
+    ) -> list[bool]:
+        """Check which pages of a directory, and their inputs, are as they
+        were last refreshed.
+
+        Without contents, the stat of each page's entry is compared with the
+        recorded one. With contents, their hashes are compared instead, and
+        pages that match have their entry's stat recorded, so a page that was
+        only touched is checked by stat again next time.
+        """
+        records = (await self._load()).get(str(directory), {})
+        found = [records.get(f.name) for f in files]
+        kinds = {kind for r in found if r and r.inputs for kind in r.inputs}
+        fingerprints = await asyncio.gather(
+            *(session.fingerprint(input_key(kind, directory)) for kind in kinds),
+            return_exceptions=True,  # Regenerating the pages raises the error.
+        )
+        current = dict(zip(kinds, fingerprints))
+
+        results = []
+        for i, (entry, record) in enumerate(zip(files, found)):
+            if record is None or record.inputs is None:
+                results.append(False)
+                continue
+            if contents is None:
+                same = (record.mtime, record.size) == (entry.mtime, entry.size)
+            else:
+                same = record.hash == content_hash(contents[i])
+            same = same and record.inputs.items() <= current.items()
+            if same and contents is not None:
+                records[entry.name] = record._replace(
+                    mtime=entry.mtime, size=entry.size
+                )
+                self._dirty = True
+            results.append(same)
+        return results
+
+    async def _page_inputs(
+        self,
+        directory: PrismPath,
+        reads: Optional[frozenset[str]],
+        session: "RefreshSession",
+    ) -> Optional[dict[str, str]]:
+        if reads is None:
+            return None
+        inputs = {}
+        for kind in INPUT_KINDS:
+            if kind not in reads:
+                continue
+            try:
+                inputs[kind] = await session.fingerprint(input_key(kind, directory))
+            except Exception:
+                return None
+        return inputs
+
+    async def record(
+        self,
+        directory: PrismPath,
+        pages: Sequence[tuple[str, str, Optional[frozenset[str]]]],
+        session: "RefreshSession",
+    ) -> None:
+        """Record the (name, content, generator reads) of pages of a directory
+        that were just refreshed, with the fingerprints of the inputs read in
+        this session."""
+        if not pages:
+            return
+        records = (await self._load()).setdefault(str(directory), {})
+        inputs = await asyncio.gather(
+            *(self._page_inputs(directory, reads, session) for _, _, reads in pages)
+        )
+        stats = await self.drive.stat_many([directory / name for name, _, _ in pages])
+        for (name, content, _), page_inputs, stat in zip(pages, inputs, stats):
+            self._unlink(str(directory), name, records.get(name))
+            if isinstance(stat, Exception):
+                records.pop(name, None)
+            else:
+                records[name] = PageRecord(
+                    stat.mtime, stat.size, content_hash(content), page_inputs
+                )
+                self._link(str(directory), name, records[name])
+        self._dirty = True
+
+    async def _graph(self) -> dict[str, set[tuple[str, str]]]:
+        """Get the (directory, name) of the pages that read each input, by
+        input key, as recorded."""
+        pages = await self._load()
+        if self._dependents is None:
+            self._dependents = {}
+            for directory, records in pages.items():
+                for name, record in records.items():
+                    self._link(directory, name, record)
+        return self._dependents
+
+    def _link(self, directory: str, name: str, record: PageRecord) -> None:
+        if self._dependents is None or not record.inputs:
+            return
+        for kind in record.inputs:
+            key = f"{kind}:{directory}"
+            self._dependents.setdefault(key, set()).add((directory, name))
+
+    def _unlink(self, directory: str, name: str, record: Optional[PageRecord]) -> None:
+        if self._dependents is None or record is None or not record.inputs:
+            return
+        for kind in record.inputs:
+            self._dependents.get(f"{kind}:{directory}", set()).discard(
+                (directory, name)
+            )
+
+    async def dependents(self, path: PrismPath) -> list[PrismPath]:
+        """Find the pages that read an input an edit of a page can change,
+        as of their last refresh.
+
+        A page's title is listed by the pages of its directory, or if it is a
+        README, by the pages of the parent directory, and is in the
+        breadcrumbs of every page below its directory. Pages the manifest has
+        no record of, or whose generators don't declare what they read, aren't
+        found.
+
+        Returns:
+            list: The dependent pages, sorted, without the page itself.
+        """
+        path = PrismPath(path)
+        directory = path.parent
+        graph = await self._graph()
+        if path.name == "README.md":
+            prefix = directory.parts
+            keys = [
+                key
+                for key in graph
+                if key.startswith(f"{ANCESTOR_TITLES}:")
+                and parse_input_key(key)[1].parts[: len(prefix)] == prefix
+            ]
+            if prefix:
+                keys.append(input_key(DIRECTORY_LISTING, directory.parent))
+        else:
+            keys = [
+                input_key(DIRECTORY_LISTING, directory),
+                input_key(SIBLING_TITLES, directory),
+            ]
+        found = set().union(*(graph.get(key, ()) for key in keys))
+        pages = {PrismPath(directory) / name for directory, name in found}
+        pages.discard(path)
+        return sorted(pages)
+
+    async def record_inputs(self, inputs: dict[str, tuple[str, str]]) -> None:
+        """Record the (signature, fingerprint) of inputs read in a refresh."""
+        await self._load()
+        for key, state in inputs.items():
+            if self._inputs.get(key) != state:
+                self._inputs[key] = state
+                self._dirty = True
+
+    async def restat(self, paths: Sequence[PrismPath]) -> None:
+        """Record the current stats of pages that were copied without changing
+        their content, such as pages committed from a staging drive."""
+        pages = await self._load()
+        paths = [PrismPath(path) for path in paths]
+        for path, stat in zip(paths, await self.drive.stat_many(paths)):
+            directory = str(path.parent)
+            record = pages.get(directory, {}).get(path.name)
+            if record is None:
+                continue
+            if isinstance(stat, Exception):
+                self._unlink(directory, path.name, record)
+                del pages[directory][path.name]
+            else:
+                pages[directory][path.name] = record._replace(
+                    mtime=stat.mtime, size=stat.size
+                )
+            self._dirty = True
+
+    async def recorded_inputs(self) -> dict[str, tuple[str, str]]:
+        """Get the (signature, fingerprint) of every recorded input."""
+        await self._load()
+        return dict(self._inputs)
+
+    async def export(self, directory: PrismPath) -> dict[str, dict]:
+        """Get the records of the pages and inputs below a directory, in the
+        manifest file's format, to merge into another manifest of the same
+        repository."""
+        prefix = PrismPath(directory).parts
+
+        def below(path: PrismPath) -> bool:
+            return path.parts[: len(prefix)] == prefix
+
+        pages = await self._load()
+        return {
+            "pages": {d: dict(r) for d, r in pages.items() if below(PrismPath(d))},
+            "inputs": {
+                key: list(state)
+                for key, state in self._inputs.items()
+                if below(parse_input_key(key)[1])
+            },
+        }
+
+    async def merge(self, exported: dict[str, dict]) -> None:
+        """Add exported records to the manifest, replacing those of the same
+        pages and inputs."""
+        pages = await self._load()
+        for directory, records in exported["pages"].items():
+            pages.setdefault(directory, {}).update(
+                (name, PageRecord._make(record)) for name, record in records.items()
+            )
+        for key, state in exported["inputs"].items():
+            self._inputs[key] = tuple(state)
+        self._dependents = None
+        self._dirty = True
+
+    async def save(self) -> None:
+        """Write the manifest to .prism if it changed.
+
+        The manifest only speeds up refreshes, so failing to write it is logged
+        rather than raised.
+        """
+        if not self._dirty or self._pages is None or not self.persistent:
+            return
+        if not await self.drive.is_directory(PrismPath(METADATA_ROOT_DIR_NAME)):
+            return
+
+        data = {
+            "version": MANIFEST_VERSION,
+            "pages": {
+                directory: dict(sorted(records.items()))
+                for directory, records in sorted(self._pages.items())
+            },
+            "inputs": {key: list(state) for key, state in sorted(self._inputs.items())},
+        }
+        try:
+            await self.drive.write(self.path, json.dumps(data, separators=(",", ":")))
+        except OSError as e:
+            logger.warning(f"Failed to save the refresh manifest: {e}")
+            return
+        self._dirty = False
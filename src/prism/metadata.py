@@ -0,0 +1,134 @@
+# src/prism/metadata.py
+import copy
+import re
+from functools import lru_cache
+from pathlib import PurePath
+from typing import Any, Dict, Optional
+
+import yaml
+
+# The libyaml bindings are an optional part of PyYAML.
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+_STR_TAG = "tag:yaml.org,2002:str"
+_KEY = re.compile(r"[A-Za-z_][\w-]*")
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+_resolver = yaml.resolver.Resolver()
+
+
+def _plain(value: str) -> bool:
+    """Whether a string can be written as a plain YAML scalar and read back as
+    the same string."""
+    return (
+        bool(value)
+        and value.isprintable()
+        and value[0] not in _INDICATORS
+        and value == value.strip()
+        and ": " not in value
+        and " #" not in value
+        and not value.endswith(":")
+        and _resolver.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG
+    )
+
+
+def _plain_key(key: str) -> bool:
+    """Whether a key can be written plain and read back as the same string,
+    unlike keys YAML reads as booleans or null, such as yes, Off or null."""
+    return (
+        _KEY.fullmatch(key) is not None
+        and _resolver.resolve(yaml.ScalarNode, key, (True, False)) == _STR_TAG
+    )
+
+
+def _load_flat(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the flat shape Prism writes: "key: value" lines with plain string
+    values, and "key:" lines followed by "  - item" lines.
+
+    Returns None for anything else, which must be parsed as full YAML.
+    """
+    metadata: Dict[str, Any] = {}
+    list_key = None  # The key that "  - item" lines belong to.
+    for line in text.splitlines():
+        if line.startswith("  - "):
+            item = line[4:]
+            if list_key is None or not _plain(item):
+                return None
+            if metadata[list_key] is None:
+                metadata[list_key] = []
+            metadata[list_key].append(item)
+            continue
+
+        key, separator, value = line.partition(":")
+        if not separator or not _plain_key(key) or key in metadata:
+            return None
+        list_key = None
+        if not value:
+            list_key = key
+            metadata[key] = None  # A key with no items is null in YAML.
+        elif value == " []":
+            metadata[key] = []
+        elif value.startswith(" ") and _plain(value[1:]):
+            metadata[key] = value[1:]
+        else:
+            return None
+    return metadata
+
+
+@lru_cache(maxsize=4096)
+def _load_cached(text: str) -> tuple[Any, bool]:
+    metadata = _load_flat(text)
+    if metadata is not None:
+        return metadata, True
+    return yaml.load(text, Loader=_Loader), False
+
+
+def load_metadata(text: str) -> Any:
+    """Parse a metadata block.
+
+    Blocks in the shape Prism writes are parsed without a YAML parser, and
+    anything else with the libyaml loader when it is available. Results are
+    memoised by block, so an unchanged block is only parsed once. The caller
+    gets its own copy and may modify it.
+
+    Raises:
+        yaml.YAMLError: If the block is not valid YAML
+    """
+    metadata, flat = _load_cached(text)
+    if flat:
+        return {k: list(v) if isinstance(v, list) else v for k, v in metadata.items()}
+    return copy.deepcopy(metadata)
+
+
+def _dump_value(key: str, value: Any) -> str:
+    if isinstance(value, PurePath):
+        value = str(value)
+    if _plain_key(key):
+        if isinstance(value, str) and _plain(value):
+            return f"{key}: {value}\n"
+        if isinstance(value, list) and all(
+            isinstance(v, str) and _plain(v) for v in value
+        ):
+            if not value:
+                return f"{key}: []\n"
+            return f"{key}:\n" + "".join(f"  - {v}\n" for v in value)
+    try:
+        return yaml.dump(
+            {key: value},
+            Dumper=_Dumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        )
+    except yaml.representer.RepresenterError:
+        return _dump_value(key, str(value))
+
+
+def dump_metadata(metadata: Dict[str, Any]) -> str:
+    """Write metadata as a block that load_metadata reads back unchanged.
+
+    Plain strings and lists of them are written in Prism's flat shape, and
+    every other value as YAML. Values YAML cannot represent are written as
+    their string.
+    """
+    return "".join(_dump_value(str(key), value) for key, value in metadata.items())
@@ -1,6 +1,5 @@
 # src/prism/core/page.py
 import asyncio
-import re
 from os import PathLike
 from pathlib import Path
 from textwrap import dedent
@@ -14,9 +13,13 @@ from .generators.breadcrumbs import BreadcrumbsGenerator
 from .generators.pages import PagesGenerator
 from .generators.siblings import SiblingsGenerator
 from .generators.toc import TocGenerator
+from .metadata import dump_metadata, load_metadata
+from .parser import METADATA_BEGIN, METADATA_END, ParsedPage, parse_page
+from .titles import TitleIndex
 
 if TYPE_CHECKING:
     from .generators.base import Generator
+    from .refresh import RefreshSession
 
 
 class PageError(PrismError):
@@ -31,22 +34,17 @@ class PageValidationError(PageError):
     pass
 
 
-METADATA_BEGIN = "<!-- prism:metadata\n---"
-METADATA_END = "---\n-->"
-GENERATOR_PATTERN = re.compile(
-    r"<!--\s*prism:generate:(\w+)\s*-->(.*?)<!--\s*/prism:generate:\1\s*-->",
-    re.DOTALL,
-)
-
-
 class Page:
     """Represents a single page in a Prism repository"""
 
     drive: FileSystem
     path: PrismPath
     _content: str | None = None
+    _loaded_content: str | None = None
     _metadata: Dict[str, Any] | None = None
+    _parsed: ParsedPage | None = None
     _title: str | None = None
+    session: Optional["RefreshSession"] = None
 
     @staticmethod
     async def create(
@@ -125,29 +123,43 @@ class Page:
     async def _clear_cache(self):
         """Clear cached properties"""
         self._content = None
+        self._loaded_content = None
         self._metadata = None
+        self._parsed = None
         self._title = None
 
-    async def _load(self) -> "Page":
-        """Load page properties from disk"""
-        self._content = await self.drive.read(self.path)
+    async def _load(self, content: str | None = None) -> "Page":
+        """Load page properties from disk, or from content already read"""
+        if content is None:
+            content = await self.drive.read(self.path)
+        self._content = content
+        self._loaded_content = self._content
 
-        # Extract title from content.
-        match = re.search(r"^#\s+(.+)$", self._content, re.MULTILINE)
-        if not match:
+        # Extract title and metadata from content.
+        parsed = self.parsed
+        if parsed.title is None:
             raise PageValidationError(f"No title (h1) found in {self.path}")
-        self._title = match.group(1).strip()
-
-        # Extract metadata from content.
+        self._title = parsed.title
         self._metadata = self._parse_metadata()
 
         return self
 
-    async def _save(self):
-        """Save changes back to disk"""
-        if self._content is not None:
-            await self.drive.write(self.path, self._content)
-            self._content = None  # Reset cache
+    async def _save(self) -> bool:
+        """Save changes back to disk, returning whether anything was written.
+
+        Content identical to what was loaded is not rewritten, so unchanged
+        pages keep their modification time.
+        """
+        if self._content is None or self._content == self._loaded_content:
+            return False
+        await self.drive.write(self.path, self._content)
+        parsed = self.parsed
+        await TitleIndex.for_drive(self.drive).record(
+            [(self.path, parsed.title, parsed.title_position)]
+        )
+        self._content = None  # Reset cache
+        self._loaded_content = None
+        return True
 
     # PROPERTIES
 
@@ -172,28 +184,25 @@ class Page:
             await self._load()
         return self._metadata
 
-    def _metadata_indices(self) -> tuple[int, int]:
-        # Grab all content between <!-- prism:metadata --> markers.
-        content = self._content
-        metadata_start = content.find(METADATA_BEGIN)
-        metadata_end = content.find(METADATA_END)
-        return metadata_start, metadata_end
+    @property
+    def parsed(self) -> ParsedPage:
+        """The structure of the current content, scanned once per change"""
+        if self._content is None:
+            raise PageError(f"Page {self.path} is not loaded")
+        if self._parsed is None or self._parsed.content is not self._content:
+            self._parsed = parse_page(self._content)
+        return self._parsed
 
     def _has_metadata(self) -> bool:
         """Check if the page has a metadata section"""
-        metadata_start, metadata_end = self._metadata_indices()
-        return not (metadata_start == -1 or metadata_end == -1)
+        return self.parsed.has_metadata
 
     def _parse_metadata(self) -> Dict[str, Any]:
         """Parse YAML metadata from the bottom of the file"""
         if not self._has_metadata():
             return {}
-        metadata_start, metadata_end = self._metadata_indices()
-        metadata_copy = self._content[
-            metadata_start + len(METADATA_BEGIN) : metadata_end
-        ].strip()
         try:
-            return yaml.safe_load(metadata_copy)
+            return load_metadata(self.parsed.metadata_text)
         except yaml.YAMLError as e:
             raise PageError(f"Invalid metadata YAML in {self.path}: {e}")
 
@@ -209,18 +218,7 @@ class Page:
         }
         current_metadata.update(new_metadata)
 
-        # Format as YAML with specific styling
-        metadata_yaml = ""
-        for key, value in current_metadata.items():
-            if key == "generator_types":
-                if value and len(value) > 0:  # If we have generators
-                    metadata_yaml += f"{key}:\n"
-                    for gen_type in value:
-                        metadata_yaml += f"  - {gen_type}\n"
-                else:
-                    metadata_yaml += f"{key}:\n"  # Empty list
-            else:
-                metadata_yaml += f"{key}: {value}\n"
+        metadata_yaml = dump_metadata(current_metadata)
 
         # Update page content with new metadata.
         content = self._content
@@ -229,7 +227,8 @@ class Page:
                 content + f"\n{METADATA_BEGIN}\n{metadata_yaml}{METADATA_END}\n"
             )
         else:
-            metadata_start, metadata_end = self._metadata_indices()
+            metadata_start = self.parsed.metadata_start
+            metadata_end = self.parsed.metadata_end
             self._content = (
                 content[: metadata_start + len(METADATA_BEGIN)]
                 + "\n"
@@ -237,15 +236,43 @@ class Page:
                 + content[metadata_end:]
             )
 
-    async def refresh(self):
-        """Validate structure, run generators, update metadata"""
+    async def regenerate(
+        self,
+        content: str | None = None,
+        session: Optional["RefreshSession"] = None,
+    ) -> bool:
+        """Run generators and update metadata without saving.
+
+        Args:
+            content: The page's current content, if the caller already read it.
+            session: The refresh run this page is part of, whose state the
+                generators share with the run's other pages.
+
+        Returns True if the content changed. The new content is available from
+        the content property until the page is saved or reloaded.
+        """
 
         await self._clear_cache()
-        await self._load()
+        self.session = session
+        await self._load(content)
         await self._run_generators()
         self._update_metadata()
         # self._validate_structure()
-        await self._save()
+        return self._content != self._loaded_content
+
+    async def refresh(
+        self,
+        content: str | None = None,
+        session: Optional["RefreshSession"] = None,
+    ) -> bool:
+        """Validate structure, run generators, update metadata.
+
+        Returns True if the page changed and was written, False otherwise.
+        """
+        await self.regenerate(content, session)
+        written = await self._save()
+        await TitleIndex.for_drive(self.drive).save()
+        return written
 
     def _validate_structure(self):
         """Validate page structure"""
@@ -288,16 +315,30 @@ class Page:
         return False
 
     async def _run_generators(self):
-        """Find and run all generators in the page asynchronously, serially."""
+        """Find and run all generators in the page.
+
+        Generators run concurrently, except those that opt out, which run one
+        at a time afterwards. Each block's output is spliced in at the block's
+        position, so the result doesn't depend on which finished first.
+        """
+        parsed = self.parsed
+        if not parsed.blocks:
+            return
+
+        generators = []
+        for block in parsed.blocks:
+            try:
+                generators.append(self._get_generator(block.type))
+            except ValueError as e:
+                raise PageError(f"Generator '{block.type}' failed in {self.path}: {e}")
 
-        async def replace_generator(match) -> str:
-            """Run a generator and return the replaced string."""
-            generator_type = match.group(1)
+        async def replace_generator(i: int) -> str:
+            """Run the generator of block i and return the replaced string."""
+            generator_type = parsed.blocks[i].type
             try:
-                generator = self._get_generator(generator_type)
                 return (
                     f"<!-- prism:generate:{generator_type} -->\n"
-                    f"{await generator.generate(self)}\n"
+                    f"{await generators[i].generate(self)}\n"
                     f"<!-- /prism:generate:{generator_type} -->"
                 )
             except Exception as e:
@@ -305,23 +346,26 @@ class Page:
                     f"Generator '{generator_type}' failed in {self.path}: {e}"
                 )
 
-        # Find all matches using re.finditer()
-        matches = list(GENERATOR_PATTERN.finditer(self._content))
-        if not matches:
-            return
-
-        # Process each match **sequentially** (serial execution)
-        new_content = []
-        last_pos = 0
-
-        for match in matches:
-            new_content.append(self._content[last_pos : match.start()])
-            replacement = await replace_generator(match)
-            new_content.append(replacement)
-            last_pos = match.end()
-
-        new_content.append(self._content[last_pos:])  # Append remaining content
-        self._content = "".join(new_content)
+        # Run the concurrent generators together. If several fail, raise the
+        # error of the first in page order.
+        replacements = [""] * len(generators)
+        together = [i for i, g in enumerate(generators) if g.concurrent]
+        results = await asyncio.gather(
+            *(replace_generator(i) for i in together), return_exceptions=True
+        )
+        for i, result in zip(together, results):
+            if isinstance(result, BaseException):
+                raise result
+            replacements[i] = result
+
+        # Then the others, one at a time and in order.
+        for i, generator in enumerate(generators):
+            if not generator.concurrent:
+                replacements[i] = await replace_generator(i)
+
+        # Splice the output in and keep the structure without rescanning.
+        self._parsed = parsed.replace_blocks(replacements)
+        self._content = self._parsed.content
 
     def _get_generator(self, generator_type: str) -> "Generator":
         """Get a generator instance by type"""
@@ -339,9 +383,16 @@ class Page:
 
     def _find_generator_types(self) -> list[str]:
         """Find all generator types used in the page"""
-        types = []
-        pattern = r"<!--\s*prism:generate:(\w+)\s*-->"
-        matches = re.finditer(pattern, self._content)
-        for match in matches:
-            types.append(match.group(1))
-        return types
+        return self.parsed.generator_types
+
+    @property
+    def generator_reads(self) -> Optional[frozenset[str]]:
+        """What the page's generators read (see Generator.reads), or None if
+        one of them doesn't declare it"""
+        reads: frozenset[str] = frozenset()
+        for generator_type in self._find_generator_types():
+            generator = self._get_generator(generator_type)
+            if generator.reads is None:
+                return None
+            reads |= generator.reads
+        return reads
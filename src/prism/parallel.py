@@ -0,0 +1,154 @@
+# src/prism/parallel.py
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from os import PathLike
+from pathlib import Path
+
+from .filesystem.caching import CachingFileSystem
+from .filesystem.disk import Disk
+from .manifest import Manifest
+from .prism import Prism
+from .refresh import RefreshStats
+from .titles import TitleIndex
+from .types import METADATA_ROOT_DIR_NAME, PrismPath
+
+
+@dataclass
+class ShardResult:
+    """What a worker process did to one shard (a top-level subtree).
+
+    Attributes:
+        stats: The shard's refresh counts and the time it took
+        titles: The shard's title index entries, in the index file's format
+        manifest: The shard's manifest records, in the manifest file's format
+    """
+
+    stats: RefreshStats
+    titles: dict[str, tuple] = field(default_factory=dict)
+    manifest: dict[str, dict] = field(default_factory=dict)
+
+
+@dataclass
+class ParallelRefreshStats(RefreshStats):
+    """Counts of a refresh run in several processes.
+
+    Attributes:
+        processes: Number of worker processes
+        busy: Seconds spent refreshing, summed over the shards and the root
+    """
+
+    processes: int = 1
+    busy: float = 0.0
+
+    @property
+    def speed_up(self) -> float:
+        """How many times faster than refreshing every shard in turn."""
+        return self.busy / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{super().__str__()}, {self.speed_up:.1f}x speed-up on "
+            f"{self.processes} processes ({self.speed_up / self.processes:.2f} "
+            "per process)"
+        )
+
+
+async def _refresh_shard_async(
+    root: str, shard: str, jobs: int, incremental: bool
+) -> ShardResult:
+    # The parent replayed the repository's journals before starting the pool,
+    # and other workers may be committing batches now.
+    drive = Disk(Path(root), replay=False)
+    try:
+        # Only this process writes to the shard while it runs. The parent
+        # merges and saves the shard's index entries and manifest records.
+        cached = CachingFileSystem(drive, validate=False)
+        index = TitleIndex.for_drive(cached)
+        index.persistent = False
+        manifest = Manifest.for_drive(cached)
+        manifest.persistent = False
+        stats = await Prism(cached).refresh_folder(
+            PrismPath(shard), recursive=True, jobs=jobs, incremental=incremental
+        )
+        return ShardResult(
+            stats,
+            await index.export(PrismPath(shard)),
+            await manifest.export(PrismPath(shard)),
+        )
+    finally:
+        drive.close()
+
+
+def _refresh_shard(root: str, shard: str, jobs: int, incremental: bool) -> ShardResult:
+    """Refresh one shard with its own Disk drive (runs in a worker process)."""
+    return asyncio.run(_refresh_shard_async(root, shard, jobs, incremental))
+
+
+async def refresh_in_processes(
+    root: PathLike | str, processes: int, jobs: int = 1, incremental: bool = False
+) -> ParallelRefreshStats:
+    """Refresh a whole repository on disk in several processes.
+
+    Each top-level folder is a shard, refreshed recursively by one of
+    the worker processes, up to jobs pages at a time. The pool hands out
+    shards as workers become free. The pages at the root, whose listings
+    span every shard, are refreshed afterwards in this process, and the
+    workers' title index entries and manifest records are merged into the
+    repository's. If incremental, unchanged pages are skipped (see
+    Folder.refresh). Journals of interrupted write_atomic batches are replayed
+    once, here, before the workers start.
+
+    Shards are written folder by folder as they finish, so a failure can
+    leave some shards refreshed and others not.
+    """
+    if processes < 1:
+        raise ValueError("processes must be at least 1")
+
+    start = time.perf_counter()
+    drive = Disk(Path(root))
+    try:
+        shards = [
+            entry.name
+            for entry in await drive.list_entries(PrismPath())
+            if entry.is_directory and entry.name != METADATA_ROOT_DIR_NAME
+        ]
+
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(processes, mp_context=context) as pool:
+            futures = [
+                loop.run_in_executor(
+                    pool, _refresh_shard, str(drive.root), s, jobs, incremental
+                )
+                for s in shards
+            ]
+            try:
+                results = await asyncio.gather(*futures)
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+
+        stats = ParallelRefreshStats(processes=processes)
+        cached = CachingFileSystem(drive, validate=False)
+        index = TitleIndex.for_drive(cached)
+        manifest = Manifest.for_drive(cached)
+        for result in results:
+            stats.merge(result.stats)
+            stats.busy += result.stats.elapsed
+            await index.merge(result.titles)
+            await manifest.merge(result.manifest)
+
+        # The root folder's pages list every shard, so they go last.
+        root_stats = await Prism(cached).refresh_folder(
+            PrismPath(), jobs=jobs, incremental=incremental
+        )
+        stats.merge(root_stats)
+        stats.busy += root_stats.elapsed
+    finally:
+        drive.close()
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
@@ -0,0 +1,212 @@
+# src/prism/parser.py
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Optional
+
+METADATA_BEGIN = "<!-- prism:metadata\n---"
+METADATA_END = "---\n-->"
+
+# Every structural token of a page, matched in one left-to-right scan. Heading
+# lines only consume their first "#" (the whole line is captured by a
+# lookahead), so markers on a heading line are still found. The metadata
+# opener stops before its "---", which an empty metadata section shares with
+# the closer.
+_TOKENS = re.compile(
+    r"^(?=(?P<line>#[^\n]*))#"
+    r"|<!--\s*prism:generate:(?P<open>\w+)\s*-->"
+    r"|<!--\s*/prism:generate:(?P<close>\w+)\s*-->"
+    r"|(?P<meta_begin><!-- prism:metadata\n)(?=---)"
+    r"|(?P<meta_end>---\n-->)",
+    re.MULTILINE,
+)
+
+# A line starting with a single "#", the candidates for a page's title.
+_H1 = re.compile(r"^#(?!#)([^\n]*)", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class GeneratorBlock:
+    """A generator block, from the start of its opening marker to the end of
+    its closing marker."""
+
+    type: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Header:
+    """A section header (a line starting with "##") and where its line starts."""
+
+    level: int
+    title: str
+    position: int
+
+
+@dataclass
+class ParsedPage:
+    """The structure of a page's content, found in a single scan.
+
+    Attributes:
+        content: The content that was scanned
+        title: Text of the first "# " heading, or None
+        title_position: Position of the title's line, or -1
+        headers: Lines starting with "##", in order
+        generators: (position, type) of every opening generator marker
+        blocks: Generator blocks, each an opening marker matched with the next
+            closing marker of the same type, in order and not overlapping
+        metadata_start: Position of the first metadata opener, or -1
+        metadata_end: Position of the first metadata closer, or -1
+    """
+
+    content: str
+    title: Optional[str] = None
+    title_position: int = -1
+    headers: list[Header] = field(default_factory=list)
+    generators: list[tuple[int, str]] = field(default_factory=list)
+    blocks: list[GeneratorBlock] = field(default_factory=list)
+    metadata_start: int = -1
+    metadata_end: int = -1
+
+    @property
+    def has_metadata(self) -> bool:
+        return self.metadata_start != -1 and self.metadata_end != -1
+
+    @property
+    def generator_types(self) -> list[str]:
+        """Types of all generator markers in the page, in order"""
+        return [generator_type for _, generator_type in self.generators]
+
+    @property
+    def metadata_text(self) -> str:
+        """The YAML between the metadata markers"""
+        return self.content[
+            self.metadata_start + len(METADATA_BEGIN) : self.metadata_end
+        ].strip()
+
+    def replace_blocks(self, replacements: list[str]) -> "ParsedPage":
+        """Replace the text of every generator block.
+
+        Returns the structure of the new content without scanning it again,
+        by shifting the positions that follow each block. Replacements are
+        whole blocks including their markers, and are expected to contain no
+        markers or headings of their own, which holds for generator output.
+        If a metadata marker lies inside a block, the new content is scanned.
+        """
+        parts = []
+        blocks = []
+        ends = []  # End of each old block, with the total shift after it.
+        last = 0
+        shift = 0
+        for block, replacement in zip(self.blocks, replacements):
+            parts.append(self.content[last : block.start])
+            parts.append(replacement)
+            last = block.end
+            start = block.start + shift
+            blocks.append(GeneratorBlock(block.type, start, start + len(replacement)))
+            shift += len(replacement) - (block.end - block.start)
+            ends.append((block.end, shift))
+        parts.append(self.content[last:])
+        content = "".join(parts)
+
+        def inside(position: int) -> bool:
+            return any(b.start < position < b.end for b in self.blocks)
+
+        def moved(position: int) -> int:
+            if position == -1:
+                return -1
+            i = bisect_right(ends, (position, float("inf")))
+            return position + (ends[i - 1][1] if i else 0)
+
+        if inside(self.metadata_start) or inside(self.metadata_end):
+            return parse_page(content)
+
+        return ParsedPage(
+            content=content,
+            title=self.title,
+            title_position=moved(self.title_position),
+            headers=[
+                Header(h.level, h.title, moved(h.position))
+                for h in self.headers
+                if not inside(h.position)
+            ],
+            generators=[
+                (moved(position), generator_type)
+                for position, generator_type in self.generators
+                if not inside(position)
+            ],
+            blocks=blocks,
+            metadata_start=moved(self.metadata_start),
+            metadata_end=moved(self.metadata_end),
+        )
+
+
+def parse_page(content: str) -> ParsedPage:
+    """Scan page content once for its title, headers, generators and metadata."""
+    parsed = ParsedPage(content=content)
+    opens: list[tuple[int, int, str]] = []
+    closes: dict[str, list[tuple[int, int]]] = {}
+
+    for match in _TOKENS.finditer(content):
+        kind = match.lastgroup
+        if kind == "line":
+            line = match.group("line")
+            if line.startswith("##"):
+                parsed.headers.append(
+                    Header(line.count("#"), line.strip("#").strip(), match.start())
+                )
+            elif parsed.title is None and line[1:2].isspace() and line[1:].strip():
+                parsed.title = line[1:].strip()
+                parsed.title_position = match.start()
+        elif kind == "open":
+            parsed.generators.append((match.start(), match.group("open")))
+            opens.append((match.start(), match.end(), match.group("open")))
+        elif kind == "close":
+            closes.setdefault(match.group("close"), []).append(
+                (match.start(), match.end())
+            )
+        elif kind == "meta_begin":
+            if parsed.metadata_start == -1:
+                parsed.metadata_start = match.start()
+        elif parsed.metadata_end == -1:
+            parsed.metadata_end = match.start()
+
+    # Pair each opening marker with the next closing marker of its type,
+    # skipping openers inside a block that was already matched.
+    last_end = 0
+    for start, end, generator_type in opens:
+        if start < last_end:
+            continue
+        candidates = closes.get(generator_type, [])
+        i = bisect_left(candidates, (end, 0))
+        if i == len(candidates):
+            continue
+        last_end = candidates[i][1]
+        parsed.blocks.append(GeneratorBlock(generator_type, start, last_end))
+
+    return parsed
+
+
+def find_title_position(
+    content: str, partial: bool = False
+) -> Optional[tuple[str, int]]:
+    """Find a page's title, the first "# " heading, and where its line starts,
+    scanning no further.
+
+    With partial, content may be only the start of a page, and a heading on
+    its last line, which may be cut off, is not trusted.
+    """
+    for match in _H1.finditer(content):
+        line = match.group(1)
+        if line[:1].isspace() and line.strip():
+            if partial and match.end() == len(content):
+                return None
+            return line.strip(), match.start()
+    return None
+
+
+def find_title(content: str, partial: bool = False) -> Optional[str]:
+    """Find a page's title (see find_title_position)."""
+    found = find_title_position(content, partial)
+    return found[0] if found else None
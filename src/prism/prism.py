@@ -1,4 +1,6 @@
+import asyncio
 import os
+import time
 from os import PathLike
 from pathlib import Path
 from textwrap import dedent
@@ -7,7 +9,9 @@ from .exceptions import PrismError
 from .filesystem import FileSystem
 from .filesystem.disk import Disk
 from .folder import Folder
+from .manifest import Manifest
 from .page import Page
+from .refresh import RefreshSession, RefreshStats
 from .types import (
     BACKLINKS_NAME,
     METADATA_ROOT_DIR_NAME,
@@ -114,12 +118,66 @@ class Prism:
         """Create a new folder with the given path"""
         return await Folder.create(self, path)
 
-    async def refresh_page(self, path: PrismPath):
-        """Refresh a single page (validate, run generators, update indices)"""
+    async def refresh_page(self, path: PrismPath) -> bool:
+        """
+        Refresh a single page (validate, run generators, update indices).
+        Returns whether the page was written.
+        """
         page = self.get_page(path)
-        await page.refresh()
+        return await page.refresh()
 
-    async def refresh_folder(self, path: PrismPath, recursive: bool = False):
-        """Refresh all pages in a folder"""
+    async def refresh_folder(
+        self,
+        path: PrismPath,
+        recursive: bool = False,
+        jobs: int = 1,
+        incremental: bool = False,
+    ) -> RefreshStats:
+        """Refresh all pages in a folder, up to jobs pages at a time, skipping
+        unchanged pages if incremental"""
         folder = self.get_folder(path)
-        await folder.refresh(recursive=recursive)
+        return await folder.refresh(
+            recursive=recursive, jobs=jobs, incremental=incremental
+        )
+
+    async def propagate(self, path: PrismPath, jobs: int = 1) -> RefreshStats:
+        """Refresh an edited page and the pages that depend on it.
+
+        The dependents are the pages whose generators read something an edit
+        of the page can change, found in the manifest's dependency graph (see
+        Manifest.dependents). Of those, only pages whose inputs did change are
+        regenerated, as by an incremental refresh, up to jobs at a time. Pages
+        that were never refreshed aren't in the graph, so run a full refresh
+        first.
+        """
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1")
+
+        start = time.perf_counter()
+        path = PrismPath(path)
+        targets = [path] + await Manifest.for_drive(self.drive).dependents(path)
+        names: dict[PrismPath, list[str]] = {}
+        for target in targets:
+            names.setdefault(target.parent, []).append(target.name)
+
+        session = RefreshSession(self.drive)
+        slots = asyncio.Semaphore(jobs)
+        stats = RefreshStats()
+        results = await asyncio.gather(
+            *(
+                self.get_folder(directory)._refresh_named(pages, session, slots)
+                for directory, pages in names.items()
+            )
+        )
+        for folder_stats in results:
+            stats.merge(folder_stats)
+
+        await session.save()
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    async def restat_pages(self, paths: list[PrismPath]) -> None:
+        """Record the current stats of pages copied into the repository
+        without changing their content, such as pages committed from a staging
+        drive, so the next incremental refresh can check them by stat."""
+        await RefreshSession(self.drive).restat(paths)
@@ -0,0 +1,316 @@
+# src/prism/refresh.py
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+from .filesystem import DirEntry, FileSystem
+from .generators.base import ANCESTOR_TITLES, DIRECTORY_LISTING, SIBLING_TITLES
+from .manifest import Manifest, digest, parse_input_key
+from .titles import TitleIndex
+from .types import METADATA_ROOT_DIR_NAME, PrismPath
+
+
+@dataclass
+class RefreshStats:
+    """Counts of what a refresh did to the pages it visited.
+
+    Attributes:
+        written: Pages whose content changed and were saved
+        skipped: Pages whose refreshed content was identical and were left alone
+        elapsed: Wall-clock seconds the whole refresh took, or 0 if not timed
+    """
+
+    written: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.written + self.skipped
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def record(self, written: bool) -> None:
+        """Record the outcome of refreshing a single page."""
+        if written:
+            self.written += 1
+        else:
+            self.skipped += 1
+
+    def merge(self, other: "RefreshStats") -> None:
+        """Add the counts of another refresh to this one (not its time, since
+        refreshes may overlap)."""
+        self.written += other.written
+        self.skipped += other.skipped
+
+    def __str__(self) -> str:
+        counts = f"{self.written} written, {self.skipped} unchanged"
+        if not self.elapsed:
+            return counts
+        return f"{counts} in {self.elapsed:.2f}s, {self.pages_per_second:.0f} pages/s"
+
+
+@dataclass
+class DirectorySnapshot:
+    """The pages of a directory and their titles, as listed once per refresh.
+
+    Attributes:
+        directory: The directory that was listed
+        pages: (path, title) of each page except the README, where the title
+            is the exception looking it up raised if that failed
+        readmes: (path, title) of each subdirectory's README, likewise, with
+            a FileNotFoundError for subdirectories without one
+    """
+
+    directory: PrismPath
+    pages: list[tuple[PrismPath, str | Exception]] = field(default_factory=list)
+    readmes: list[tuple[PrismPath, str | Exception]] = field(default_factory=list)
+
+
+def _listed_pages(
+    directory: PrismPath, entries: list[DirEntry]
+) -> tuple[list[DirEntry], list[PrismPath]]:
+    """Split a listing into its pages (except the README) and the READMEs of
+    its subdirectories, whether or not they exist."""
+    pages = []
+    readmes = []
+    for entry in entries:
+        if entry.is_directory:
+            readmes.append(directory / entry.name / "README.md")
+        elif entry.name.endswith(".md") and not entry.name.endswith("README.md"):
+            pages.append(entry)
+    return pages, readmes
+
+
+class RefreshSession:
+    """State shared by the pages of one refresh run.
+
+    Nothing a refresh writes changes a page's title, so what generators derive
+    from titles can be computed once per run and reused by every page.
+    """
+
+    def __init__(self, drive: FileSystem):
+        self.drive = drive
+        self._readme_titles: dict[PrismPath, asyncio.Future] = {}
+        self._snapshots: dict[PrismPath, asyncio.Future] = {}
+        self._fingerprints: dict[str, asyncio.Future] = {}
+        self._signatures: dict[str, str] = {}
+        self._listings: dict[PrismPath, tuple[list[str], list[DirEntry]]] = {}
+        self._written: list[PrismPath] = []
+
+    def listed(
+        self, directory: PrismPath, dirs: list[str], files: list[DirEntry]
+    ) -> None:
+        """Remember a directory's listing from a walk of the drive, so the
+        signatures of its inputs don't list it again."""
+        self._listings[PrismPath(directory)] = (dirs, files)
+
+    def wrote(self, paths: list[PrismPath]) -> None:
+        """Note pages this run wrote, whose inputs must be signed again."""
+        self._written.extend(paths)
+
+    async def snapshot(self, directory: PrismPath) -> DirectorySnapshot:
+        """Get a directory's pages and subdirectory READMEs with their titles.
+
+        Each directory is listed and its titles looked up once per run, and
+        every page in it shares the snapshot, so callers must not modify it.
+        """
+        directory = PrismPath(directory)
+        if directory not in self._snapshots:
+            self._snapshots[directory] = asyncio.ensure_future(
+                self._take_snapshot(directory)
+            )
+        return await self._snapshots[directory]
+
+    async def _take_snapshot(self, directory: PrismPath) -> DirectorySnapshot:
+        entries, readmes = _listed_pages(
+            directory, await self.drive.list_entries(directory)
+        )
+        pages = [directory / entry.name for entry in entries]
+        titles = await TitleIndex.for_drive(self.drive).titles(pages + readmes)
+        return DirectorySnapshot(
+            directory,
+            pages=list(zip(pages, titles[: len(pages)])),
+            readmes=list(zip(readmes, titles[len(pages) :])),
+        )
+
+    async def readme_titles(self, directory: PrismPath) -> list[tuple[PrismPath, str]]:
+        """Get the title of the README of a directory and of each of its
+        ancestors, from the directory up to the root.
+
+        Directories without a README are skipped. Each directory's chain is
+        looked up once per run, and pages in the same folder share it, so
+        callers must not modify it.
+
+        Returns:
+            list: (directory, README title) pairs.
+        """
+        directory = PrismPath(directory)
+        if directory not in self._readme_titles:
+            self._readme_titles[directory] = asyncio.ensure_future(
+                self._lookup_readme_titles(directory)
+            )
+        return await self._readme_titles[directory]
+
+    async def _lookup_readme_titles(
+        self, directory: PrismPath
+    ) -> list[tuple[PrismPath, str]]:
+        index = TitleIndex.for_drive(self.drive)
+        title = (await index.titles([directory / "README.md"]))[0]
+        chain = []
+        if not isinstance(title, FileNotFoundError):
+            if isinstance(title, Exception):
+                raise title
+            chain.append((directory, title))
+        if directory.parts:
+            chain += await self.readme_titles(directory.parent)
+        return chain
+
+    async def fingerprint(self, key: str) -> str:
+        """Get the fingerprint of a generator input (see manifest.INPUT_KINDS) as
+        of this run, computed once per run.
+
+        If the files the input is derived from have the stats they were last
+        recorded with, the recorded fingerprint is reused without reading
+        anything. Otherwise it's computed from the titles the generators see.
+        """
+        if key not in self._fingerprints:
+            self._fingerprints[key] = asyncio.ensure_future(
+                self._compute_fingerprint(key)
+            )
+        return await self._fingerprints[key]
+
+    async def _compute_fingerprint(self, key: str) -> str:
+        recorded = await Manifest.for_drive(self.drive).recorded_input(key)
+        signature = self._signatures[key] = await self._signature(key)
+        if recorded is not None and recorded[0] == signature:
+            return recorded[1]
+
+        kind, directory = parse_input_key(key)
+        if kind in (DIRECTORY_LISTING, SIBLING_TITLES):
+            snapshot = await self.snapshot(directory)
+            pages = snapshot.pages
+            if kind == DIRECTORY_LISTING:
+                pages = pages + snapshot.readmes
+            return digest(
+                [
+                    [str(path), title if isinstance(title, str) else None]
+                    for path, title in pages
+                ]
+            )
+        if kind == ANCESTOR_TITLES:
+            chain = await self.readme_titles(directory)
+            return digest([[str(path), title] for path, title in chain])
+        raise ValueError(f"Unknown generator input: {key}")
+
+    async def _signature(self, key: str, fresh: bool = False) -> str:
+        """Hash the stats of the files an input is derived from.
+
+        A listing remembered from a walk is used unless fresh is set.
+        """
+        kind, directory = parse_input_key(key)
+        if kind in (DIRECTORY_LISTING, SIBLING_TITLES):
+            listed = None if fresh else self._listings.get(directory)
+            if listed is None:
+                entries = await self.drive.list_entries(directory)
+                dirs = [e.name for e in entries if e.is_directory]
+                listed = (dirs, [e for e in entries if not e.is_directory])
+            dirs, files = listed
+            data: list = [
+                [f.name, f.mtime, f.size]
+                for f in files
+                if f.name.endswith(".md") and not f.name.endswith("README.md")
+            ]
+            # Walks skip metadata directories, which have no README anyway.
+            paths = [
+                directory / name / "README.md"
+                for name in dirs
+                if kind == DIRECTORY_LISTING and name != METADATA_ROOT_DIR_NAME
+            ]
+        elif kind == ANCESTOR_TITLES:
+            paths = [directory / "README.md"]
+            paths += [parent / "README.md" for parent in directory.parents]
+            data = []
+        else:
+            raise ValueError(f"Unknown generator input: {key}")
+
+        for path, stat in zip(paths, await self.drive.stat_many(paths)):
+            if isinstance(stat, Exception):
+                data.append([str(path), type(stat).__name__])
+            else:
+                data.append([str(path), stat.mtime, stat.size])
+        return digest(data)
+
+    async def save(self) -> None:
+        """Save what this run recorded: the title index, and the manifest with
+        the inputs the run read."""
+        await TitleIndex.for_drive(self.drive).save()
+        manifest = Manifest.for_drive(self.drive)
+        await manifest.record_inputs(await self.input_states())
+        await manifest.save()
+
+    async def restat(self, paths: Sequence[PrismPath]) -> None:
+        """Record the current stats of pages that were copied without changing
+        their content, such as pages committed from a staging drive, and save.
+
+        The title index and the manifest take the pages' new stats, and the
+        recorded inputs derived from them are signed again, so the next
+        incremental refresh checks them by stat.
+        """
+        paths = [PrismPath(path) for path in paths]
+        await TitleIndex.for_drive(self.drive).restat(paths)
+        manifest = Manifest.for_drive(self.drive)
+        await manifest.restat(paths)
+        copied = _signed_from(paths)
+        states = {}
+        for key, (_, fingerprint) in (await manifest.recorded_inputs()).items():
+            if copied(key):
+                try:
+                    states[key] = (await self._signature(key, fresh=True), fingerprint)
+                except (OSError, ValueError):
+                    continue
+        await manifest.record_inputs(states)
+        await self.save()
+
+    async def input_states(self) -> dict[str, tuple[str, str]]:
+        """Get the (signature, fingerprint) of each input read in this run, as
+        the manifest records them.
+
+        Inputs derived from pages this run wrote are signed again, so their
+        signatures cover the new stats. Inputs whose fingerprint couldn't be
+        computed are left out.
+        """
+        written = _signed_from(self._written)
+        states = {}
+        for key, future in self._fingerprints.items():
+            if not future.done() or future.cancelled() or future.exception():
+                continue
+            try:
+                if written(key) or key not in self._signatures:
+                    signature = await self._signature(key, fresh=True)
+                else:
+                    signature = self._signatures[key]
+            except (OSError, ValueError):
+                continue
+            states[key] = (signature, future.result())
+        return states
+
+
+def _signed_from(paths: Sequence[PrismPath]) -> Callable[[str], bool]:
+    """Make a check of whether an input's signature, by key, covers the stats
+    of any of the given pages."""
+    page_dirs = {path.parent for path in paths}
+    readme_dirs = {p.parent for p in paths if p.name == "README.md"}
+    listing_dirs = page_dirs | {d.parent for d in readme_dirs if d.parts}
+
+    def signed(key: str) -> bool:
+        kind, directory = parse_input_key(key)
+        if kind == DIRECTORY_LISTING:
+            return directory in listing_dirs
+        if kind == SIBLING_TITLES:
+            return directory in page_dirs
+        return not readme_dirs.isdisjoint((directory, *directory.parents))
+
+    return signed
@@ -0,0 +1,221 @@
+# src/prism/titles.py
+import asyncio
+import json
+from dataclasses import astuple, dataclass, replace
+from logging import getLogger
+from typing import Sequence
+from weakref import WeakKeyDictionary
+
+from .filesystem import DirEntry, FileSystem
+from .parser import find_title_position
+from .types import METADATA_ROOT_DIR_NAME, TITLES_NAME, PrismPath
+
+logger = getLogger(__name__)
+
+# Bytes read from the start of a page to find its title without loading it.
+TITLE_HEAD_BYTES = 4096
+
+# Version of the index file format; an index of another version is rebuilt.
+TITLE_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class TitleEntry:
+    """A page's title and its line's position, as of the page's modification
+    time and size when it was read."""
+
+    title: str
+    position: int
+    mtime: float
+    size: int
+
+
+async def read_titles(
+    drive: FileSystem, paths: Sequence[PrismPath]
+) -> list[tuple[str, int] | Exception]:
+    """Read the titles of several pages, and where their lines start.
+
+    Only the start of each page is read, up to its first h1. A page whose
+    title isn't in its first TITLE_HEAD_BYTES bytes is read in full.
+
+    Returns (title, position) for each path, in order, or the exception
+    reading that page raised (PageValidationError if it has no title).
+    """
+    from .page import PageValidationError
+
+    results: dict[int, tuple[str, int] | Exception] = {}
+    missing = []
+    for i, head in enumerate(await drive.read_head_many(paths, TITLE_HEAD_BYTES)):
+        found = head if isinstance(head, Exception) else find_title_position(head, True)
+        if found is None:
+            missing.append(i)
+        else:
+            results[i] = found
+
+    if missing:
+        contents = await drive.read_many([paths[i] for i in missing])
+        for i, content in zip(missing, contents):
+            if isinstance(content, Exception):
+                results[i] = content
+                continue
+            results[i] = find_title_position(content) or PageValidationError(
+                f"No title (h1) found in {paths[i]}"
+            )
+    return [results[i] for i in range(len(paths))]
+
+
+class TitleIndex:
+    """A persistent index of page titles, kept in .prism.
+
+    An indexed title is trusted for as long as its page's modification time
+    and size are unchanged, so resolving titles costs a batch of stats, and
+    only pages that changed since they were indexed are opened. Pages written
+    by a refresh are recorded as they are saved.
+
+    There is one index per drive (see for_drive). Changes are kept in memory
+    until save(), and are never saved on a drive without a .prism directory,
+    or when persistent is False.
+    """
+
+    _indexes: "WeakKeyDictionary[FileSystem, TitleIndex]" = WeakKeyDictionary()
+
+    @classmethod
+    def for_drive(cls, drive: FileSystem) -> "TitleIndex":
+        """Get the index of a drive, creating it on first use."""
+        index = cls._indexes.get(drive)
+        if index is None:
+            index = cls._indexes[drive] = cls(drive)
+        return index
+
+    def __init__(self, drive: FileSystem):
+        self.drive = drive
+        self.path = PrismPath(METADATA_ROOT_DIR_NAME) / TITLES_NAME
+        self._entries: dict[PrismPath, TitleEntry] | None = None
+        self._dirty = False
+        self._lock = asyncio.Lock()
+        self.persistent = True
+
+    async def _load(self) -> dict[PrismPath, TitleEntry]:
+        async with self._lock:
+            if self._entries is None:
+                self._entries = await self._read()
+        return self._entries
+
+    async def _read(self) -> dict[PrismPath, TitleEntry]:
+        try:
+            data = json.loads(await self.drive.read(self.path))
+            if data["version"] != TITLE_INDEX_VERSION:
+                return {}
+            return {
+                PrismPath(path): TitleEntry(*entry)
+                for path, entry in data["pages"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}  # Missing or unreadable: rebuilt as titles are read.
+
+    async def titles(self, paths: Sequence[PrismPath]) -> list[str | Exception]:
+        """Resolve the titles of several pages, reading only changed pages.
+
+        Returns the title for each path, in order, or the exception stating
+        or reading that page raised.
+        """
+        entries = await self._load()
+        paths = [PrismPath(path) for path in paths]
+        stats = await self.drive.stat_many(paths)
+
+        results: dict[int, str | Exception] = {}
+        misses: list[tuple[int, DirEntry]] = []
+        for i, (path, stat) in enumerate(zip(paths, stats)):
+            if isinstance(stat, Exception):
+                results[i] = stat
+                if entries.pop(path, None) is not None:
+                    self._dirty = True
+                continue
+            entry = entries.get(path)
+            if entry and (entry.mtime, entry.size) == (stat.mtime, stat.size):
+                results[i] = entry.title
+            else:
+                misses.append((i, stat))
+
+        if misses:
+            found = await read_titles(self.drive, [paths[i] for i, _ in misses])
+            for (i, stat), item in zip(misses, found):
+                if isinstance(item, Exception):
+                    results[i] = item
+                    continue
+                title, position = item
+                entries[paths[i]] = TitleEntry(title, position, stat.mtime, stat.size)
+                self._dirty = True
+                results[i] = title
+        return [results[i] for i in range(len(paths))]
+
+    async def record(self, pages: Sequence[tuple[PrismPath, str | None, int]]) -> None:
+        """Record the (path, title, position) of pages that were just written.
+
+        Pages without a title are dropped from the index.
+        """
+        if not pages:
+            return
+        entries = await self._load()
+        stats = await self.drive.stat_many([path for path, _, _ in pages])
+        for (path, title, position), stat in zip(pages, stats):
+            if isinstance(stat, Exception) or title is None:
+                entries.pop(PrismPath(path), None)
+            else:
+                entries[PrismPath(path)] = TitleEntry(
+                    title, position, stat.mtime, stat.size
+                )
+        self._dirty = True
+
+    async def restat(self, paths: Sequence[PrismPath]) -> None:
+        """Record the current stats of indexed pages that were copied without
+        changing their content, such as pages committed from a staging drive."""
+        entries = await self._load()
+        paths = [PrismPath(path) for path in paths if PrismPath(path) in entries]
+        for path, stat in zip(paths, await self.drive.stat_many(paths)):
+            if isinstance(stat, Exception):
+                del entries[path]
+            else:
+                entries[path] = replace(entries[path], mtime=stat.mtime, size=stat.size)
+            self._dirty = True
+
+    async def export(self, directory: PrismPath) -> dict[str, tuple]:
+        """Get the entries of the pages below a directory, in the index file's
+        format, to merge into another index of the same repository."""
+        prefix = PrismPath(directory).parts
+        return {
+            str(path): astuple(entry)
+            for path, entry in (await self._load()).items()
+            if path.parts[: len(prefix)] == prefix
+        }
+
+    async def merge(self, entries: dict[str, tuple]) -> None:
+        """Add exported entries to the index, replacing those of the same pages."""
+        index = await self._load()
+        for path, entry in entries.items():
+            index[PrismPath(path)] = TitleEntry(*entry)
+        self._dirty = True
+
+    async def save(self) -> None:
+        """Write the index to .prism if it changed.
+
+        The index only speeds up refreshes, so failing to write it is logged
+        rather than raised.
+        """
+        if not self._dirty or self._entries is None or not self.persistent:
+            return
+        if not await self.drive.is_directory(PrismPath(METADATA_ROOT_DIR_NAME)):
+            return
+
+        # Tuples by hand: dataclasses.astuple deep-copies, once per page.
+        pages = {
+            str(path): (e.title, e.position, e.mtime, e.size)
+            for path, e in sorted(self._entries.items())
+        }
+        data = {"version": TITLE_INDEX_VERSION, "pages": pages}
+        try:
+            await self.drive.write(self.path, json.dumps(data, separators=(",", ":")))
+        except OSError as e:
+            logger.warning(f"Failed to save the title index: {e}")
+            return
+        self._dirty = False
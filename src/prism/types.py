@@ -3,6 +3,8 @@ from pathlib import PurePosixPath
 METADATA_ROOT_DIR_NAME = ".prism"
 BACKLINKS_NAME = "backlinks.txt"
 TAGS_NAME = "tags.txt"
+TITLES_NAME = "titles.json"
+MANIFEST_NAME = "manifest.json"
 SEARCH_INDEX_DIR_NAME = ".search"
 
 
@@ -1,3 +1,4 @@
+import asyncio
 from textwrap import dedent
 
 import pytest
@@ -18,7 +19,7 @@ async def test_folder_no_readme(tmp_prism):
     empty_dir.mkdir()
 
     with pytest.raises(FolderError, match="missing README.md"):
-        await Folder(tmp_prism, PrismPath("empty"))._validate_structure()
+        await Folder(tmp_prism, PrismPath("empty")).refresh()
 
 
 async def test_list_pages(tmp_prism):
@@ -102,3 +103,72 @@ async def test_recursive_refresh(tmp_prism):
     # Check that the page was refreshed
     page = await tmp_prism.get_page(page_path)._load()
     assert "[A heading](#a-heading)" in await page.content
+
+
+async def test_refresh_reports_written_and_skipped(tmp_prism):
+    """Test refresh counts written and unchanged pages"""
+    folder = tmp_prism.get_folder(PrismPath())
+
+    # Bring listings of pages created later up to date, after which a refresh
+    # changes nothing.
+    await folder.refresh(recursive=True)
+    stats = await folder.refresh(recursive=True)
+    assert stats.written == 0
+    assert stats.skipped == stats.total == 3
+
+    await tmp_prism.create_page(PrismPath("docs/new.md"), "New")
+    stats = await folder.refresh(recursive=True)
+    # The new page shows up in the docs README and guide page listings.
+    assert stats.written == 2
+    assert stats.total == 4
+
+
+async def test_refresh_jobs(tmp_prism, monkeypatch):
+    """Test a parallel refresh stays within jobs and refreshes READMEs first"""
+    folder = tmp_prism.get_folder(PrismPath())
+    for name in ["a", "b"]:
+        sub = await folder.create_subfolder(name)
+        for i in range(3):
+            await tmp_prism.create_page(sub.path / f"page{i}.md", f"Page {i}")
+
+    started = []
+    running = 0
+    most_running = 0
+    regenerate = Page.regenerate
+
+    async def tracked(self, content=None, session=None):
+        nonlocal running, most_running
+        started.append(self.path)
+        running += 1
+        most_running = max(most_running, running)
+        await asyncio.sleep(0.001)
+        try:
+            return await regenerate(self, content, session)
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(Page, "regenerate", tracked)
+    stats = await folder.refresh(recursive=True, jobs=3)
+
+    assert 1 < most_running <= 3
+    assert stats.total == len(started) == 11
+    assert stats.elapsed > 0 and "pages/s" in str(stats)
+    for path in started:
+        if path.name != "README.md":
+            readme = path.parent / "README.md"
+            assert started.index(readme) < started.index(path)
+        elif path.parent != PrismPath():
+            assert started.index(path.parent.parent / "README.md") < started.index(path)
+
+    # Refreshing in parallel gives the same pages as refreshing in sequence.
+    contents = {path: await tmp_prism.drive.read(path) for path in started}
+    stats = await folder.refresh(recursive=True, jobs=1)
+    assert stats.written == 0
+    assert contents == {path: await tmp_prism.drive.read(path) for path in started}
+
+
+async def test_refresh_jobs_error(tmp_prism):
+    """Test a failing folder stops a parallel refresh with its own error"""
+    await tmp_prism.drive.write(PrismPath("docs/broken/page.md"), "# Page\n")
+    with pytest.raises(FolderError, match="missing README.md"):
+        await tmp_prism.get_folder(PrismPath()).refresh(recursive=True, jobs=4)
@@ -0,0 +1,135 @@
+import os
+
+import pytest
+
+from prism import CachingFileSystem, Disk, Prism, PrismPath
+from prism.filesystem.overlay import OverlayFileSystem
+from prism.manifest import Manifest
+
+
+@pytest.fixture
+async def reads(tmp_prism: Prism, monkeypatch):
+    """Record the pages a refresh reads"""
+    await tmp_prism.create_page(PrismPath("docs/other.md"), "Other")
+    await tmp_prism.refresh_folder(PrismPath(), recursive=True)
+
+    paths: list[str] = []
+    read_many = tmp_prism.drive.read_many
+
+    async def recording_read_many(items):
+        paths.extend(str(path) for path in items)
+        return await read_many(items)
+
+    monkeypatch.setattr(tmp_prism.drive, "read_many", recording_read_many)
+    return paths
+
+
+async def refresh(prism: Prism):
+    return await prism.refresh_folder(PrismPath(), recursive=True, incremental=True)
+
+
+async def test_incremental_skips_unchanged(tmp_prism, reads):
+    """Test an incremental refresh of an unchanged repository reads no pages"""
+    stats = await refresh(tmp_prism)
+    assert (stats.written, stats.skipped) == (0, 4)
+    assert reads == []
+    assert await tmp_prism.drive.exists(Manifest.for_drive(tmp_prism.drive).path)
+
+
+async def test_incremental_follows_inputs(tmp_prism, reads):
+    """Test a new title refreshes the pages listing it, and only those"""
+    path = tmp_prism.drive.root / "docs" / "guide.md"
+    path.write_text(path.read_text().replace("# Guide", "# Handbook"))
+
+    stats = await refresh(tmp_prism)
+    assert sorted(reads) == ["docs/README.md", "docs/guide.md", "docs/other.md"]
+    assert stats.written == 3
+    assert (
+        "[Handbook](guide.md)" in (tmp_prism.drive.root / "docs/other.md").read_text()
+    )
+
+    reads.clear()
+    assert (await refresh(tmp_prism)).written == 0
+    assert reads == []
+
+
+async def test_incremental_touched_page(tmp_prism, reads):
+    """Test a page whose modification time changed is read but not rewritten"""
+    path = tmp_prism.drive.root / "docs" / "guide.md"
+    os.utime(path, (1_000_000_000, 1_000_000_000))
+
+    stats = await refresh(tmp_prism)
+    assert reads == ["docs/guide.md"]
+    assert stats.written == 0
+    assert path.stat().st_mtime == 1_000_000_000
+
+    # The new modification time is recorded, so it isn't read again.
+    reads.clear()
+    await refresh(tmp_prism)
+    assert reads == []
+
+
+async def test_dependents(tmp_prism, reads):
+    """Test the dependency graph finds the pages an edit of a page can affect"""
+    manifest = Manifest.for_drive(tmp_prism.drive)
+    assert await manifest.dependents(PrismPath("docs/guide.md")) == [
+        PrismPath("docs/README.md"),
+        PrismPath("docs/other.md"),
+    ]
+    # A README is listed by its parent, and in the breadcrumbs below it.
+    assert await manifest.dependents(PrismPath("docs/README.md")) == [
+        PrismPath("README.md"),
+        PrismPath("docs/guide.md"),
+        PrismPath("docs/other.md"),
+    ]
+
+
+async def test_propagate(tmp_prism, reads):
+    """Test propagating an edit refreshes only the pages whose inputs changed"""
+    path = tmp_prism.drive.root / "docs" / "README.md"
+    path.write_text(path.read_text().replace("# Documentation", "# Manual"))
+
+    stats = await tmp_prism.propagate(PrismPath("docs/README.md"))
+    assert stats.written == 4
+    root = tmp_prism.drive.root
+    assert "[Manual](docs/README.md)" in (root / "README.md").read_text()
+    assert "[Manual](README.md)" in (root / "docs/other.md").read_text()
+    assert (await refresh(tmp_prism)).written == 0
+
+    # Same title: the pages listing the page have nothing new to show.
+    reads.clear()
+    path = tmp_prism.drive.root / "docs" / "guide.md"
+    marker = "<!-- /prism:generate:breadcrumbs -->"
+    path.write_text(path.read_text().replace(marker, "stale\n" + marker))
+    stats = await tmp_prism.propagate(PrismPath("docs/guide.md"))
+    assert (stats.written, stats.skipped) == (1, 2)
+    assert reads == ["docs/guide.md"]
+
+
+async def test_restat_after_staged_refresh(tmp_prism, reads):
+    """Test pages refreshed through an overlay and committed are trusted by
+    stat by the next incremental refresh"""
+    path = tmp_prism.drive.root / "docs" / "guide.md"
+    path.write_text(path.read_text().replace("# Guide", "# Handbook"))
+
+    overlay = OverlayFileSystem(
+        CachingFileSystem(Disk(tmp_prism.drive.root), validate=False)
+    )
+    staged = Prism(overlay)
+    assert (await refresh(staged)).written == 3
+    changes = await overlay.commit()
+    await staged.restat_pages(changes.written)
+    await overlay.commit()
+
+    prism = Prism(Disk(tmp_prism.drive.root))
+    paths: list[str] = []
+    read_many = prism.drive.read_many
+
+    async def recording_read_many(items):
+        paths.extend(str(path) for path in items)
+        return await read_many(items)
+
+    prism.drive.read_many = recording_read_many
+    stats = await refresh(prism)
+    assert (stats.written, stats.skipped) == (0, 4)
+    assert paths == []
@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+import yaml
+
+from prism.filesystem import PrismPath
+from prism.metadata import _load_flat, dump_metadata, load_metadata
+
+FLAT = "title: Test Page\npath: docs/test.md\ngenerator_types:\n  - toc\n  - pages\n"
+
+
+def test_load_flat():
+    assert _load_flat(FLAT) == yaml.safe_load(FLAT)
+    assert _load_flat("generator_types:\n") == {"generator_types": None}
+    assert _load_flat("generator_types: []") == {"generator_types": []}
+
+    # Anything beyond the flat shape is left to the YAML parser.
+    for text in [
+        "count: 3",
+        "last_updated: 2024-01-01",
+        "title: 'quoted'",
+        "nested:\n  key: value",
+        "title: a # comment",
+        "yes: value",
+        "Off: value",
+        "null: value",
+    ]:
+        assert _load_flat(text) is None
+        assert load_metadata(text) == yaml.safe_load(text)
+
+
+def test_load_metadata_copies():
+    first = load_metadata(FLAT)
+    first["generator_types"].append("siblings")
+    first["title"] = "Changed"
+    assert load_metadata(FLAT) == yaml.safe_load(FLAT)
+
+    nested = "nested:\n  items: [1, 2]"
+    load_metadata(nested)["nested"]["items"].append(3)
+    assert load_metadata(nested) == {"nested": {"items": [1, 2]}}
+
+
+def test_load_metadata_invalid():
+    with pytest.raises(yaml.YAMLError):
+        load_metadata("invalid: yaml: [")
+
+
+def test_dump_metadata():
+    metadata = {
+        "title": "Test Page",
+        "path": PrismPath("docs/test.md"),
+        "generator_types": ["toc", "pages"],
+    }
+    assert dump_metadata(metadata) == FLAT
+
+
+@pytest.mark.parametrize(
+    "metadata",
+    [
+        {"title": "Part 1: The Beginning"},
+        {"title": "# Not a comment"},
+        {"title": "true"},
+        {"title": None},
+        {"title": "multi\nline"},
+        {"generator_types": []},
+        {"last_updated": date(2024, 1, 1), "count": 3},
+        {"nested": {"items": [1, "two", {"three": 3}]}},
+        {"key with spaces": "value"},
+        {"yes": "value", "null": ["item"]},
+    ],
+)
+def test_dump_metadata_round_trip(metadata):
+    text = dump_metadata(metadata)
+    assert load_metadata(text) == metadata
+    assert yaml.safe_load(text) == metadata
@@ -1,9 +1,12 @@
+import asyncio
 from datetime import date
 from textwrap import dedent
 
 import pytest
 
 from prism import Page, PageError, PageValidationError, PrismPath
+from prism.generators.base import Generator
+from prism.titles import read_titles
 
 
 @pytest.fixture
@@ -132,3 +135,93 @@ async def test_page_refresh_updates_metadata(test_page):
     content = await test_page.content
     assert "generator_types:" in content
     assert "- toc" in content
+
+
+async def test_page_refresh_skips_unchanged_content(test_page, tmp_prism):
+    """Test a second refresh does not rewrite an unchanged page"""
+    # Page.create already refreshed the page once.
+    await tmp_prism.drive.set_modification_time(test_page.path, 1000.0)
+
+    assert await test_page.refresh() is False
+    assert await tmp_prism.drive.get_modification_time(test_page.path) == 1000.0
+
+    # A content change is written on the next refresh.
+    content = await tmp_prism.drive.read(test_page.path)
+    await tmp_prism.drive.write(
+        test_page.path, content.replace("## Section 2", "## Two")
+    )
+    assert await test_page.refresh() is True
+    assert "[Two](#two)" in await tmp_prism.drive.read(test_page.path)
+
+
+async def test_read_titles(tmp_prism):
+    """Test titles are read from the start of pages without loading them"""
+    drive = tmp_prism.drive
+    await drive.write(PrismPath("short.md"), "# Short\n")
+    await drive.write(PrismPath("long.md"), "x\n" * 5000 + "# Late Title\n")
+    await drive.write(PrismPath("untitled.md"), "No title")
+    await drive.write(
+        PrismPath("bad_metadata.md"),
+        "# Bad Metadata\n<!-- prism:metadata\n---\ninvalid: yaml: [\n---\n-->\n",
+    )
+
+    titles = await read_titles(
+        drive,
+        [
+            PrismPath("short.md"),
+            PrismPath("long.md"),
+            PrismPath("untitled.md"),
+            PrismPath("missing.md"),
+            PrismPath("bad_metadata.md"),
+        ],
+    )
+    assert [found[0] for found in titles[:2]] == ["Short", "Late Title"]
+    assert isinstance(titles[2], PageValidationError)
+    assert isinstance(titles[3], FileNotFoundError)
+    assert titles[4][0] == "Bad Metadata"
+
+
+async def test_generators_run_concurrently(tmp_prism, monkeypatch):
+    """Test generators overlap unless they opt out, and splice in page order"""
+    events = []
+
+    class Slow(Generator):
+        def __init__(self, name, delay, concurrent=True):
+            self.name, self.delay, self.concurrent = name, delay, concurrent
+
+        async def generate(self, page):
+            events.append(f"start {self.name}")
+            await asyncio.sleep(self.delay)
+            events.append(f"end {self.name}")
+            return self.name
+
+    generators = {
+        "toc": Slow("toc", 0.02),
+        "pages": Slow("pages", 0.01),
+        "siblings": Slow("siblings", 0, concurrent=False),
+        "breadcrumbs": Slow("breadcrumbs", 0, concurrent=False),
+    }
+    monkeypatch.setattr(Page, "_get_generator", lambda self, t: generators[t])
+
+    content = "# Title\n" + "".join(
+        f"<!-- prism:generate:{t} -->\n<!-- /prism:generate:{t} -->\n"
+        for t in ["siblings", "toc", "breadcrumbs", "pages"]
+    )
+    await tmp_prism.drive.write(PrismPath("order.md"), content)
+    page = Page(tmp_prism.drive, PrismPath("order.md"))
+    await page.regenerate()
+
+    assert events == [
+        "start toc",
+        "start pages",
+        "end pages",
+        "end toc",
+        "start siblings",
+        "end siblings",
+        "start breadcrumbs",
+        "end breadcrumbs",
+    ]
+    body = await page.content
+    order = ["siblings", "toc", "breadcrumbs", "pages"]
+    positions = [body.index(f"\n{t}\n") for t in order]
+    assert positions == sorted(positions)
@@ -0,0 +1,45 @@
+import shutil
+
+import pytest
+
+from prism import Disk, Prism, PrismPath
+from prism.parallel import refresh_in_processes
+from prism.titles import TitleIndex
+
+
+@pytest.mark.parametrize("names", [("alpha", "bravo"), tuple("abcdefgh")])
+async def test_refresh_in_processes(tmp_prism, names):
+    """Test a refresh in worker processes writes what a sequential one does,
+    with as many shards as processes and with more shards than processes"""
+    folder = tmp_prism.get_folder()
+    for name in names:
+        sub = await folder.create_subfolder(PrismPath(name), name.title())
+        await tmp_prism.create_page(sub.path / "page.md", f"{name.title()} page")
+
+    root = tmp_prism.drive.root
+    copy = root.parent / "sequential"
+    shutil.copytree(root, copy)
+    expected_drive = Disk(copy)
+    expected = await Prism(expected_drive).refresh_folder(PrismPath(), recursive=True)
+
+    # A batch left behind by an interrupted process is replayed once.
+    tmp_prism.drive.journal_directory.mkdir(exist_ok=True)
+    tmp_prism.drive._write_journal([("notes.txt", b"replayed")])
+
+    stats = await refresh_in_processes(root, 2)
+    assert (stats.written, stats.skipped) == (expected.written, expected.skipped)
+    assert stats.processes == 2 and stats.elapsed > 0
+    assert "speed-up on 2 processes" in str(stats)
+    assert (root / "notes.txt").read_text() == "replayed"
+    assert list(tmp_prism.drive.journal_directory.glob("*.journal")) == []
+    for path in sorted(copy.rglob("*.md")):
+        assert (root / path.relative_to(copy)).read_text() == path.read_text()
+
+    # The workers' titles are merged into the saved index.
+    drive = Disk(root)
+    entries = await TitleIndex(drive)._load()
+    assert (
+        entries[PrismPath(names[-1]) / "page.md"].title == f"{names[-1].title()} page"
+    )
+    drive.close()
+    expected_drive.close()
@@ -0,0 +1,82 @@
+from textwrap import dedent
+
+from prism.parser import find_title, parse_page
+
+CONTENT = dedent("""
+    # Main Title
+
+    <!-- prism:generate:breadcrumbs -->
+    old crumbs
+    <!-- /prism:generate:breadcrumbs -->
+
+    ## Section One <!-- prism:generate:toc -->
+    <!-- /prism:generate:toc -->
+
+    ### Sub section
+
+    <!-- prism:generate:pages -->
+    no closing marker
+
+    <!-- prism:metadata
+    ---
+    title: Main Title
+    ---
+    -->
+    """).lstrip()
+
+
+def test_parse_page():
+    parsed = parse_page(CONTENT)
+
+    assert parsed.title == "Main Title"
+    assert [(h.level, h.title) for h in parsed.headers] == [
+        (2, "Section One <!-- prism:generate:toc -->"),
+        (3, "Sub section"),
+    ]
+    assert parsed.generator_types == ["breadcrumbs", "toc", "pages"]
+    assert [block.type for block in parsed.blocks] == ["breadcrumbs", "toc"]
+    block = parsed.blocks[0]
+    assert CONTENT[block.start : block.end].endswith(
+        "<!-- /prism:generate:breadcrumbs -->"
+    )
+    assert parsed.has_metadata
+    assert parsed.metadata_text == "title: Main Title"
+
+
+def test_parse_page_without_structure():
+    parsed = parse_page("No title here\n#Not a title\n")
+    assert parsed.title is None
+    assert parsed.blocks == []
+    assert not parsed.has_metadata
+
+
+def test_replace_blocks_matches_a_fresh_scan():
+    parsed = parse_page(CONTENT)
+    replacements = [
+        "<!-- prism:generate:breadcrumbs -->\n[Home](README.md)\n"
+        "<!-- /prism:generate:breadcrumbs -->",
+        "<!-- prism:generate:toc -->\n- [Sub section](#sub-section)\n"
+        "<!-- /prism:generate:toc -->",
+    ]
+    replaced = parsed.replace_blocks(replacements)
+    fresh = parse_page(replaced.content)
+
+    assert "[Home](README.md)" in replaced.content
+    assert "old crumbs" not in replaced.content
+    assert replaced.blocks == fresh.blocks
+    assert replaced.headers == fresh.headers
+    assert replaced.generators == fresh.generators
+    assert (replaced.metadata_start, replaced.metadata_end) == (
+        fresh.metadata_start,
+        fresh.metadata_end,
+    )
+
+
+def test_find_title():
+    assert find_title(CONTENT) == parse_page(CONTENT).title == "Main Title"
+    assert find_title("#hashtag\n## Section\n#\tTabbed\n") == "Tabbed"
+    assert find_title("no title") is None
+
+    # The last line of a partial page may be cut off.
+    assert find_title("text\n# Cut", partial=True) is None
+    assert find_title("text\n# Whole\n", partial=True) == "Whole"
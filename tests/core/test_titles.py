@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from prism import MemoryDrive, Page, PageValidationError, PrismPath
+from prism.titles import TitleIndex
+
+
+@pytest.fixture
+async def drive():
+    drive = MemoryDrive()
+    await drive.create_directory(PrismPath(".prism"))
+    return drive
+
+
+async def test_titles_validated_by_stat(drive):
+    """Test indexed titles are trusted until a page's mtime or size changes"""
+    path = PrismPath("page.md")
+    await drive.write(path, "# Alpha\n")
+    index = TitleIndex(drive)
+    assert await index.titles([path]) == ["Alpha"]
+
+    # Same size and modification time: the page isn't opened again.
+    mtime = await drive.get_modification_time(path)
+    await drive.write(path, "# Bravo\n")
+    await drive.set_modification_time(path, mtime)
+    assert await index.titles([path]) == ["Alpha"]
+
+    await drive.write(path, "# Charlie\n")
+    assert await index.titles([path]) == ["Charlie"]
+
+    await drive.write(PrismPath("untitled.md"), "No title")
+    titles = await index.titles([PrismPath("untitled.md"), PrismPath("missing.md")])
+    assert isinstance(titles[0], PageValidationError)
+    assert isinstance(titles[1], FileNotFoundError)
+
+
+async def test_index_persists(drive):
+    """Test the index is saved in .prism and loaded by a new index"""
+    path = PrismPath("page.md")
+    await drive.write(path, "Intro\n# Title\n")
+    index = TitleIndex(drive)
+    await index.titles([path])
+    await index.save()
+
+    data = json.loads(await drive.read(index.path))
+    assert data["pages"]["page.md"][:2] == ["Title", 6]
+
+    # A new index trusts the saved title without reading the page.
+    mtime = await drive.get_modification_time(path)
+    await drive.write(path, "Intro\n# Other\n")
+    await drive.set_modification_time(path, mtime)
+    assert await TitleIndex(drive).titles([path]) == ["Title"]
+
+
+async def test_refresh_records_titles(tmp_prism):
+    """Test refreshing pages records their titles as they are saved"""
+    await tmp_prism.refresh_folder(PrismPath(), recursive=True)
+    index = TitleIndex.for_drive(tmp_prism.drive)
+    assert await tmp_prism.drive.exists(index.path)
+
+    path = PrismPath("docs/guide.md")
+    content = await tmp_prism.drive.read(path)
+    marker = "<!-- /prism:generate:breadcrumbs -->"
+    await tmp_prism.drive.write(path, content.replace(marker, "stale\n" + marker))
+    assert await Page(tmp_prism.drive, path).refresh()
+    entry = (await index._load())[path]
+    assert entry.title == "Guide"
+    assert entry.size == await tmp_prism.drive.get_size(path)
@@ -0,0 +1,110 @@
+import pytest
+import pytest_asyncio
+
+from prism import CachingFileSystem, Disk, MemoryDrive, PrismPath
+
+
+def p(path: str) -> PrismPath:
+    return PrismPath(path)
+
+
+@pytest.fixture(params=["memory", "disk"])
+def base_fs(request, tmp_path):
+    if request.param == "memory":
+        return MemoryDrive()
+    return Disk(tmp_path)
+
+
+@pytest_asyncio.fixture
+async def populated_base(base_fs):
+    await base_fs.write(p("file1.txt"), "content1")
+    await base_fs.write(p("dir1/file2.txt"), "content2")
+    await base_fs.write_binary(p("binary.bin"), b"\x00\xff")
+    return base_fs
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_hit_cache(populated_base):
+    fs = CachingFileSystem(populated_base)
+    assert await fs.read(p("file1.txt")) == "content1"
+    assert await fs.read(p("file1.txt")) == "content1"
+    assert await fs.read_binary(p("binary.bin")) == b"\x00\xff"
+    assert await fs.read_binary(p("binary.bin")) == b"\x00\xff"
+
+    assert fs.stats.content_misses == 2
+    assert fs.stats.content_hits == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate(populated_base):
+    fs = CachingFileSystem(populated_base, validate=False)
+    assert await fs.read(p("file1.txt")) == "content1"
+    assert [str(f) async for f in fs.list_files(p("dir1"))]
+
+    await fs.write(p("file1.txt"), "changed")
+    assert await fs.read(p("file1.txt")) == "changed"
+
+    await fs.write(p("dir1/new.txt"), "new")
+    assert len([f async for f in fs.list_files(p("dir1"))]) == 2
+
+    await fs.remove(p("dir1"))
+    assert not await fs.exists(p("dir1/file2.txt"))
+    with pytest.raises(FileNotFoundError):
+        await fs.read(p("dir1/file2.txt"))
+
+    await fs.move(p("file1.txt"), p("moved/file1.txt"))
+    assert not await fs.exists(p("file1.txt"))
+    assert await fs.read(p("moved/file1.txt")) == "changed"
+
+
+@pytest.mark.asyncio
+async def test_validation_sees_external_changes(populated_base):
+    fs = CachingFileSystem(populated_base)
+    assert await fs.read(p("file1.txt")) == "content1"
+    names = [e.name async for e in fs.list_directories(p(""))]
+
+    # Change the base behind the wrapper's back.
+    await populated_base.write(p("file1.txt"), "changed externally")
+    await populated_base.create_directory(p("dir2"))
+
+    assert await fs.read(p("file1.txt")) == "changed externally"
+    assert len([d async for d in fs.list_directories(p(""))]) == len(names) + 1
+
+
+@pytest.mark.asyncio
+async def test_unvalidated_cache_trusts_entries(populated_base):
+    fs = CachingFileSystem(populated_base, validate=False)
+    assert await fs.read(p("file1.txt")) == "content1"
+    await populated_base.write(p("file1.txt"), "changed externally")
+    assert await fs.read(p("file1.txt")) == "content1"
+
+    fs.clear()
+    assert await fs.read(p("file1.txt")) == "changed externally"
+
+
+@pytest.mark.asyncio
+async def test_content_cache_is_bounded(populated_base):
+    fs = CachingFileSystem(populated_base, max_bytes=10)
+    await fs.read(p("file1.txt"))
+    await fs.read(p("dir1/file2.txt"))
+    assert fs.stats.evictions == 1
+
+    # The least recently used file was evicted.
+    await fs.read(p("dir1/file2.txt"))
+    await fs.read(p("file1.txt"))
+    assert fs.stats.content_hits == 1
+    assert fs.stats.content_misses == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_pass_through(populated_base):
+    fs = CachingFileSystem(populated_base)
+    with pytest.raises(FileNotFoundError):
+        await fs.read(p("missing.txt"))
+    with pytest.raises(ValueError):
+        await fs.read(p("binary.bin"))
+    with pytest.raises(ValueError):
+        await fs.read_binary(p("file1.txt"))
+    assert not await fs.exists(p("missing.txt"))
+    assert await fs.is_directory(p("dir1"))
+    assert await fs.is_file(p("file1.txt"))
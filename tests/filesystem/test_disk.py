@@ -1,12 +1,15 @@
 import os
 import shutil
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import pytest
 import pytest_asyncio
 
 from prism import Disk, FileSystem, PrismPath
+from prism.filesystem.disk import JOURNAL_LOCK_NAME, _JournalLock
 
 
 def p(path: str) -> PrismPath:
@@ -301,3 +304,199 @@ async def test_binary_text_operations(disk_fs):
     binary_content = b"Hello\x00World\xff\x00"
     await disk_fs.write_binary("nulls.bin", binary_content)
     assert await disk_fs.read_binary("nulls.bin") == binary_content
+
+
+@pytest.mark.asyncio
+async def test_list_entries(populated_fs):
+    """Test listing typed directory entries."""
+    entries = {e.name: e for e in await populated_fs.list_entries("")}
+    assert set(entries) == {"file1.txt", "file2.txt", "binary.bin", "dir1", "empty_dir"}
+
+    assert entries["file1.txt"].is_file
+    assert entries["file1.txt"].size == len("content1")
+    assert entries["file1.txt"].mtime == await populated_fs.get_modification_time(
+        "file1.txt"
+    )
+    assert entries["dir1"].is_directory
+    assert entries["dir1"].size == 0
+
+    with pytest.raises(FileNotFoundError):
+        await populated_fs.list_entries("nonexistent")
+    with pytest.raises(NotADirectoryError):
+        await populated_fs.list_entries("file1.txt")
+
+
+@pytest.mark.asyncio
+async def test_read_write_error_mapping(disk_fs, temp_dir):
+    """Test OS errors from the single open are mapped to FileSystem errors."""
+    await disk_fs.create_directory(p("a_dir"))
+    with pytest.raises(IsADirectoryError):
+        await disk_fs.read(p("a_dir"))
+    with pytest.raises(IsADirectoryError):
+        await disk_fs.read_binary(p("a_dir"))
+    with pytest.raises(FileNotFoundError):
+        await disk_fs.read_binary(p("missing.bin"))
+
+    await disk_fs.write(p("file.txt"), "content")
+    with pytest.raises(NotADirectoryError):
+        await disk_fs.write(p("file.txt/child.txt"), "content")
+
+
+@pytest.mark.asyncio
+async def test_write_recreates_removed_parent(disk_fs, temp_dir):
+    """Test writes still work after a remembered parent directory is removed."""
+    await disk_fs.write(p("dir/one.txt"), "one")
+    shutil.rmtree(os.path.join(temp_dir, "dir"))
+    await disk_fs.write(p("dir/two.txt"), "two")
+    assert await disk_fs.read(p("dir/two.txt")) == "two"
+
+    await disk_fs.remove(p("dir"))
+    await disk_fs.write(p("dir/three.txt"), "three")
+    assert await disk_fs.read(p("dir/three.txt")) == "three"
+
+
+@pytest.mark.asyncio
+async def test_read_large_text_across_chunks(disk_fs):
+    """Test multi-byte characters split across read chunks decode correctly."""
+    from prism.filesystem.disk import READ_CHUNK_SIZE
+
+    content = "a" * (READ_CHUNK_SIZE - 1) + "世界" * 10
+    await disk_fs.write(p("large.txt"), content)
+    assert await disk_fs.read(p("large.txt")) == content
+    with pytest.raises(ValueError, match="contains text data"):
+        await disk_fs.read_binary(p("large.txt"))
+
+
+@pytest.mark.asyncio
+async def test_batch_operations(disk_fs):
+    """Test batch calls return per-item results and errors in order."""
+    errors = await disk_fs.write_many([(p("a.txt"), "a"), (p("dir/b.txt"), "b")])
+    assert errors == [None, None]
+
+    contents = await disk_fs.read_many([p("a.txt"), p("missing.txt"), p("dir/b.txt")])
+    assert contents[0] == "a"
+    assert isinstance(contents[1], FileNotFoundError)
+    assert contents[2] == "b"
+
+    entries = await disk_fs.stat_many([p("dir"), p("missing")])
+    assert entries[0].is_directory
+    assert isinstance(entries[1], FileNotFoundError)
+
+
+@pytest.mark.asyncio
+async def test_read_head(disk_fs):
+    """Test read_head reads at most max_bytes and drops a cut character."""
+    await disk_fs.write(p("page.md"), "# Café\n" + "x" * 10000)
+    await disk_fs.write_binary(p("binary.bin"), b"\x00\xff")
+
+    assert await disk_fs.read_head(p("page.md"), 4) == "# Ca"
+    assert await disk_fs.read_head(p("page.md"), 6) == "# Caf"  # é is 2 bytes
+    assert await disk_fs.read_head(p("page.md"), 7) == "# Café"
+
+    heads = await disk_fs.read_head_many(
+        [p("page.md"), p("missing.md"), p("binary.bin")], 100
+    )
+    assert heads[0] == ("# Café\n" + "x" * 10000)[:99]
+    assert isinstance(heads[1], FileNotFoundError)
+    assert isinstance(heads[2], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_walk(disk_fs):
+    """Test walk yields every directory top-down and skips .prism."""
+    await disk_fs.write(p("README.md"), "root")
+    await disk_fs.write(p("a/one.md"), "one")
+    await disk_fs.write(p("a/b/two.md"), "two")
+    await disk_fs.write(p(".prism/config.yaml"), "config")
+
+    walked = {
+        str(dirpath): (sorted(dirs), sorted(f.name for f in files))
+        async for dirpath, dirs, files in disk_fs.walk(p("."), queue_size=1)
+    }
+    assert walked == {
+        ".": (["a"], ["README.md"]),
+        "a": (["b"], ["one.md"]),
+        "a/b": ([], ["two.md"]),
+    }
+
+    order = [str(d) async for d, _, _ in disk_fs.walk(p("."))]
+    assert order.index("a") < order.index("a/b")
+
+    with pytest.raises(FileNotFoundError):
+        async for _ in disk_fs.walk(p("missing")):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_write_atomic(disk_fs):
+    """Test an atomic batch writes everything or nothing."""
+    await disk_fs.create_directory(p(".prism"))
+    await disk_fs.write(p("a.txt"), "old")
+    await disk_fs.write_atomic(
+        [(p("a.txt"), "new"), (p("dir/b.txt"), "b"), (p("c.bin"), b"\x00\xff")]
+    )
+    assert await disk_fs.read(p("a.txt")) == "new"
+    assert await disk_fs.read(p("dir/b.txt")) == "b"
+    assert await disk_fs.read_binary(p("c.bin")) == b"\x00\xff"
+    assert list(disk_fs.journal_directory.glob("*.journal")) == []
+
+    with pytest.raises(NotADirectoryError):
+        await disk_fs.write_atomic([(p("a.txt"), "newer"), (p("a.txt/x"), "x")])
+    with pytest.raises(IsADirectoryError):
+        await disk_fs.write_atomic([(p("a.txt"), "newer"), (p("dir"), "x")])
+    assert await disk_fs.read(p("a.txt")) == "new"
+
+
+@pytest.mark.asyncio
+async def test_write_atomic_outside_repository(disk_fs):
+    """Test a batch outside a repository doesn't create a metadata directory."""
+    await disk_fs.write_atomic([(p("a.txt"), "a"), (p("dir/b.txt"), "b")])
+    assert await disk_fs.read(p("dir/b.txt")) == "b"
+    assert not await disk_fs.exists(p(".prism"))
+
+
+@pytest.mark.asyncio
+async def test_journal_replay(temp_dir):
+    """Test a committed journal is replayed and a torn one dropped on open."""
+    disk = Disk(temp_dir)
+    disk.journal_directory.mkdir(parents=True)
+    await disk.write(p("page.md"), "old")
+    disk._write_journal([("page.md", b"new"), ("dir/other.md", b"other")])
+    torn = disk._write_journal([("page.md", b"torn")])
+    torn.write_bytes(torn.read_bytes()[:-4])
+
+    reopened = Disk(temp_dir)
+    assert reopened.replayed == 1
+    assert await reopened.read(p("page.md")) == "new"
+    assert await reopened.read(p("dir/other.md")) == "other"
+    assert list(reopened.journal_directory.glob("*.journal")) == []
+
+
+@pytest.mark.asyncio
+async def test_journal_replay_failure(temp_dir):
+    """Test a journal that can't be replayed is moved aside, not raised."""
+    disk = Disk(temp_dir)
+    disk.journal_directory.mkdir(parents=True)
+    journal = disk._write_journal([("target", b"data")])
+    await disk.create_directory(p("target"))
+
+    reopened = Disk(temp_dir)
+    assert reopened.replayed == 0
+    assert not journal.exists()
+    assert journal.with_suffix(".failed").exists()
+    assert await reopened.is_directory(p("target"))
+
+
+def test_journal_replay_waits_for_commit(temp_dir):
+    """Test opening a drive doesn't replay a journal another is committing."""
+    disk = Disk(temp_dir)
+    disk.journal_directory.mkdir(parents=True)
+    with ThreadPoolExecutor(1) as pool:
+        with _JournalLock(disk.journal_directory / JOURNAL_LOCK_NAME):
+            journal = disk._write_journal([("page.md", b"new")])
+            opening = pool.submit(Disk, temp_dir)
+            time.sleep(0.1)
+            assert not opening.done()
+            disk._apply_batch([(disk.root / "page.md", b"new")])
+            journal.unlink()
+        assert opening.result(timeout=5).replayed == 0
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from prism import Disk, PrismPath
+from prism.filesystem.executor import IOExecutor
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    executor = IOExecutor(max_workers=2)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(*(executor.run(work) for _ in range(10)))
+
+    assert peak <= 2
+    assert executor.stats.peak_in_flight == 2
+    assert executor.stats.peak_queued >= 8
+    assert executor.stats.submitted == executor.stats.completed == 10
+    assert executor.stats.in_flight == executor.stats.queued == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_batch_uses_one_hop():
+    executor = IOExecutor()
+    threads = set()
+
+    def call(i):
+        threads.add(threading.get_ident())
+        if i == 1:
+            raise ValueError("boom")
+        return i
+
+    results = await executor.run_batch([lambda i=i: call(i) for i in range(3)])
+
+    assert results[0] == 0
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 2
+    assert len(threads) == 1
+    assert executor.stats.submitted == 1
+    assert executor.stats.batched_calls == 3
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_disk_uses_bounded_executor(tmp_path):
+    disk = Disk(tmp_path, max_workers=2)
+    await asyncio.gather(
+        *(disk.write(PrismPath(f"dir/file{i}.txt"), f"content{i}") for i in range(20))
+    )
+    assert disk.io.stats.peak_in_flight <= 2
+    assert disk.io.stats.completed == 20
+
+    results = await disk.run_batch(
+        [lambda: (tmp_path / "dir" / "file0.txt").read_text(), lambda: 1 / 0]
+    )
+    assert results[0] == "content0"
+    assert isinstance(results[1], ZeroDivisionError)
+    disk.close()
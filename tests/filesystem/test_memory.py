@@ -41,6 +41,16 @@ async def test_read_write(memory_fs):
     assert await memory_fs.read(p("test.txt")) == content
 
 
+@pytest.mark.asyncio
+async def test_read_head(memory_fs):
+    await memory_fs.write(p("page.md"), "# Café\nbody")
+    assert await memory_fs.read_head(p("page.md"), 6) == "# Caf"
+    assert await memory_fs.read_head(p("page.md"), 100) == "# Café\nbody"
+    heads = await memory_fs.read_head_many([p("page.md"), p("missing.md")], 7)
+    assert heads[0] == "# Café"
+    assert isinstance(heads[1], FileNotFoundError)
+
+
 @pytest.mark.asyncio
 async def test_read_write_binary(memory_fs):
     content = b"Binary Content"
@@ -111,16 +121,78 @@ async def test_copy_directory(populated_fs):
 @pytest.mark.asyncio
 async def test_get_size(populated_fs):
     assert await populated_fs.get_size(p("file1.txt")) == len("content1")
+    assert await populated_fs.get_size(p("binary.bin")) == len(b"binary content")
+    assert await populated_fs.get_size(p("dir1")) == 0
+
+    await populated_fs.write(p("unicode.txt"), "世界")
+    assert await populated_fs.get_size(p("unicode.txt")) == len("世界".encode())
 
 
 @pytest.mark.asyncio
 async def test_modification_time(populated_fs):
-    # These should always return 0 in the memory implementation
-    assert await populated_fs.get_creation_time(p("file1.txt")) == 0
-    assert await populated_fs.get_modification_time(p("file1.txt")) == 0
+    ctime = await populated_fs.get_creation_time(p("file1.txt"))
+    mtime = await populated_fs.get_modification_time(p("file1.txt"))
+    assert ctime > 0
+    assert mtime >= ctime
 
-    # Should not raise any errors
     await populated_fs.set_modification_time(p("file1.txt"), 12345)
+    assert await populated_fs.get_modification_time(p("file1.txt")) == 12345
+
+    # Rewriting a file updates its modification time but not its creation time.
+    await populated_fs.write(p("file1.txt"), "updated")
+    assert await populated_fs.get_modification_time(p("file1.txt")) > 12345
+    assert await populated_fs.get_creation_time(p("file1.txt")) == ctime
+
+
+@pytest.mark.asyncio
+async def test_modification_time_of_copies(populated_fs):
+    await populated_fs.copy(p("dir1"), p("copied_dir"))
+    await populated_fs.set_modification_time(p("copied_dir/file3.txt"), 100)
+    assert await populated_fs.get_modification_time(p("copied_dir/file3.txt")) == 100
+    assert await populated_fs.get_modification_time(p("dir1/file3.txt")) != 100
+
+
+@pytest.mark.asyncio
+async def test_change_counter(populated_fs):
+    counter = populated_fs.change_counter
+    dir_version = await populated_fs.get_version(p("dir1"))
+    file_version = await populated_fs.get_version(p("dir1/file3.txt"))
+
+    # Reads don't change anything.
+    await populated_fs.read(p("dir1/file3.txt"))
+    assert populated_fs.change_counter == counter
+
+    # Rewriting a file changes its version, but not its directory's.
+    await populated_fs.write(p("dir1/file3.txt"), "new")
+    assert populated_fs.change_counter > counter
+    assert await populated_fs.get_version(p("dir1/file3.txt")) > file_version
+    assert await populated_fs.get_version(p("dir1")) == dir_version
+
+    # Adding an entry changes the directory's version.
+    await populated_fs.write(p("dir1/file4.txt"), "new")
+    assert await populated_fs.get_version(p("dir1")) > dir_version
+
+
+@pytest.mark.asyncio
+async def test_versions_after_relinking(populated_fs):
+    """Test moving or copying onto a path never takes its version back"""
+    for _ in range(3):
+        await populated_fs.write(p("b.md"), "b")
+    version = await populated_fs.get_version(p("b.md"))
+    await populated_fs.copy(p("file1.txt"), p("b.md"))
+    assert await populated_fs.get_version(p("b.md")) > version
+    assert await populated_fs.read(p("b.md")) == "content1"
+
+    version = await populated_fs.get_version(p("b.md"))
+    await populated_fs.move(p("file2.txt"), p("b.md"))
+    assert await populated_fs.get_version(p("b.md")) > version
+
+    # Paths below a copied directory get new versions too.
+    await populated_fs.write(p("target/file3.txt"), "newer")
+    version = await populated_fs.get_version(p("target/file3.txt"))
+    await populated_fs.copy(p("dir1"), p("target"))
+    assert await populated_fs.get_version(p("target/file3.txt")) > version
+    assert await populated_fs.read(p("target/file3.txt")) == "content3"
 
 
 @pytest.mark.asyncio
@@ -160,3 +232,124 @@ async def test_move_to_existing_destination(populated_fs):
     await populated_fs.move(p("file1.txt"), p("dest.txt"))
     assert await populated_fs.read(p("dest.txt")) == "content1"
     assert not await populated_fs.exists(p("file1.txt"))
+
+
+@pytest.mark.asyncio
+async def test_list_entries(populated_fs):
+    entries = {e.name: e for e in await populated_fs.list_entries(p(""))}
+    assert set(entries) == {"file1.txt", "file2.txt", "binary.bin", "dir1", "empty_dir"}
+    assert entries["file1.txt"].is_file
+    assert entries["file1.txt"].size == len("content1")
+    assert entries["dir1"].is_directory
+
+    with pytest.raises(FileNotFoundError):
+        await populated_fs.list_entries(p("nonexistent"))
+    with pytest.raises(NotADirectoryError):
+        await populated_fs.list_entries(p("file1.txt"))
+
+
+@pytest.mark.asyncio
+async def test_copy_directory_is_independent(populated_fs):
+    await populated_fs.write(p("dir1/sub/file4.txt"), "content4")
+    await populated_fs.copy(p("dir1"), p("copied_dir"))
+
+    await populated_fs.write(p("copied_dir/sub/file4.txt"), "changed")
+    await populated_fs.remove(p("copied_dir/file3.txt"))
+
+    assert await populated_fs.read(p("dir1/sub/file4.txt")) == "content4"
+    assert await populated_fs.read(p("dir1/file3.txt")) == "content3"
+    assert await populated_fs.read(p("copied_dir/sub/file4.txt")) == "changed"
+
+
+@pytest.mark.asyncio
+async def test_listing_only_sees_direct_children(memory_fs):
+    for i in range(50):
+        await memory_fs.write(p(f"a/b{i}/file.txt"), "x")
+    await memory_fs.write(p("a/top.txt"), "x")
+
+    assert [str(f) async for f in memory_fs.list_files(p("a"))] == ["top.txt"]
+    dirs = [str(d) async for d in memory_fs.list_directories(p("a"))]
+    assert len(dirs) == 50
+
+    await memory_fs.remove(p("a"))
+    assert [e async for e in memory_fs.list_directories(p(""))] == []
+
+
+@pytest.mark.asyncio
+async def test_write_errors(populated_fs):
+    with pytest.raises(IsADirectoryError):
+        await populated_fs.write(p("dir1"), "content")
+    with pytest.raises(NotADirectoryError):
+        await populated_fs.write(p("file1.txt/child.txt"), "content")
+    with pytest.raises(IsADirectoryError):
+        await populated_fs.read(p("dir1"))
+
+
+@pytest.mark.asyncio
+async def test_move_relinks_without_copying(populated_fs):
+    node = populated_fs._lookup(p("dir1"))
+    await populated_fs.move(p("dir1"), p("a/b/moved"))
+    assert populated_fs._lookup(p("a/b/moved")) is node
+
+    with pytest.raises(ValueError):
+        await populated_fs.move(p("a"), p("a/b/inside"))
+
+
+@pytest.mark.asyncio
+async def test_copy_on_write(populated_fs):
+    await populated_fs.write(p("dir1/sub/file4.txt"), "content4")
+    await populated_fs.copy(p("dir1"), p("copied_dir"))
+
+    # Only the copied node itself is copied up front.
+    assert populated_fs._lookup(p("copied_dir/sub")) is populated_fs._lookup(
+        p("dir1/sub")
+    )
+
+    # Writing to the original copies only the nodes on the written path.
+    await populated_fs.write(p("dir1/sub/file4.txt"), "changed")
+    assert await populated_fs.read(p("copied_dir/sub/file4.txt")) == "content4"
+    assert populated_fs._lookup(p("copied_dir/file3.txt")) is populated_fs._lookup(
+        p("dir1/file3.txt")
+    )
+
+    # Copies of copies stay independent too.
+    await populated_fs.copy(p("copied_dir"), p("second"))
+    await populated_fs.remove(p("copied_dir/sub"))
+    assert await populated_fs.read(p("second/sub/file4.txt")) == "content4"
+    assert not await populated_fs.exists(p("copied_dir/sub"))
+
+
+@pytest.mark.asyncio
+async def test_batch_operations(populated_fs):
+    contents = await populated_fs.read_many([p("file1.txt"), p("missing.txt")])
+    assert contents[0] == "content1"
+    assert isinstance(contents[1], FileNotFoundError)
+
+    errors = await populated_fs.write_many(
+        [(p("new/a.txt"), "a"), (p("file1.txt/b.txt"), "b")]
+    )
+    assert errors[0] is None
+    assert isinstance(errors[1], NotADirectoryError)
+    assert await populated_fs.read(p("new/a.txt")) == "a"
+
+    entries = await populated_fs.stat_many([p("dir1"), p("missing")])
+    assert entries[0].is_directory
+    assert isinstance(entries[1], FileNotFoundError)
+
+
+@pytest.mark.asyncio
+async def test_walk(populated_fs):
+    await populated_fs.write(p(".prism/config.yaml"), "config")
+    walked = {
+        str(dirpath): (sorted(dirs), sorted(f.name for f in files))
+        async for dirpath, dirs, files in populated_fs.walk()
+    }
+    assert walked == {
+        ".": (["dir1", "empty_dir"], ["binary.bin", "file1.txt", "file2.txt"]),
+        "dir1": ([], ["file3.txt"]),
+        "empty_dir": ([], []),
+    }
+
+    with pytest.raises(NotADirectoryError):
+        async for _ in populated_fs.walk(p("file1.txt")):
+            pass
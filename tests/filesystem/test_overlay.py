@@ -0,0 +1,137 @@
+import pytest
+import pytest_asyncio
+
+from prism import Prism
+from prism.filesystem.memory import MemoryDrive
+from prism.filesystem.overlay import OverlayFileSystem
+from prism.types import PrismPath
+
+
+def p(path: str) -> PrismPath:
+    """Helper to create PrismPath objects."""
+    return PrismPath(path)
+
+
+@pytest_asyncio.fixture
+async def base():
+    drive = MemoryDrive()
+    await drive.write(p("file1.txt"), "content1")
+    await drive.write(p("dir1/file2.txt"), "content2")
+    await drive.write(p("dir1/sub/file3.txt"), "content3")
+    await drive.write_binary(p("binary.bin"), b"\x00\xff")
+    return drive
+
+
+@pytest.fixture
+def overlay(base):
+    return OverlayFileSystem(base)
+
+
+@pytest.mark.asyncio
+async def test_writes_stay_in_overlay(base, overlay):
+    await overlay.write(p("file1.txt"), "changed")
+    await overlay.write(p("dir1/new.txt"), "new")
+
+    assert await overlay.read(p("file1.txt")) == "changed"
+    assert await base.read(p("file1.txt")) == "content1"
+    assert not await base.exists(p("dir1/new.txt"))
+
+    names = sorted(e.name for e in await overlay.list_entries(p("dir1")))
+    assert names == ["file2.txt", "new.txt", "sub"]
+    contents = await overlay.read_many([p("file1.txt"), p("dir1/file2.txt")])
+    assert contents == ["changed", "content2"]
+
+
+@pytest.mark.asyncio
+async def test_whiteouts_hide_base_paths(base, overlay):
+    await overlay.remove(p("dir1"))
+    assert not await overlay.exists(p("dir1"))
+    assert not await overlay.exists(p("dir1/sub/file3.txt"))
+    assert await base.exists(p("dir1"))
+
+    # Recreating a removed directory doesn't bring back its old contents.
+    await overlay.write(p("dir1/fresh.txt"), "fresh")
+    assert [e.name for e in await overlay.list_entries(p("dir1"))] == ["fresh.txt"]
+
+    with pytest.raises(FileNotFoundError):
+        await overlay.read(p("dir1/file2.txt"))
+    with pytest.raises(FileNotFoundError):
+        await overlay.remove(p("missing"))
+
+
+@pytest.mark.asyncio
+async def test_write_errors_follow_merged_view(overlay):
+    with pytest.raises(NotADirectoryError):
+        await overlay.write(p("file1.txt/child.txt"), "content")
+    with pytest.raises(IsADirectoryError):
+        await overlay.write(p("dir1"), "content")
+    with pytest.raises(FileExistsError):
+        await overlay.create_directory(p("dir1/sub"))
+
+
+@pytest.mark.asyncio
+async def test_move_and_copy(base, overlay):
+    await overlay.move(p("dir1"), p("moved"))
+    await overlay.copy(p("binary.bin"), p("copy.bin"))
+
+    assert await overlay.read(p("moved/sub/file3.txt")) == "content3"
+    assert await overlay.read_binary(p("copy.bin")) == b"\x00\xff"
+    assert not await overlay.exists(p("dir1"))
+    assert await base.exists(p("dir1"))
+
+
+@pytest.mark.asyncio
+async def test_commit_applies_changes(base, overlay):
+    await overlay.write(p("file1.txt"), "changed")
+    await overlay.write_binary(p("new.bin"), b"\x01")
+    await overlay.remove(p("dir1/sub"))
+    await overlay.create_directory(p("empty"))
+    await overlay.set_modification_time(p("dir1/file2.txt"), 1000.0)
+
+    changes = await overlay.changes()
+    assert sorted(map(str, changes.written)) == ["file1.txt", "new.bin"]
+    assert changes.removed == [p("dir1/sub")]
+    assert changes.directories == [p("empty")]
+    assert changes.touched == [p("dir1/file2.txt")]
+
+    # The new time is staged without copying the file into the overlay.
+    assert not await overlay.upper.exists(p("dir1/file2.txt"))
+    assert await overlay.get_modification_time(p("dir1/file2.txt")) == 1000.0
+    assert await base.get_modification_time(p("dir1/file2.txt")) != 1000.0
+
+    await overlay.commit()
+    assert await base.read(p("file1.txt")) == "changed"
+    assert await base.read_binary(p("new.bin")) == b"\x01"
+    assert not await base.exists(p("dir1/sub"))
+    assert await base.is_directory(p("empty"))
+    assert await base.get_modification_time(p("dir1/file2.txt")) == 1000.0
+    assert (await overlay.changes()).total == 0
+
+
+@pytest.mark.asyncio
+async def test_discard_drops_changes(base, overlay):
+    await overlay.write(p("file1.txt"), "changed")
+    await overlay.remove(p("dir1"))
+    overlay.discard()
+
+    assert await overlay.read(p("file1.txt")) == "content1"
+    assert await overlay.exists(p("dir1/file2.txt"))
+
+
+@pytest.mark.asyncio
+async def test_staged_refresh(tmp_prism):
+    """Test a refresh through an overlay only reaches the repository on commit."""
+    page_path = p("docs/guide.md")
+    content = await tmp_prism.drive.read(page_path)
+    await tmp_prism.drive.write(page_path, content + "\nStale line.\n")
+    before = await tmp_prism.drive.read(page_path)
+
+    overlay = OverlayFileSystem(tmp_prism.drive)
+    stats = await Prism(overlay).refresh_folder(p(""), recursive=True)
+    assert await tmp_prism.drive.read(page_path) == before
+
+    changes = await overlay.commit()
+    assert stats.written > 0
+    pages = [path for path in changes.written if path.suffix == ".md"]
+    assert len(pages) == stats.written
+    assert await tmp_prism.drive.read(page_path) == await overlay.read(page_path)
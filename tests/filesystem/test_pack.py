@@ -0,0 +1,90 @@
+import pytest
+import pytest_asyncio
+
+from prism.filesystem.memory import MemoryDrive
+from prism.filesystem.pack import PackDrive, write_pack
+from prism.types import PrismPath
+
+
+def p(path: str) -> PrismPath:
+    """Helper to create PrismPath objects."""
+    return PrismPath(path)
+
+
+@pytest_asyncio.fixture
+async def pack_fs(tmp_path):
+    source = MemoryDrive()
+    await source.write(p("README.md"), "# Root")
+    await source.write(p("a/page.md"), "über")
+    await source.write(p("a/b/deep.md"), "deep")
+    await source.write(p("a-b.md"), "sibling")
+    await source.write_binary(p("image.bin"), b"\x00\xff")
+    await source.write(p(".prism/config.yaml"), "config")
+    await source.create_directory(p("empty"))
+
+    assert await write_pack(source, tmp_path / "test.pack") == 10
+    drive = PackDrive(tmp_path / "test.pack")
+    yield drive
+    drive.close()
+
+
+@pytest.mark.asyncio
+async def test_read(pack_fs):
+    assert await pack_fs.read(p("README.md")) == "# Root"
+    assert await pack_fs.read(p("a/page.md")) == "über"
+    assert await pack_fs.read(p("a/b/deep.md")) == "deep"
+    assert await pack_fs.read_binary(p("image.bin")) == b"\x00\xff"
+    assert bytes(pack_fs.read_view(p("a/b/deep.md"))) == b"deep"
+    assert await pack_fs.get_size(p("a/page.md")) == 5
+
+    with pytest.raises(FileNotFoundError):
+        await pack_fs.read(p("missing.md"))
+    with pytest.raises(IsADirectoryError):
+        await pack_fs.read(p("a"))
+    with pytest.raises(ValueError):
+        await pack_fs.read(p("image.bin"))
+    with pytest.raises(ValueError):
+        await pack_fs.read_binary(p("README.md"))
+
+
+@pytest.mark.asyncio
+async def test_exists_and_kinds(pack_fs):
+    assert await pack_fs.exists(p("."))
+    assert await pack_fs.is_directory(p("a/b"))
+    assert await pack_fs.is_directory(p("empty"))
+    assert await pack_fs.is_file(p("a-b.md"))
+    assert not await pack_fs.exists(p("a/missing"))
+    assert not await pack_fs.is_file(p("a"))
+
+
+@pytest.mark.asyncio
+async def test_listing(pack_fs):
+    names = sorted(e.name for e in await pack_fs.list_entries(p(".")))
+    assert names == [".prism", "README.md", "a", "a-b.md", "empty", "image.bin"]
+    assert [str(f) async for f in pack_fs.list_files(p("a"))] == ["a/page.md"]
+    assert [str(d) async for d in pack_fs.list_directories(p("a"))] == ["a/b"]
+    assert await pack_fs.list_entries(p("empty")) == []
+
+    with pytest.raises(NotADirectoryError):
+        await pack_fs.list_entries(p("README.md"))
+    with pytest.raises(FileNotFoundError):
+        await pack_fs.list_entries(p("missing"))
+
+    walked = {str(d): sorted(dirs) async for d, dirs, _ in pack_fs.walk()}
+    assert walked == {".": ["a", "empty"], "a": ["b"], "a/b": [], "empty": []}
+
+
+@pytest.mark.asyncio
+async def test_read_only(pack_fs):
+    with pytest.raises(PermissionError):
+        await pack_fs.write(p("new.md"), "content")
+    with pytest.raises(PermissionError):
+        await pack_fs.remove(p("README.md"))
+    with pytest.raises(PermissionError):
+        await pack_fs.move(p("a"), p("b"))
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / "not.pack").write_bytes(b"x" * 64)
+    with pytest.raises(ValueError, match="not a prism pack"):
+        PackDrive(tmp_path / "not.pack")
@@ -0,0 +1,181 @@
+import pytest
+import pytest_asyncio
+
+from prism.filesystem.disk import Disk
+from prism.filesystem.sqlite import SQLiteDrive
+from prism.types import PrismPath
+
+
+def p(path: str) -> PrismPath:
+    """Helper to create PrismPath objects."""
+    return PrismPath(path)
+
+
+@pytest.fixture
+def sqlite_fs(tmp_path):
+    drive = SQLiteDrive(tmp_path / "prism.db")
+    yield drive
+    drive.close()
+
+
+@pytest_asyncio.fixture
+async def populated_fs(sqlite_fs):
+    await sqlite_fs.write(p("file1.txt"), "content1")
+    await sqlite_fs.write(p("file2.txt"), "content2")
+    await sqlite_fs.write(p("dir1/file3.txt"), "content3")
+    await sqlite_fs.write_binary(p("binary.bin"), b"binary content")
+    await sqlite_fs.create_directory(p("empty_dir"))
+    return sqlite_fs
+
+
+@pytest.mark.asyncio
+async def test_read_write(populated_fs):
+    assert await populated_fs.read(p("file1.txt")) == "content1"
+    assert await populated_fs.read_binary(p("binary.bin")) == b"binary content"
+    assert await populated_fs.is_directory(p("dir1"))
+    assert await populated_fs.is_file(p("dir1/file3.txt"))
+    assert await populated_fs.is_root(p("."))
+
+    await populated_fs.write(p("file1.txt"), "über")
+    assert await populated_fs.read(p("file1.txt")) == "über"
+    assert await populated_fs.get_size(p("file1.txt")) == 5
+
+
+@pytest.mark.asyncio
+async def test_errors(populated_fs):
+    with pytest.raises(FileNotFoundError):
+        await populated_fs.read(p("missing.txt"))
+    with pytest.raises(IsADirectoryError):
+        await populated_fs.read(p("dir1"))
+    with pytest.raises(ValueError, match="binary data"):
+        await populated_fs.read(p("binary.bin"))
+    with pytest.raises(ValueError, match="text data"):
+        await populated_fs.read_binary(p("file1.txt"))
+    with pytest.raises(IsADirectoryError):
+        await populated_fs.write(p("dir1"), "content")
+    with pytest.raises(NotADirectoryError):
+        await populated_fs.write(p("file1.txt/child.txt"), "content")
+    with pytest.raises(FileExistsError):
+        await populated_fs.create_directory(p("dir1"))
+    with pytest.raises(NotADirectoryError):
+        await populated_fs.list_entries(p("file1.txt"))
+    with pytest.raises(ValueError):
+        await populated_fs.remove(p("."))
+
+
+@pytest.mark.asyncio
+async def test_listing(populated_fs):
+    files = sorted([str(f) async for f in populated_fs.list_files(p(""))])
+    assert files == ["binary.bin", "file1.txt", "file2.txt"]
+    dirs = sorted([str(d) async for d in populated_fs.list_directories(p(""))])
+    assert dirs == ["dir1", "empty_dir"]
+    assert [str(f) async for f in populated_fs.list_files(p("dir1"))] == [
+        "dir1/file3.txt"
+    ]
+
+    entries = {e.name: e for e in await populated_fs.list_entries(p("dir1"))}
+    assert entries["file3.txt"].size == len("content3")
+
+
+@pytest.mark.asyncio
+async def test_move_and_copy_subtrees(populated_fs):
+    await populated_fs.write(p("dir1/sub/deep.txt"), "deep")
+    await populated_fs.copy(p("dir1"), p("copied/dir1"))
+    await populated_fs.write(p("copied/dir1/file3.txt"), "changed")
+    assert await populated_fs.read(p("dir1/file3.txt")) == "content3"
+    assert await populated_fs.read(p("copied/dir1/sub/deep.txt")) == "deep"
+
+    await populated_fs.move(p("dir1"), p("moved"))
+    assert not await populated_fs.exists(p("dir1"))
+    assert not await populated_fs.exists(p("dir1/sub/deep.txt"))
+    assert await populated_fs.read(p("moved/sub/deep.txt")) == "deep"
+    assert sorted([str(f) async for f in populated_fs.list_files(p("moved"))]) == [
+        "moved/file3.txt"
+    ]
+
+    # A sibling whose name shares a prefix is not part of the subtree.
+    await populated_fs.write(p("moved0.txt"), "sibling")
+    await populated_fs.remove(p("moved"))
+    assert not await populated_fs.exists(p("moved/sub"))
+    assert await populated_fs.read(p("moved0.txt")) == "sibling"
+
+    with pytest.raises(ValueError):
+        await populated_fs.move(p("copied"), p("copied/inside"))
+    with pytest.raises(FileNotFoundError):
+        await populated_fs.copy(p("missing"), p("elsewhere"))
+
+
+@pytest.mark.asyncio
+async def test_times(populated_fs):
+    await populated_fs.set_modification_time(p("file1.txt"), 1000.0)
+    assert await populated_fs.get_modification_time(p("file1.txt")) == 1000.0
+    created = await populated_fs.get_creation_time(p("file1.txt"))
+    await populated_fs.write(p("file1.txt"), "new")
+    assert await populated_fs.get_creation_time(p("file1.txt")) == created
+    assert await populated_fs.get_modification_time(p("file1.txt")) > 1000.0
+
+
+@pytest.mark.asyncio
+async def test_persists_between_connections(populated_fs, tmp_path):
+    populated_fs.close()
+    reopened = SQLiteDrive(tmp_path / "prism.db")
+    try:
+        assert await reopened.read(p("dir1/file3.txt")) == "content3"
+    finally:
+        reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_read_head(sqlite_fs):
+    await sqlite_fs.write(p("page.md"), "# Café\nbody")
+    await sqlite_fs.write_binary(p("binary.bin"), b"\x00\xff")
+    assert await sqlite_fs.read_head(p("page.md"), 6) == "# Caf"
+    heads = await sqlite_fs.read_head_many(
+        [p("page.md"), p("missing.md"), p("binary.bin")], 7
+    )
+    assert heads[0] == "# Café"
+    assert isinstance(heads[1], FileNotFoundError)
+    assert isinstance(heads[2], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_batch_operations_and_walk(populated_fs):
+    contents = await populated_fs.read_many([p("file1.txt"), p("missing.txt")])
+    assert contents[0] == "content1"
+    assert isinstance(contents[1], FileNotFoundError)
+
+    await populated_fs.write(p(".prism/config.yaml"), "config")
+    walked = {
+        str(dirpath): sorted(f.name for f in files)
+        async for dirpath, _, files in populated_fs.walk()
+    }
+    assert walked == {
+        ".": ["binary.bin", "file1.txt", "file2.txt"],
+        "dir1": ["file3.txt"],
+        "empty_dir": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_and_export(populated_fs, tmp_path):
+    # Disk tells binary from text by content, so use bytes that aren't text.
+    await populated_fs.write_binary(p("binary.bin"), b"\x00\xff")
+    (tmp_path / "exported").mkdir()
+    disk = Disk(tmp_path / "exported")
+    assert await populated_fs.export_tree(disk) == 4
+    assert await disk.read(p("dir1/file3.txt")) == "content3"
+    assert await disk.read_binary(p("binary.bin")) == b"\x00\xff"
+    assert await disk.is_directory(p("empty_dir"))
+
+    imported = SQLiteDrive(tmp_path / "imported.db")
+    try:
+        assert await imported.import_tree(disk) == 4
+        assert await imported.read(p("dir1/file3.txt")) == "content3"
+        assert await imported.read_binary(p("binary.bin")) == b"\x00\xff"
+        assert await imported.is_directory(p("empty_dir"))
+        assert await imported.get_modification_time(
+            p("file1.txt")
+        ) == await disk.get_modification_time(p("file1.txt"))
+    finally:
+        imported.close()
+        disk.close()
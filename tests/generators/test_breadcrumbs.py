@@ -3,6 +3,7 @@ from textwrap import dedent
 
 from prism import Page, Prism, PrismPath
 from prism.generators.breadcrumbs import BreadcrumbsGenerator
+from prism.refresh import RefreshSession
 
 
 async def test_breadcrumbs_generator(tmp_prism: Prism):
@@ -21,3 +22,31 @@ async def test_breadcrumbs_generator(tmp_prism: Prism):
         [My Prism Repository](../README.md) / [Documentation](README.md) / Test Page
         """.strip()
     )
+
+
+async def test_breadcrumbs_shared_per_refresh(tmp_prism: Prism):
+    """Test ancestor READMEs are looked up once per refresh session"""
+    await tmp_prism.create_folder(PrismPath("docs/deep"))
+    await Page.create(tmp_prism.drive, PrismPath("docs/deep/one.md"), "One")
+    await Page.create(tmp_prism.drive, PrismPath("docs/deep/two.md"), "Two")
+
+    session = RefreshSession(tmp_prism.drive)
+    lookups = []
+    lookup = session._lookup_readme_titles
+
+    async def counted(directory):
+        lookups.append(directory)
+        return await lookup(directory)
+
+    session._lookup_readme_titles = counted
+
+    generator = BreadcrumbsGenerator()
+    for name in ["one.md", "two.md", "README.md"]:
+        page = Page(tmp_prism.drive, PrismPath("docs/deep") / name)
+        await page.regenerate(session=session)
+        crumbs = await generator.generate(page)
+        assert crumbs.startswith(
+            "[My Prism Repository](../../README.md) / [Documentation](../README.md)"
+        )
+
+    assert sorted(lookups) == [PrismPath(""), PrismPath("docs"), PrismPath("docs/deep")]
@@ -3,6 +3,7 @@ from textwrap import dedent
 
 from prism import PrismPath
 from prism.generators.siblings import SiblingsGenerator
+from prism.refresh import RefreshSession
 
 
 def p(path: str) -> PrismPath:
@@ -29,3 +30,30 @@ async def test_siblings_generator(tmp_prism):
             ]
         ).strip()
     )
+
+
+async def test_snapshot_shared_per_refresh(tmp_prism):
+    """Test a folder is listed once per refresh session for all its pages"""
+    for name in ["one", "two", "three"]:
+        await tmp_prism.create_page(p(f"docs/{name}.md"), title=name.title())
+
+    session = RefreshSession(tmp_prism.drive)
+    listed = []
+    list_entries = tmp_prism.drive.list_entries
+
+    async def counted(directory):
+        listed.append(directory)
+        return await list_entries(directory)
+
+    tmp_prism.drive.list_entries = counted
+
+    generator = SiblingsGenerator()
+    outputs = []
+    for name in ["one", "two", "three"]:
+        page = tmp_prism.get_page(p(f"docs/{name}.md"))
+        await page.regenerate(session=session)
+        outputs.append(await generator.generate(page))
+
+    assert listed == [p("docs")]
+    assert outputs[0] == "- [Guide](guide.md)\n- [Three](three.md)\n- [Two](two.md)"
+    assert "[One](one.md)" in outputs[1] and "Two" not in outputs[1]